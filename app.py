@@ -1,60 +1,175 @@
+import json
 import os
+import secrets
+import zipfile
+from datetime import date
 from functools import wraps
+from dotenv import load_dotenv
 from flask import (
-    Flask, render_template, request, redirect, url_for,
-    session, flash, abort
+    Blueprint, Flask, Request, current_app, render_template, request, redirect, url_for,
+    session, flash, abort, jsonify, g
 )
-from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.utils import secure_filename
-from models import db, User, Restaurant, Menu, Order, OrderItem, Comment
+from flask_migrate import Migrate
+from markupsafe import Markup
+from sqlalchemy.orm import joinedload
+from models import db, User, Restaurant, Menu, Comment, Order, OrderItem, OrderEvent
+from search import init_search, search_restaurants, FTS_TABLE
+from querycount import init_query_counter
+from ratings import init_ratings, record_rating
+from orders import init_orders, place_orders, can_transition, order_channel
+from images import init_images
+from storage import init_storage, save_upload, release, allowed_file
+from menus import init_menus, parse_price, import_menu, MenuImportError
+from deletion import init_deletion, delete_restaurants, delete_menus
+from geo import init_geo, nearby_restaurants, parse_coordinates, MAX_RADIUS_KM
+from assets import init_assets
+from cart_store import init_cart_store, get_cart_store, revalidate_cart, ANON_PREFIX
+from cache import init_cache, get_cache, invalidate, cached_page
+from database import configure_database, init_database
+from metrics import init_metrics, timed
+from passwords import init_passwords, hash_password, verify_password, get_hasher, PasswordPoolBusy
+from throttle import init_throttle, login_retry_after, charge_failed_login, reset_login_throttle
+from jobs import init_jobs, enqueue
+from replica import init_replica, use_primary
+from events import init_events, event_stream_response
+from sales import init_sales, sales_summary, recent_revenue, DASHBOARD_RANGES
+from exports import stream_order_export, stream_menu_export, EXPORT_FORMATS
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
 
 # --------------------
 # Flask Ayarları
 # --------------------
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///revstoran.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['UPLOAD_FOLDER'] = os.path.join('static', 'uploads')
-app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB resim limiti
-app.config['SECRET_KEY'] = 'supersecretkey'
-app.config['SESSION_PERMANENT'] = False
+# Varsayılanlar; ortam değişkenleriyle (FLASK_ önekli, değerler JSON olarak okunur:
+# FLASK_RESTAURANTS_PER_PAGE=48) ya da create_app(config) ile ezilir. Proje kökündeki
+# .env dosyası (python-dotenv) ortama yüklenir, zaten tanımlı değişkenler korunur.
+DEFAULT_CONFIG = {
+    'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+    'IMAGE_WORKERS': 2,  # arka planda resim varyantı üreten thread sayısı
+    'MAX_CONTENT_LENGTH': 5 * 1024 * 1024,  # 5MB resim limiti
+    # Genel sınırdan farklı gövde boyutu kabul eden route'lar
+    'MAX_CONTENT_LENGTH_BY_ENDPOINT': {
+        'main.import_menu_items': 50 * 1024 * 1024,  # menü dosyası + resim zip'i
+    },
+    'SESSION_PERMANENT': False,
+    'RESTAURANTS_PER_PAGE': 24,
+    'REVIEWS_PER_PAGE': 10,
+    'FRAGMENT_CACHE_SIZE': 1024,  # önbellekte tutulacak en fazla parça
+    'FRAGMENT_CACHE_TTL': 300,  # saniye
+    # Route başına SQL ifadesi bütçesi (yalnızca debug/test modunda kontrol edilir)
+    'SQL_QUERY_BUDGETS': {
+        'main.index': 3,
+        'main.search_api': 2,
+        'main.nearby_api': 1,
+        'main.restaurant_detail': 4,
+        'main.reviews': 3,
+        'main.reviews_api': 2,
+        'main.cart': 3,
+        'main.my_restaurants': 3,
+        'main.restaurant_dashboard': 4,
+    },
+}
+
+bp = Blueprint('main', __name__)
+migrate = Migrate()
+
+
+# Flask'ın Request'i MAX_CONTENT_LENGTH'i doğrudan okur; route eşleştikten sonra
+# MAX_CONTENT_LENGTH_BY_ENDPOINT'te tanımlı endpoint'ler kendi sınırlarını kullanır
+class LimitedRequest(Request):
+    @property
+    def max_content_length(self):
+        limit = super().max_content_length
+        if current_app:
+            limit = current_app.config['MAX_CONTENT_LENGTH_BY_ENDPOINT'].get(self.endpoint, limit)
+        return limit
+
+
+# FTS5 tabloları göçlerde elle yazılır; `flask db migrate` onları silmeye çalışmasın
+def _include_in_migrations(_obj, name, type_, _reflected, _compare_to):
+    return not (type_ == 'table' and name.startswith(FTS_TABLE))
+
+
+# Uygulama import anında değil, burada kurulur; import veritabanına dokunmaz. Şema
+# `flask db upgrade` (Flask-Migrate) ile yönetilir, uygulama açılışında tablo
+# oluşturulmaz. Üretimde wsgi.py kullanılır.
+def create_app(config=None):
+    load_dotenv()
+    app = Flask(__name__)
+    app.request_class = LimitedRequest
+    app.config.update(DEFAULT_CONFIG)
+    app.config['UPLOAD_FOLDER'] = os.path.join(app.static_folder, 'uploads')
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY')
+    # Server-Timing başlığı, istek logları ve /metrics (METRICS_ENABLED=1 ile açılır)
+    app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', '0') == '1'
+    app.config.from_prefixed_env()
+    app.config.update(config or {})
+    if not app.config['SECRET_KEY']:
+        # Geliştirme kolaylığı: oturumlar yeniden başlatmada ve süreçler arasında geçersiz olur
+        app.logger.warning('SECRET_KEY tanımlı değil; geçici bir anahtar üretildi.')
+        app.config['SECRET_KEY'] = secrets.token_hex(32)
+
+    configure_database(app)  # DATABASE_URL, havuz ve SQLite pragmaları
+    db.init_app(app)
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR, render_as_batch=True,
+                     include_object=_include_in_migrations)
+    init_database(app)
+    init_geo(app)  # bağlantılar açılmadan önce: SQL mesafe fonksiyonu
+    init_query_counter(app)
+    init_images(app)
+    init_storage(app)
+    init_assets(app)
+    init_cache(app)
+    init_metrics(app)
+    init_passwords(app)
+    init_throttle(app)
+    init_jobs(app)
+    init_cart_store(app)
+    init_replica(app)  # okuma replikası; DATABASE_REPLICA_URL ile açılır
+    init_events(app)
+    init_orders(app)
+    init_sales(app)
+    init_menus(app)
+    init_deletion(app)
+    init_search(app)
+    init_ratings(app)
+    app.register_blueprint(bp)
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    return app
 
-ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
-
-db.init_app(app)
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 # --------------------
 # Yardımcılar
 # --------------------
-def allowed_file(filename: str) -> bool:
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
-
 def current_user():
-    uid = session.get('user_id')
-    return User.query.get(uid) if uid else None
+    # Aynı istekte tekrar tekrar sorgulanmasın diye g üzerinde saklanır
+    if 'current_user' not in g:
+        uid = session.get('user_id')
+        g.current_user = User.query.get(uid) if uid else None
+    return g.current_user
 
 def login_required(view_func):
     @wraps(view_func)
     def wrapper(*args, **kwargs):
         if 'user_id' not in session:
             flash('Devam etmek için giriş yapmalısınız.', 'warning')
-            return redirect(url_for('login', next=request.path))
+            return redirect(url_for('main.login', next=request.path))
         return view_func(*args, **kwargs)
     return wrapper
 
+# Silinmiş (deleted_at ile işaretlenmiş) restoranlar yokmuş gibi davranır
+def _restaurant_or_404(id) -> Restaurant:
+    return Restaurant.query.filter_by(id=id, deleted_at=None).first_or_404()
+
 def owner_required(restaurant: Restaurant):
     user = current_user()
     if not user or restaurant.owner_id != user.id:
         abort(403)
 
-with app.app_context():
-    db.create_all()
-
 # --------------------
 # Kullanıcı Yönetimi
 # --------------------
-@app.route('/register', methods=['GET', 'POST'])
+@bp.route('/register', methods=['GET', 'POST'])
 def register():
     if request.method == 'POST':
         username = request.form.get('username', '').strip()
@@ -62,329 +177,553 @@ def register():
         raw_password = request.form.get('password', '')
         if not username or not email or not raw_password:
             flash('Tüm alanlar zorunludur.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
         if User.query.filter_by(email=email).first():
             flash('Bu email ile zaten bir hesap var.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
         if User.query.filter_by(username=username).first():
             flash('Bu kullanıcı adı kullanımda.', 'danger')
-            return redirect(url_for('register'))
-        password = generate_password_hash(raw_password, method='pbkdf2:sha256')
+            return redirect(url_for('main.register'))
+        try:
+            with timed('hash'):
+                password = hash_password(raw_password)
+        except PasswordPoolBusy:
+            flash('Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin.', 'warning')
+            return render_template('register.html'), 503, {'Retry-After': '5'}
         new_user = User(username=username, email=email, password=password)
         db.session.add(new_user)
         db.session.commit()
         flash('Kayıt başarılı, giriş yapabilirsiniz.', 'success')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
     return render_template('register.html')
 
-@app.route('/login', methods=['GET', 'POST'])
+@bp.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
         email = request.form.get('email', '').strip().lower()
         password = request.form.get('password', '')
+        # Sınırı aşan denemeler şifre kontrolüne (ve hash havuzuna) ulaşmaz
+        retry_after = login_retry_after(request.remote_addr, email)
+        if retry_after:
+            flash('Çok fazla giriş denemesi. Lütfen biraz sonra tekrar deneyin.', 'danger')
+            return render_template('login.html'), 429, {'Retry-After': str(int(retry_after) + 1)}
         user = User.query.filter_by(email=email).first()
-        if user and check_password_hash(user.password, password):
+        try:
+            with timed('hash'):
+                password_ok = user is not None and verify_password(user.password, password)
+                # Hash parametreleri değiştiyse şifre düz haliyle elimizdeyken güncellenir
+                if password_ok and get_hasher().needs_rehash(user.password):
+                    user.password = hash_password(password)
+                    db.session.commit()
+        except PasswordPoolBusy:
+            flash('Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin.', 'warning')
+            return render_template('login.html'), 503, {'Retry-After': '5'}
+        if password_ok:
+            reset_login_throttle(email)
+            anon_key = _cart_key() if 'cart_id' in session else None
             session['user_id'] = user.id
+            # Misafirken doldurulan sepet kullanıcının sepetine aktarılır
+            if anon_key:
+                get_cart_store().merge(anon_key, _cart_key())
+                session.pop('cart_id', None)
             flash('Giriş başarılı', 'success')
             next_url = request.args.get('next')
-            return redirect(next_url or url_for('index'))
+            return redirect(next_url or url_for('main.index'))
+        charge_failed_login(email)
         flash('Hatalı giriş bilgileri', 'danger')
     return render_template('login.html')
 
-@app.route('/logout')
+@bp.route('/logout')
 def logout():
     session.pop('user_id', None)
+    session.pop('cart_id', None)
     flash('Çıkış yapıldı', 'info')
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
 
 # --------------------
 # Anasayfa / Restoran Görüntüleme
 # --------------------
-@app.route('/')
+def _restaurant_cards(q, after_id):
+    # Kart listesi kullanıcıdan bağımsızdır; arama/sayfa başına önbelleklenir
+    def render():
+        restaurants, next_after_id = search_restaurants(
+            q, after_id=after_id, limit=current_app.config['RESTAURANTS_PER_PAGE']
+        )
+        return {
+            'html': Markup(render_template('_restaurant_cards.html', restaurants=restaurants)),
+            'count': len(restaurants),
+            'next_after_id': next_after_id,
+        }
+    return get_cache().get_or_set(('cards', q, after_id), ['restaurants'], render)
+
+def _review_page(restaurant_id, compact, before_id=None):
+    # Yorumlar en yeniden eskiye, id imleciyle sayfalanır (ix_comment_restaurant_id_id);
+    # sayfa maliyeti restoranın toplam yorum sayısından bağımsızdır
+    def render():
+        limit = current_app.config['REVIEWS_PER_PAGE']
+        query = (Comment.query.options(joinedload(Comment.author))
+                 .filter(Comment.restaurant_id == restaurant_id))
+        if before_id:
+            query = query.filter(Comment.id < before_id)
+        comments = query.order_by(Comment.id.desc()).limit(limit + 1).all()
+        next_before_id = comments[limit - 1].id if len(comments) > limit else None
+        comments = comments[:limit]
+        return {
+            'html': Markup(render_template('_review_list.html', comments=comments,
+                                           compact=compact, first_page=not before_id)),
+            'count': len(comments),
+            'next_before_id': next_before_id,
+        }
+    return get_cache().get_or_set(
+        ('reviews', restaurant_id, compact, before_id), [f'restaurant:{restaurant_id}'], render
+    )
+
+@bp.route('/')
+@cached_page('restaurants')
 def index():
-    restaurants = Restaurant.query.order_by(Restaurant.id.desc()).all()
-    return render_template('index.html', restaurants=restaurants, user=current_user())
+    q = request.args.get('q', '').strip()
+    after_id = request.args.get('after_id', type=int)
+    return render_template(
+        'index.html',
+        cards=_restaurant_cards(q, after_id),
+        q=q,
+        user=current_user()
+    )
+
+@bp.route('/api/restaurants/search')
+def search_api():
+    # Anasayfadaki arama kutusu bu uçtan kart HTML'ini ve sonraki sayfa imlecini alır
+    q = request.args.get('q', '').strip()
+    after_id = request.args.get('after_id', type=int)
+    cards = _restaurant_cards(q, after_id)
+    return jsonify(
+        html=str(cards['html']),
+        count=cards['count'],
+        next_after_id=cards['next_after_id']
+    )
+
+# ?lat=..&lng=..&radius_km=5&after=<mesafe>:<id>
+@bp.route('/api/restaurants/nearby')
+def nearby_api():
+    try:
+        lat, lng = parse_coordinates(request.args.get('lat'), request.args.get('lng'))
+        radius_km = float(request.args.get('radius_km', 5))
+        after = request.args.get('after')
+        if after:
+            after_distance, after_id = after.split(':')
+            after = (float(after_distance), int(after_id))
+    except ValueError:
+        abort(400)
+    if lat is None or not 0 < radius_km <= MAX_RADIUS_KM:
+        abort(400)
+    limit = min(request.args.get('limit', current_app.config['RESTAURANTS_PER_PAGE'], type=int),
+                current_app.config['RESTAURANTS_PER_PAGE'])
+    results, next_after = nearby_restaurants(lat, lng, radius_km, limit=max(limit, 1), after=after)
+    restaurants = [r for r, _d in results]
+    distances = {r.id: d for r, d in results}
+    return jsonify(
+        html=render_template('_restaurant_cards.html', restaurants=restaurants, distances=distances),
+        count=len(results),
+        results=[
+            {'id': r.id, 'name': r.name, 'address': r.address, 'latitude': r.latitude,
+             'longitude': r.longitude, 'distance_km': round(d, 3),
+             'url': url_for('main.restaurant_detail', id=r.id)}
+            for r, d in results
+        ],
+        next_after=f'{next_after[0]!r}:{next_after[1]}' if next_after else None,
+    )
 
-@app.route('/restaurant/<int:id>')
+@bp.route('/restaurant/<int:id>')
+@cached_page('restaurant:{id}')
 def restaurant_detail(id):
-    restaurant = Restaurant.query.get_or_404(id)
-    menu_items = Menu.query.filter_by(restaurant_id=id).all()
-    comments = Comment.query.filter_by(restaurant_id=id).order_by(Comment.id.desc()).all()
+    restaurant = _restaurant_or_404(id)
+    user = current_user()
+    # Menü butonları yalnızca bakan kişinin rolüne göre değişir
+    if user and user.id == restaurant.owner_id:
+        role = 'owner'
+    else:
+        role = 'customer' if user else 'anon'
+
+    def render_menu():
+        menu_items = Menu.query.filter_by(restaurant_id=id, deleted_at=None).all()
+        return Markup(render_template(
+            '_menu_grid.html', restaurant=restaurant, menu_items=menu_items, user=user
+        ))
+
+    menu_html = get_cache().get_or_set(('menu', id, role), [f'restaurant:{id}'], render_menu)
     return render_template(
         'restaurant_detail.html',
         restaurant=restaurant,
-        menu_items=menu_items,
-        comments=comments,
-        user=current_user()
+        menu_html=menu_html,
+        reviews=_review_page(id, compact=True),
+        user=user
     )
 
 # --------------------
 # Restoran ve Menü Yönetimi
 # --------------------
-@app.route('/add_restaurant', methods=['GET', 'POST'])
+@bp.route('/add_restaurant', methods=['GET', 'POST'])
 @login_required
 def add_restaurant():
     if request.method == 'POST':
         name = request.form.get('name', '').strip()
         description = request.form.get('description', '').strip()
         address = request.form.get('address', '').strip()
+        try:
+            latitude, longitude = parse_coordinates(request.form.get('latitude'), request.form.get('longitude'))
+        except ValueError:
+            flash('Geçersiz konum.', 'danger')
+            return redirect(url_for('main.add_restaurant'))
         image = request.files.get('image')
-        filename = None
+        image_path = None
         if image and image.filename:
             if not allowed_file(image.filename):
                 flash('İzin verilen resim uzantıları: png, jpg, jpeg, gif, webp', 'danger')
-                return redirect(url_for('add_restaurant'))
-            filename = secure_filename(image.filename)
-            image.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
+                return redirect(url_for('main.add_restaurant'))
+            image_path = save_upload(image)
         new_restaurant = Restaurant(
             owner_id=session['user_id'],
             name=name,
             description=description,
             address=address,
-            image_path=f"uploads/{filename}" if filename else None
+            latitude=latitude,
+            longitude=longitude,
+            image_path=image_path
         )
         db.session.add(new_restaurant)
         db.session.commit()
+        invalidate('restaurants')
         flash('Restoran eklendi.', 'success')
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     return render_template('add_restaurant.html', user=current_user())
 
-@app.route('/edit_restaurant/<int:id>', methods=['GET', 'POST'])
+@bp.route('/edit_restaurant/<int:id>', methods=['GET', 'POST'])
 @login_required
 def edit_restaurant(id):
-    restaurant = Restaurant.query.get_or_404(id)
+    restaurant = _restaurant_or_404(id)
     owner_required(restaurant)
     if request.method == 'POST':
         restaurant.name = request.form.get('name', restaurant.name).strip()
         restaurant.description = request.form.get('description', restaurant.description).strip()
         restaurant.address = request.form.get('address', restaurant.address).strip()
+        try:
+            restaurant.latitude, restaurant.longitude = parse_coordinates(
+                request.form.get('latitude'), request.form.get('longitude'))
+        except ValueError:
+            flash('Geçersiz konum.', 'danger')
+            return redirect(url_for('main.edit_restaurant', id=id))
         image = request.files.get('image')
         if image and image.filename:
             if not allowed_file(image.filename):
                 flash('İzin verilen resim uzantıları: png, jpg, jpeg, gif, webp', 'danger')
-                return redirect(url_for('edit_restaurant', id=id))
-            filename = secure_filename(image.filename)
-            image.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-            restaurant.image_path = f"uploads/{filename}"
+                return redirect(url_for('main.edit_restaurant', id=id))
+            old_image = restaurant.image_path
+            restaurant.image_path = save_upload(image)
+        else:
+            old_image = None
         db.session.commit()
+        invalidate('restaurants', f'restaurant:{id}')
+        release(old_image)
         flash('Restoran güncellendi.', 'success')
-        return redirect(url_for('restaurant_detail', id=id))
+        return redirect(url_for('main.restaurant_detail', id=id))
     return render_template('edit_restaurant.html', restaurant=restaurant, user=current_user())
 
-@app.route('/delete_restaurant/<int:id>', methods=['POST'])
+@bp.route('/delete_restaurant/<int:id>', methods=['POST'])
 @login_required
 def delete_restaurant(id):
-    restaurant = Restaurant.query.get_or_404(id)
+    restaurant = _restaurant_or_404(id)
     owner_required(restaurant)
-    db.session.delete(restaurant)
+    images = delete_restaurants([restaurant.id])
     db.session.commit()
+    invalidate('restaurants', f'restaurant:{id}')
+    release(*images)
     flash('Restoran silindi.', 'info')
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
 
-@app.route('/add_menu_item/<int:restaurant_id>', methods=['GET', 'POST'])
+@bp.route('/add_menu_item/<int:restaurant_id>', methods=['GET', 'POST'])
 @login_required
 def add_menu_item(restaurant_id):
-    restaurant = Restaurant.query.get_or_404(restaurant_id)
+    restaurant = _restaurant_or_404(restaurant_id)
     owner_required(restaurant)
     if request.method == 'POST':
         name = request.form.get('name', '').strip()
         description = request.form.get('description', '').strip()
-        price_str = request.form.get('price', '0').replace(',', '.')
         try:
-            price = float(price_str)
+            price = parse_price(request.form.get('price', '0'))
         except ValueError:
             flash('Geçersiz fiyat.', 'danger')
-            return redirect(url_for('add_menu_item', restaurant_id=restaurant_id))
+            return redirect(url_for('main.add_menu_item', restaurant_id=restaurant_id))
         image = request.files.get('image')
-        filename = None
+        image_path = None
         if image and image.filename:
             if not allowed_file(image.filename):
                 flash('İzin verilen resim uzantıları: png, jpg, jpeg, gif, webp', 'danger')
-                return redirect(url_for('add_menu_item', restaurant_id=restaurant_id))
-            filename = secure_filename(image.filename)
-            image.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
+                return redirect(url_for('main.add_menu_item', restaurant_id=restaurant_id))
+            image_path = save_upload(image)
         new_item = Menu(
             restaurant_id=restaurant_id,
             name=name,
             description=description,
             price=price,
-            image_path=f"uploads/{filename}" if filename else None
+            image_path=image_path
         )
         db.session.add(new_item)
         db.session.commit()
+        invalidate(f'restaurant:{restaurant_id}')
         flash('Menü ürünü eklendi.', 'success')
-        return redirect(url_for('restaurant_detail', id=restaurant_id))
+        return redirect(url_for('main.restaurant_detail', id=restaurant_id))
     return render_template('add_menu_item.html', restaurant_id=restaurant_id, user=current_user())
 
-@app.route('/edit_menu_item/<int:id>', methods=['GET', 'POST'])
+@bp.route('/import_menu/<int:restaurant_id>', methods=['GET', 'POST'])
+@login_required
+def import_menu_items(restaurant_id):
+    restaurant = _restaurant_or_404(restaurant_id)
+    owner_required(restaurant)
+    report = None
+    if request.method == 'POST':
+        menu_file = request.files.get('menu')
+        images = request.files.get('images')
+        if not menu_file or not menu_file.filename:
+            flash('Bir CSV veya JSON dosyası seçin.', 'danger')
+            return redirect(url_for('main.import_menu_items', restaurant_id=restaurant_id))
+        try:
+            report = import_menu(
+                restaurant_id, menu_file.read(), menu_file.filename,
+                images_zip=images.stream if images and images.filename else None,
+                max_image_size=current_app.config['MAX_CONTENT_LENGTH'],
+            )
+        except (MenuImportError, zipfile.BadZipFile) as e:
+            flash(str(e), 'danger')
+            return redirect(url_for('main.import_menu_items', restaurant_id=restaurant_id))
+        flash(f"{report['created']} ürün eklendi, {report['updated']} ürün güncellendi.",
+              'warning' if report['errors'] else 'success')
+    return render_template('import_menu.html', restaurant=restaurant, report=report,
+                           user=current_user())
+
+@bp.route('/edit_menu_item/<int:id>', methods=['GET', 'POST'])
 @login_required
 def edit_menu_item(id):
-    item = Menu.query.get_or_404(id)
-    restaurant = Restaurant.query.get_or_404(item.restaurant_id)
+    item = Menu.query.filter_by(id=id, deleted_at=None).first_or_404()
+    restaurant = _restaurant_or_404(item.restaurant_id)
     owner_required(restaurant)
     if request.method == 'POST':
         item.name = request.form.get('name', item.name).strip()
         item.description = request.form.get('description', item.description).strip()
-        price_str = request.form.get('price', str(item.price)).replace(',', '.')
         try:
-            item.price = float(price_str)
+            item.price = parse_price(request.form.get('price', str(item.price)))
         except ValueError:
             flash('Geçersiz fiyat.', 'danger')
-            return redirect(url_for('edit_menu_item', id=id))
+            return redirect(url_for('main.edit_menu_item', id=id))
         image = request.files.get('image')
         if image and image.filename:
             if not allowed_file(image.filename):
                 flash('İzin verilen resim uzantıları: png, jpg, jpeg, gif, webp', 'danger')
-                return redirect(url_for('edit_menu_item', id=id))
-            filename = secure_filename(image.filename)
-            image.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-            item.image_path = f"uploads/{filename}"
+                return redirect(url_for('main.edit_menu_item', id=id))
+            old_image = item.image_path
+            item.image_path = save_upload(image)
+        else:
+            old_image = None
         db.session.commit()
+        invalidate(f'restaurant:{item.restaurant_id}')
+        release(old_image)
         flash('Menü ürünü güncellendi.', 'success')
-        return redirect(url_for('restaurant_detail', id=item.restaurant_id))
+        return redirect(url_for('main.restaurant_detail', id=item.restaurant_id))
     return render_template('edit_menu_item.html', item=item, user=current_user())
 
-@app.route('/delete_menu_item/<int:id>', methods=['POST'])
+@bp.route('/delete_menu_item/<int:id>', methods=['POST'])
 @login_required
 def delete_menu_item(id):
-    item = Menu.query.get_or_404(id)
-    restaurant = Restaurant.query.get_or_404(item.restaurant_id)
+    item = Menu.query.filter_by(id=id, deleted_at=None).first_or_404()
+    restaurant = _restaurant_or_404(item.restaurant_id)
     owner_required(restaurant)
-    db.session.delete(item)
+    _deleted, _hidden, images = delete_menus(Menu.id == item.id)
     db.session.commit()
+    invalidate(f'restaurant:{restaurant.id}')
+    release(*images)
     flash('Menü ürünü silindi.', 'info')
-    return redirect(url_for('restaurant_detail', id=restaurant.id))
+    return redirect(url_for('main.restaurant_detail', id=restaurant.id))
 
 # --------------------
 # Sepet / Sipariş
 # --------------------
-def _init_cart():
-    if 'cart' not in session:
-        session['cart'] = {"restaurants": {}}
-    elif 'restaurants' not in session['cart']:
-        session['cart']['restaurants'] = {}
-
-def _cart_total():
-    _init_cart()
-    total = 0
-    for items in session['cart']['restaurants'].values():
-        total += sum(i['price'] * i['quantity'] for i in items)
-    return total
-
-@app.route('/cart')
+def _cart_key():
+    # Giriş yapmış kullanıcının sepeti cihazlar arasında ortaktır; misafirler için
+    # session'da yalnızca rastgele bir sepet kimliği tutulur
+    if 'user_id' in session:
+        return f"user:{session['user_id']}"
+    if 'cart_id' not in session:
+        session['cart_id'] = secrets.token_urlsafe(16)
+    return f"{ANON_PREFIX}{session['cart_id']}"
+
+@bp.route('/cart')
 def cart():
-    _init_cart()
-    # session key’leri string, template ile uyumlu
-    restaurant_objs = {rid: Restaurant.query.get(int(rid)) for rid in session['cart']['restaurants']}
+    cart = get_cart_store().load(_cart_key())
+    # tüm restoranlar tek sorguda; key'ler string, template ile uyumlu
+    rids = [int(rid) for rid in cart.restaurants]
+    restaurant_objs = {
+        str(r.id): r for r in Restaurant.query.filter(Restaurant.id.in_(rids))
+    } if rids else {}
     return render_template(
         'cart.html', 
-        cart=session['cart'], 
+        cart=cart, 
         restaurants=restaurant_objs, 
-        total=_cart_total(), 
+        total=cart.total, 
         user=current_user()
     )
 
-@app.route('/add_to_cart/<int:menu_id>', methods=['POST'])
+@bp.route('/add_to_cart/<int:menu_id>', methods=['POST'])
 def add_to_cart(menu_id):
-    _init_cart()
-    menu_item = Menu.query.get_or_404(menu_id)
-    rid = str(menu_item.restaurant_id)  # string key
-    if rid not in session['cart']['restaurants']:
-        session['cart']['restaurants'][rid] = []
-
-    # Eğer ürün zaten varsa quantity arttır
-    for it in session['cart']['restaurants'][rid]:
-        if it['id'] == menu_item.id:
-            it['quantity'] += 1
-            session.modified = True
-            return redirect(url_for('cart'))
-
-    # Yeni ürün ekle
-    session['cart']['restaurants'][rid].append({
-        "id": menu_item.id,
-        "name": menu_item.name,
-        "price": float(menu_item.price),
-        "quantity": 1,
-        "restaurant_name": menu_item.restaurant.name
-    })
-    session.modified = True
-    return redirect(url_for('cart'))
-
-@app.route('/update_cart_quantity/<int:menu_id>', methods=['POST'])
+    menu_item = (
+        Menu.query.options(joinedload(Menu.restaurant))
+        .filter_by(id=menu_id, deleted_at=None)
+        .first_or_404()
+    )
+    # Ürün zaten varsa quantity arttırılır
+    get_cart_store().add(_cart_key(), menu_item)
+    return redirect(url_for('main.cart'))
+
+@bp.route('/update_cart_quantity/<int:menu_id>', methods=['POST'])
 def update_cart_quantity(menu_id):
-    _init_cart()
     try:
         qty = int(request.form.get('quantity', '1'))
     except ValueError:
         qty = 1
     qty = max(1, min(50, qty))
+    get_cart_store().set_quantity(_cart_key(), menu_id, qty)
+    return redirect(url_for('main.cart'))
 
-    for items in session['cart']['restaurants'].values():
-        for it in items:
-            if it['id'] == menu_id:
-                it['quantity'] = qty
-                session.modified = True
-                break
-    return redirect(url_for('cart'))
-
-@app.route('/remove_from_cart/<int:menu_id>', methods=['POST'])
+@bp.route('/remove_from_cart/<int:menu_id>', methods=['POST'])
 def remove_from_cart(menu_id):
-    _init_cart()
-    to_remove = []
-    for rid, items in session['cart']['restaurants'].items():
-        session['cart']['restaurants'][rid] = [i for i in items if i['id'] != menu_id]
-        if not session['cart']['restaurants'][rid]:
-            to_remove.append(rid)
-    for rid in to_remove:
-        session['cart']['restaurants'].pop(rid)
-    session.modified = True
-    return redirect(url_for('cart'))
-
-@app.route('/clear_cart', methods=['POST'])
-def clear_cart():
-    session['cart'] = {"restaurants": {}}
-    session.modified = True
-    return redirect(url_for('cart'))
+    get_cart_store().remove(_cart_key(), menu_id)
+    return redirect(url_for('main.cart'))
 
-@app.route('/checkout', methods=['POST'])
+@bp.route('/clear_cart', methods=['POST'])
+def clear_cart():
+    get_cart_store().clear(_cart_key())
+    return redirect(url_for('main.cart'))
+
+# Siparişten önce sepet menünün güncel hâliyle karşılaştırılır. Kalkan ürünler çıkarılır,
+# değişen fiyatlar güncellenir; bir fark varsa kullanıcı bilgilendirilir ve sipariş
+# oluşturulmadan sepete geri gönderilir, onayladığı tutar ödediği tutarla aynı olur.
+def _revalidate_cart(store, cart):
+    changes = revalidate_cart(store, _cart_key(), cart)
+    for change in changes:
+        if change.get('removed'):
+            flash(f"{change['name']} artık satışta olmadığı için sepetinizden çıkarıldı.", 'warning')
+        else:
+            flash(f"{change['name']} fiyatı {change['old_price']:.2f} TL → "
+                  f"{change['new_price']:.2f} TL olarak güncellendi.", 'warning')
+    if changes:
+        flash('Sepetiniz güncellendi, lütfen kontrol edip siparişi yeniden onaylayın.', 'info')
+    return not changes
+
+
+@bp.route('/checkout', methods=['POST'])
 @login_required
 def checkout():
-    _init_cart()
-    restaurants = session['cart'].get('restaurants', {})
-    if not restaurants:
+    store = get_cart_store()
+    cart = store.load(_cart_key())
+    if not cart:
         flash('Sepetiniz boş.', 'warning')
-        return redirect(url_for('cart'))
-
-    for rid, items in restaurants.items():  # rid string
-        total_price = sum(it['price'] * it['quantity'] for it in items)
-        new_order = Order(
-            customer_id=session['user_id'],
-            restaurant_id=int(rid),
-            total_price=total_price,
-            status='pending'
-        )
-        db.session.add(new_order)
-        db.session.commit()
+        return redirect(url_for('main.cart'))
+    if not _revalidate_cart(store, cart):
+        return redirect(url_for('main.cart'))
 
-        for it in items:
-            db.session.add(OrderItem(
-                order_id=new_order.id,
-                menu_id=it['id'],
-                quantity=it['quantity'],
-                price=it['price']
-            ))
-        db.session.commit()
+    place_orders(session['user_id'], cart.restaurants)
 
-    session['cart'] = {"restaurants": {}}
-    session.modified = True
+    store.clear(_cart_key())
     flash('Siparişiniz alındı!', 'success')
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
+
+
+# --------------------
+# Sipariş Takibi (Restoran Sahibi)
+# --------------------
+ORDERS_PER_PAGE = 50
+
+def _orders_with_items():
+    return Order.query.options(
+        joinedload(Order.customer),
+        joinedload(Order.items).joinedload(OrderItem.menu_item),
+    )
+
+@bp.route('/restaurant/<int:id>/orders')
+@use_primary
+@login_required
+def restaurant_orders(id):
+    restaurant = _restaurant_or_404(id)
+    owner_required(restaurant)
+    orders = (
+        _orders_with_items()
+        .filter(Order.restaurant_id == id)
+        .order_by(Order.id.desc())
+        .limit(ORDERS_PER_PAGE)
+        .all()
+    )
+    # Akış, sayfanın gösterdiği son olaydan sonrasını getirir
+    last_event_id = (
+        db.session.query(db.func.max(OrderEvent.id))
+        .filter(OrderEvent.restaurant_id == id)
+        .scalar() or 0
+    )
+    return render_template('restaurant_orders.html', restaurant=restaurant, orders=orders,
+                           last_event_id=last_event_id, user=current_user())
+
+def _order_event_batch(restaurant_id, after_id):
+    events = (
+        OrderEvent.query
+        .filter(OrderEvent.restaurant_id == restaurant_id, OrderEvent.id > after_id)
+        .order_by(OrderEvent.id)
+        .limit(ORDERS_PER_PAGE)
+        .all()
+    )
+    if not events:
+        return []
+    orders = {
+        o.id: o for o in _orders_with_items().filter(Order.id.in_({e.order_id for e in events}))
+    }
+    return [
+        (e.id, 'order', json.dumps({
+            'order_id': e.order_id,
+            'status': e.status,
+            'html': render_template('_order_row.html', order=orders[e.order_id]),
+        }))
+        for e in events
+    ]
+
+@bp.route('/restaurant/<int:id>/orders/stream')
+@use_primary
+@login_required
+def restaurant_order_stream(id):
+    restaurant = _restaurant_or_404(id)
+    owner_required(restaurant)
+    # Tarayıcı yeniden bağlanırken Last-Event-ID başlığını kendisi gönderir
+    last_event_id = (request.headers.get('Last-Event-ID', type=int)
+                     or request.args.get('last_event_id', 0, type=int))
+    return event_stream_response(order_channel(id), last_event_id,
+                                 lambda after_id: _order_event_batch(id, after_id))
+
+@bp.route('/orders/<int:id>/status', methods=['POST'])
+@login_required
+def update_order_status(id):
+    order = Order.query.get_or_404(id)
+    # Restoranı silinmiş (ya da eski silmelerden kalma, restoranı olmayan) sipariş
+    if order.restaurant is None or order.restaurant.deleted_at is not None:
+        abort(404)
+    owner_required(order.restaurant)
+    status = request.form.get('status', '')
+    if not can_transition(order.status, status):
+        flash('Bu sipariş için geçersiz durum değişikliği.', 'danger')
+    else:
+        # Geçiş arka plan işçisinde uygulanır; sayfa canlı akıştan güncellenir
+        enqueue('orders.transition', order.id, status)
+    return redirect(url_for('main.restaurant_orders', id=order.restaurant_id))
 
 
 # --------------------
 # Yorum Yönetimi
 # --------------------
-@app.route('/add_review/<int:restaurant_id>', methods=['POST'])
+@bp.route('/add_review/<int:restaurant_id>', methods=['POST'])
 @login_required
 def add_review(restaurant_id):
     content = (request.form.get('content') or '').strip()
@@ -395,7 +734,10 @@ def add_review(restaurant_id):
     rating = max(1, min(5, rating))
     if not content:
         flash('Yorum alanı boş olamaz.', 'danger')
-        return redirect(url_for('restaurant_detail', id=restaurant_id))
+        return redirect(url_for('main.restaurant_detail', id=restaurant_id))
+    # Özet güncellemesi ve yorum aynı transaction'da
+    if not record_rating(restaurant_id, rating):
+        abort(404)
     new_comment = Comment(
         user_id=session['user_id'],
         restaurant_id=restaurant_id,
@@ -404,83 +746,131 @@ def add_review(restaurant_id):
     )
     db.session.add(new_comment)
     db.session.commit()
+    # Kartlardaki puan özeti de değiştiği için restoran listesi de geçersiz
+    invalidate('restaurants', f'restaurant:{restaurant_id}')
     flash('Yorumunuz eklendi.', 'success')
-    return redirect(url_for('restaurant_detail', id=restaurant_id))
+    return redirect(url_for('main.restaurant_detail', id=restaurant_id))
 
-@app.route('/reviews/<int:restaurant_id>')
+@bp.route('/reviews/<int:restaurant_id>')
+@cached_page('restaurant:{restaurant_id}')
 def reviews(restaurant_id):
-    comments = Comment.query.filter_by(restaurant_id=restaurant_id).order_by(Comment.id.desc()).all()
-    return render_template('reviews.html', comments=comments, user=current_user())
+    _restaurant_or_404(restaurant_id)
+    before_id = request.args.get('before_id', type=int)
+    return render_template(
+        'reviews.html',
+        restaurant_id=restaurant_id,
+        reviews=_review_page(restaurant_id, compact=False, before_id=before_id),
+        user=current_user()
+    )
+
+@bp.route('/api/restaurants/<int:restaurant_id>/reviews')
+def reviews_api(restaurant_id):
+    _restaurant_or_404(restaurant_id)
+    # "Daha fazla yorum" butonu bir sonraki sayfanın HTML'ini ve imlecini buradan alır
+    page = _review_page(restaurant_id,
+                        compact=request.args.get('compact', type=int) == 1,
+                        before_id=request.args.get('before_id', type=int))
+    return jsonify(
+        html=str(page['html']),
+        count=page['count'],
+        next_before_id=page['next_before_id']
+    )
 
 # --------------------
 # Hata Sayfaları
 # --------------------
-@app.errorhandler(403)
+@bp.app_errorhandler(403)
 def forbidden(_e):
     return render_template('errors/403.html'), 403
 
-@app.errorhandler(404)
+@bp.app_errorhandler(404)
 def not_found(_e):
     return render_template('errors/404.html'), 404
 
 #my restaurant
-@app.route('/my_restaurants')
+@bp.route('/my_restaurants')
 def my_restaurants():
     if 'user_id' not in session:
         flash("Önce giriş yapmalısınız.", "danger")
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
 
     user_id = session['user_id']
     # user_id yerine owner_id kullanıyoruz
-    restaurants = Restaurant.query.filter_by(owner_id=user_id).all()
-    return render_template('my_restaurants.html', restaurants=restaurants, user=current_user())
+    restaurants = (Restaurant.query.filter_by(owner_id=user_id, deleted_at=None)
+                   .order_by(Restaurant.id.desc()).all())
+    # Son 30 günün cirosu günlük özet tablosundan tek sorguyla okunur
+    revenue = recent_revenue([r.id for r in restaurants])
+    return render_template('my_restaurants.html', restaurants=restaurants, revenue=revenue,
+                           user=current_user())
+
+def _export_args():
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        abort(400)
+    try:
+        start, end = (date.fromisoformat(request.args[k]) if request.args.get(k) else None
+                      for k in ('start', 'end'))
+    except ValueError:
+        abort(400)
+    return fmt, request.args.get('after_id', 0, type=int), start, end
+
+# ?format=ndjson|csv&start=YYYY-MM-DD&end=YYYY-MM-DD&after_id=<id>
+@bp.route('/restaurant/<int:id>/export/orders')
+@login_required
+def export_orders(id):
+    owner_required(_restaurant_or_404(id))
+    fmt, after_id, start, end = _export_args()
+    return stream_order_export(id, fmt, after_id=after_id, start=start, end=end)
+
+@bp.route('/restaurant/<int:id>/export/menus')
+@login_required
+def export_menus(id):
+    owner_required(_restaurant_or_404(id))
+    fmt, after_id, _start, _end = _export_args()
+    return stream_menu_export(id, fmt, after_id=after_id)
+
+@bp.route('/restaurant/<int:id>/dashboard')
+@login_required
+def restaurant_dashboard(id):
+    restaurant = _restaurant_or_404(id)
+    owner_required(restaurant)
+    days = request.args.get('days', 30, type=int)
+    if days not in DASHBOARD_RANGES:
+        days = 30
+    return render_template('restaurant_dashboard.html', restaurant=restaurant, days=days,
+                           ranges=DASHBOARD_RANGES, summary=sales_summary(id, days),
+                           user=current_user())
 
 # odeme 
-@app.route('/payment', methods=['GET', 'POST'])
+@bp.route('/payment', methods=['GET', 'POST'])
 @login_required
 def payment():
-    _init_cart()
-    total = _cart_total()
-    if total == 0:
+    store = get_cart_store()
+    cart = store.load(_cart_key())
+    if not cart:
         flash('Sepetiniz boş.', 'warning')
-        return redirect(url_for('cart'))
+        return redirect(url_for('main.cart'))
+    if not _revalidate_cart(store, cart):
+        return redirect(url_for('main.cart'))
+    total = cart.total
 
     if request.method == 'POST':
         # Kullanıcı ödeme bilgilerini doldurmuş gibi varsayıyoruz
+        # Siparişi oluştur (checkout ile aynı servis, tek transaction)
+        place_orders(session['user_id'], cart.restaurants)
         flash('Ödeme başarılı! Siparişiniz alındı.', 'success')
-        
-        # Siparişi oluştur
-        restaurants = session['cart'].get('restaurants', {})
-        for rid, items in restaurants.items():  # rid string
-            total_price = sum(it['price'] * it['quantity'] for it in items)
-            new_order = Order(
-                customer_id=session['user_id'],
-                restaurant_id=int(rid),
-                total_price=total_price,
-                status='pending'
-            )
-            db.session.add(new_order)
-            db.session.commit()
-            for it in items:
-                db.session.add(OrderItem(
-                    order_id=new_order.id,
-                    menu_id=it['id'],
-                    quantity=it['quantity'],
-                    price=it['price']
-                ))
-            db.session.commit()
 
         # Sepeti temizle
-        session['cart'] = {"restaurants": {}}
-        session.modified = True
-        return redirect(url_for('index'))
+        store.clear(_cart_key())
+        return redirect(url_for('main.index'))
 
     return render_template('payment.html', total=total, user=current_user())
 
 
 
 # --------------------
-# CS50 için Çalıştır
+# Geliştirme Sunucusu
 # --------------------
+# Hata ayıklama modu FLASK_DEBUG=1 ile açılır; üretimde wsgi.py (gunicorn) kullanılır.
 if __name__ == '__main__':
-    app.run(host="0.0.0.0", port=8080, debug=True)
+    create_app().run(host='0.0.0.0', port=int(os.environ.get('PORT', 8080)))
@@ -0,0 +1,128 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from flask import request, send_from_directory
+from werkzeug.exceptions import NotFound
+
+try:
+    import brotli
+except ImportError:  # opsiyonel: yoksa yalnızca gzip üretilir
+    brotli = None
+
+# --------------------
+# Statik Dosya Sürümleme ve Önbellekleme
+# --------------------
+# url_for('static', filename=...) çağrılarına içerik özetinden türeyen bir sürüm
+# parametresi (?v=<özet>) eklenir. Sürümü güncel olan istekler bir yıl boyunca
+# "immutable" olarak önbelleğe alınır; dosya değişince URL de değiştiği için tarayıcı
+# yeni sürümü ister. `flask compress-assets` ile üretilen .br/.gz dosyaları, istemci
+# kabul ediyorsa sıkıştırılmadan yeniden gönderilmek yerine doğrudan servis edilir.
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.txt', '.html'}
+# uploads/ab/<sha256>.<uzantı>: isim zaten içerik özeti, ayrıca sürüm gerekmez
+_CONTENT_ADDRESSED = re.compile(r'^uploads/[0-9a-f]{2}/[0-9a-f]{64}(\.\w+)+$')
+# (Accept-Encoding adı, dosya uzantısı) tercih sırasıyla
+_ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+class AssetManifest:
+    # Dosya yolu -> (mtime, özet). Dosya değişmedikçe özet yeniden hesaplanmaz.
+    def __init__(self, static_folder):
+        self.static_folder = static_folder
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def version(self, filename):
+        if _CONTENT_ADDRESSED.match(filename):
+            return None
+        path = os.path.join(self.static_folder, filename)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._versions.get(filename)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'rb') as f:
+            digest = hashlib.md5(f.read(), usedforsecurity=False).hexdigest()[:12]
+        with self._lock:
+            self._versions[filename] = (mtime, digest)
+        return digest
+
+    def is_immutable(self, filename, requested_version):
+        if _CONTENT_ADDRESSED.match(filename):
+            return True
+        return requested_version is not None and requested_version == self.version(filename)
+
+
+def init_assets(app):
+    manifest = AssetManifest(app.static_folder)
+    app.extensions['asset_manifest'] = manifest
+
+    @app.url_defaults
+    def _fingerprint_static(endpoint, values):
+        if endpoint == 'static' and 'v' not in values:
+            version = manifest.version(values.get('filename', ''))
+            if version:
+                values['v'] = version
+
+    def serve_static(filename):
+        response = _send_precompressed(app.static_folder, filename)
+        if manifest.is_immutable(filename, request.args.get('v')):
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    app.view_functions['static'] = serve_static
+
+    @app.cli.command('compress-assets')
+    def compress_assets_command():
+        """Statik CSS/JS dosyalarının .gz (ve brotli kuruluysa .br) sürümlerini üretir."""
+        written = compress_assets(app.static_folder)
+        print(f'{written} sıkıştırılmış dosya yazıldı.')
+
+
+def _send_precompressed(static_folder, filename):
+    original = os.path.join(static_folder, filename)
+    accepted = request.accept_encodings
+    for encoding, suffix in _ENCODINGS:
+        compressed = original + suffix
+        if (accepted[encoding] and os.path.isfile(compressed)
+                and os.path.getmtime(compressed) >= os.path.getmtime(original)):
+            try:
+                response = send_from_directory(static_folder, filename + suffix)
+            except NotFound:
+                break
+            # Sıkıştırılmış dosya, orijinalin türüyle gönderilir
+            response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            return response
+    response = send_from_directory(static_folder, filename)
+    if os.path.splitext(filename)[1] in COMPRESSIBLE_EXTENSIONS:
+        response.vary.add('Accept-Encoding')
+    return response
+
+
+def compress_assets(static_folder):
+    written = 0
+    uploads = os.path.join(static_folder, 'uploads')
+    for dirpath, _dirnames, filenames in os.walk(static_folder):
+        if dirpath.startswith(uploads):
+            continue
+        for name in filenames:
+            if os.path.splitext(name)[1] not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            path = os.path.join(dirpath, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            with open(path + '.gz', 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            written += 1
+            if brotli is not None:
+                with open(path + '.br', 'wb') as f:
+                    f.write(brotli.compress(data, quality=11))
+                written += 1
+    return written
@@ -0,0 +1,30 @@
+import os
+import sys
+import tempfile
+from flask import Flask
+
+# benchmarks/ proje kökünden `python -m benchmarks.<isim>` ile çalıştırılır
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from models import db  # noqa: E402
+from database import configure_database, init_database  # noqa: E402
+
+
+# Geçici bir SQLite dosyası üzerinde yalnızca modelleri içeren küçük bir Flask
+# uygulaması kurar. Ölçümler geliştirme veritabanına dokunmaz.
+def make_bench_app(db_path=None, **config):
+    if db_path is None:
+        fd, db_path = tempfile.mkstemp(suffix='.db', prefix='bench-')
+        os.close(fd)
+    bench_app = Flask('benchmarks')
+    bench_app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    bench_app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    bench_app.config.update(config)
+    configure_database(bench_app)
+    db.init_app(bench_app)
+    init_database(bench_app)
+    with bench_app.app_context():
+        db.create_all()
+    return bench_app, db_path
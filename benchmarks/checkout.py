@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import statistics
+import time
+
+from sqlalchemy import event
+
+from benchmarks import make_bench_app
+from models import db, User, Restaurant, Menu, Order, OrderItem
+from orders import place_orders
+
+# --------------------
+# Checkout Benchmark
+# --------------------
+# Çok restoranlı büyük sepetler için eski (restoran başına iki commit) döngüyü
+# place_orders() ile karşılaştırır; checkout başına commit sayısı ve süre raporlanır.
+#
+#   python -m benchmarks.checkout --restaurants 20 --items 15 --runs 30
+
+
+def legacy_place_orders(customer_id, restaurants):
+    # checkout()/payment() içindeki eski döngünün birebir kopyası
+    for rid, items in restaurants.items():
+        total_price = sum(it['price'] * it['quantity'] for it in items)
+        new_order = Order(
+            customer_id=customer_id,
+            restaurant_id=int(rid),
+            total_price=total_price,
+            status='pending'
+        )
+        db.session.add(new_order)
+        db.session.commit()
+        for it in items:
+            db.session.add(OrderItem(
+                order_id=new_order.id,
+                menu_id=it['id'],
+                quantity=it['quantity'],
+                price=it['price']
+            ))
+        db.session.commit()
+
+
+def seed(n_restaurants, n_items):
+    user = User(username='bench', email='bench@example.com', password='x')
+    db.session.add(user)
+    db.session.flush()
+    cart = {}
+    for r in range(n_restaurants):
+        restaurant = Restaurant(owner_id=user.id, name=f'Restoran {r}')
+        db.session.add(restaurant)
+        db.session.flush()
+        menus = [Menu(restaurant_id=restaurant.id, name=f'Ürün {i}', price=10.0 + i)
+                 for i in range(n_items)]
+        db.session.add_all(menus)
+        db.session.flush()
+        cart[str(restaurant.id)] = [
+            {'id': m.id, 'name': m.name, 'price': m.price, 'quantity': 2,
+             'restaurant_name': restaurant.name}
+            for m in menus
+        ]
+    db.session.commit()
+    return user.id, cart
+
+
+def measure(fn, customer_id, cart, runs):
+    commits = 0
+
+    def _on_commit(_conn):
+        nonlocal commits
+        commits += 1
+
+    engine = db.engine
+    event.listen(engine, 'commit', _on_commit)
+    timings = []
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn(customer_id, cart)
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(engine, 'commit', _on_commit)
+    timings.sort()
+    return {
+        'commits_per_checkout': commits / runs,
+        'mean_ms': round(statistics.mean(timings), 3),
+        'p50_ms': round(timings[len(timings) // 2], 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--restaurants', type=int, default=20)
+    parser.add_argument('--items', type=int, default=15)
+    parser.add_argument('--runs', type=int, default=30)
+    args = parser.parse_args()
+
+    bench_app, db_path = make_bench_app()
+    try:
+        with bench_app.app_context():
+            customer_id, cart = seed(args.restaurants, args.items)
+            report = {
+                'restaurants_per_cart': args.restaurants,
+                'items_per_restaurant': args.items,
+                'runs': args.runs,
+                'legacy': measure(legacy_place_orders, customer_id, cart, args.runs),
+                'place_orders': measure(place_orders, customer_id, cart, args.runs),
+            }
+            db.session.remove()
+    finally:
+        os.remove(db_path)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from benchmarks import seed as seed_module
+
+# --------------------
+# Yük Testi
+# --------------------
+# Geçici bir veritabanını sentetik veriyle doldurur, ardından eşzamanlı işçilerle
+# gerçekçi bir trafik karışımını Flask uygulamasına uygular ve route başına
+# p50/p95/p99 gecikme, throughput ve SQL ifadesi sayısını JSON olarak raporlar.
+# --baseline ile önceki bir raporla karşılaştırma yapılabilir.
+#
+#   python -m benchmarks.loadtest --workers 8 --requests 4000 --output after.json
+#   python -m benchmarks.loadtest --baseline after.json
+
+# (senaryo, ağırlık)
+TRAFFIC_MIX = [
+    ('index', 35),
+    ('search', 10),
+    ('restaurant_detail', 30),
+    ('add_to_cart', 15),
+    ('checkout', 5),
+    ('add_review', 5),
+]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Worker(threading.Thread):
+    def __init__(self, app, user_no, dataset, requests, rng_seed, results, lock):
+        super().__init__(daemon=True)
+        self.client = app.test_client()
+        self.user_no = user_no
+        self.dataset = dataset
+        self.requests = requests
+        self.rng = random.Random(rng_seed)
+        self.results = results
+        self.lock = lock
+        self.cart_has_items = False
+
+    def _record(self, route, elapsed, response):
+        sql = response.headers.get('X-SQL-Queries')
+        with self.lock:
+            entry = self.results[route]
+            entry['latencies'].append(elapsed)
+            if sql is not None:
+                entry['sql'].append(int(sql))
+            if response.status_code >= 500:
+                entry['errors'] += 1
+
+    def _call(self, route, method, url, **kwargs):
+        start = time.perf_counter()
+        response = getattr(self.client, method)(url, **kwargs)
+        self._record(route, (time.perf_counter() - start) * 1000, response)
+        return response
+
+    def run(self):
+        self.client.post('/login', data={
+            'email': f'user{self.user_no}@bench.local',
+            'password': seed_module.BENCH_PASSWORD,
+        })
+        routes = [name for name, _ in TRAFFIC_MIX]
+        weights = [weight for _, weight in TRAFFIC_MIX]
+        restaurants = self.dataset['restaurants']
+        menus = self.dataset['menus']
+        for _ in range(self.requests):
+            scenario = self.rng.choices(routes, weights)[0]
+            if scenario == 'index':
+                self._call('index', 'get', '/')
+            elif scenario == 'search':
+                word = self.rng.choice(seed_module.WORDS)
+                self._call('search_api', 'get', f'/api/restaurants/search?q={word[:3]}')
+            elif scenario == 'restaurant_detail':
+                self._call('restaurant_detail', 'get', f'/restaurant/{self.rng.randint(1, restaurants)}')
+            elif scenario == 'add_to_cart':
+                self._call('add_to_cart', 'post', f'/add_to_cart/{self.rng.randint(1, menus)}')
+                self.cart_has_items = True
+            elif scenario == 'checkout':
+                if not self.cart_has_items:
+                    self._call('add_to_cart', 'post', f'/add_to_cart/{self.rng.randint(1, menus)}')
+                self._call('checkout', 'post', '/checkout')
+                self.cart_has_items = False
+            elif scenario == 'add_review':
+                self._call('add_review', 'post', f'/add_review/{self.rng.randint(1, restaurants)}',
+                           data={'content': 'Yük testi yorumu', 'rating': str(self.rng.randint(1, 5))})
+
+
+def summarize(results, wall_seconds):
+    routes = {}
+    total = 0
+    for route, entry in sorted(results.items()):
+        latencies = sorted(entry['latencies'])
+        total += len(latencies)
+        routes[route] = {
+            'requests': len(latencies),
+            'errors': entry['errors'],
+            'rps': round(len(latencies) / wall_seconds, 1),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'sql_mean': round(sum(entry['sql']) / len(entry['sql']), 2) if entry['sql'] else None,
+            'sql_max': max(entry['sql']) if entry['sql'] else None,
+        }
+    return {
+        'total_requests': total,
+        'wall_seconds': round(wall_seconds, 2),
+        'throughput_rps': round(total / wall_seconds, 1),
+        'routes': routes,
+    }
+
+
+def compare(report, baseline):
+    # Route başına p95 ve SQL sayısı farkları (pozitif = yavaşlama/artış)
+    diff = {}
+    for route, current in report['routes'].items():
+        before = baseline.get('routes', {}).get(route)
+        if not before:
+            continue
+        diff[route] = {
+            'p95_ms_delta': round(current['p95_ms'] - before['p95_ms'], 2),
+            'p95_change_pct': round(100 * (current['p95_ms'] - before['p95_ms']) / before['p95_ms'], 1)
+            if before['p95_ms'] else None,
+            'sql_mean_delta': round(current['sql_mean'] - before['sql_mean'], 2)
+            if current['sql_mean'] is not None and before['sql_mean'] is not None else None,
+        }
+    return diff
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    seed_module.add_arguments(parser)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=2000, help='toplam istek sayısı')
+    parser.add_argument('--no-cache', action='store_true', help='parça/sayfa önbelleğini kapat')
+    parser.add_argument('--output', help='raporun yazılacağı JSON dosyası')
+    parser.add_argument('--baseline', help='karşılaştırılacak önceki rapor')
+    args = parser.parse_args()
+
+    fd, db_path = tempfile.mkstemp(suffix='.db', prefix='loadtest-')
+    os.close(fd)
+    from flask_migrate import upgrade
+    from app import create_app
+    from models import db
+
+    config = {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'SQL_QUERY_COUNTING': True,
+        # Tüm işçiler aynı adresten giriş yapar; IP sınırı ölçümü bozmasın
+        'LOGIN_THROTTLE_IP': (max(20, args.workers * 2), 60),
+    }
+    if args.no_cache:
+        config.update(PAGE_CACHE_ENABLED=False, FRAGMENT_CACHE_SIZE=0)
+    app = create_app(config)
+
+    try:
+        with app.app_context():
+            upgrade()
+            dataset = seed_module.seed_from_args(args)
+
+        results = defaultdict(lambda: {'latencies': [], 'sql': [], 'errors': 0})
+        lock = threading.Lock()
+        per_worker = max(1, args.requests // args.workers)
+        workers = [
+            Worker(app, (i % args.users) + 1, dataset, per_worker, args.seed + i, results, lock)
+            for i in range(args.workers)
+        ]
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        wall = time.perf_counter() - start
+
+        report = {
+            'dataset': dataset,
+            'workers': args.workers,
+            'cache': not args.no_cache,
+            **summarize(results, wall),
+        }
+        if args.baseline:
+            with open(args.baseline) as f:
+                report['vs_baseline'] = compare(report, json.load(f))
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
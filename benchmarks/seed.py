@@ -0,0 +1,150 @@
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+
+from werkzeug.security import generate_password_hash
+
+from passwords import DEFAULT_HASH_METHOD
+from models import db, User, Restaurant, Menu, Order, OrderItem, Comment
+from ratings import rebuild_ratings
+from sales import rebuild_sales_rollups
+from geo import geohash_encode
+
+# --------------------
+# Sentetik Veri Seti
+# --------------------
+# Modeller üzerinden, toplu INSERT'lerle, tekrarlanabilir (sabit random seed) bir veri
+# seti üretir. Tüm kullanıcıların şifresi BENCH_PASSWORD'dür.
+#
+#   DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.seed --restaurants 2000
+BENCH_PASSWORD = 'bench-password'
+BATCH_SIZE = 5000
+
+WORDS = ['Kebap', 'Pizza', 'Burger', 'Sushi', 'Döner', 'Lahmacun', 'Mantı', 'Köfte',
+         'Balık', 'Salata', 'Tatlı', 'Kahve', 'Pide', 'Çorba', 'Makarna', 'Vegan']
+# Şehir merkezleri (enlem, boylam); restoranlar çevresine ~10 km içinde dağıtılır
+CITIES = {
+    'İstanbul': (41.0082, 28.9784),
+    'Ankara': (39.9334, 32.8597),
+    'İzmir': (38.4237, 27.1428),
+    'Bursa': (40.1885, 29.0610),
+    'Antalya': (36.8969, 30.7133),
+    'Eskişehir': (39.7767, 30.5206),
+}
+
+
+def _insert(model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(model.__table__.insert(), rows[start:start + BATCH_SIZE])
+
+
+# Uygulama bağlamı içinde çağrılır; boş bir veritabanı bekler.
+def seed_dataset(users=200, restaurants=500, menus_per_restaurant=12, comments=20000,
+                 orders=5000, items_per_order=3, seed=42):
+    rng = random.Random(seed)
+    password = generate_password_hash(BENCH_PASSWORD, method=DEFAULT_HASH_METHOD)
+    now = datetime.utcnow()
+
+    _insert(User, [
+        {'username': f'user{i}', 'email': f'user{i}@bench.local', 'password': password,
+         'created_at': now}
+        for i in range(1, users + 1)
+    ])
+    restaurant_rows = []
+    for i in range(1, restaurants + 1):
+        city = rng.choice(list(CITIES))
+        lat, lng = CITIES[city]
+        lat, lng = lat + rng.uniform(-0.09, 0.09), lng + rng.uniform(-0.12, 0.12)
+        restaurant_rows.append({
+            'owner_id': rng.randint(1, users),
+            'name': f'{rng.choice(WORDS)} {rng.choice(WORDS)} {i}',
+            'description': ' '.join(rng.choices(WORDS, k=12)).lower(),
+            'address': f'{city}, {rng.randint(1, 200)}. sokak',
+            'latitude': lat,
+            'longitude': lng,
+            'geohash': geohash_encode(lat, lng),
+            'created_at': now,
+        })
+    _insert(Restaurant, restaurant_rows)
+    menu_rows = []
+    for rid in range(1, restaurants + 1):
+        for j in range(menus_per_restaurant):
+            menu_rows.append({'restaurant_id': rid, 'name': f'{rng.choice(WORDS)} {j}',
+                              'description': 'günün özel tabağı',
+                              'price': round(rng.uniform(40, 600), 2)})
+    _insert(Menu, menu_rows)
+    _insert(Comment, [
+        {'user_id': rng.randint(1, users), 'restaurant_id': rng.randint(1, restaurants),
+         'content': 'Lezzetli ve hızlı teslimat.', 'rating': rng.randint(1, 5),
+         'created_at': now - timedelta(minutes=i)}
+        for i in range(comments)
+    ])
+
+    order_rows, item_rows = [], []
+    for order_id in range(1, orders + 1):
+        rid = rng.randint(1, restaurants)
+        first_menu = (rid - 1) * menus_per_restaurant + 1
+        total = 0
+        for _ in range(items_per_order):
+            menu_id = rng.randint(first_menu, first_menu + menus_per_restaurant - 1)
+            price = menu_rows[menu_id - 1]['price']
+            quantity = rng.randint(1, 3)
+            total += price * quantity
+            item_rows.append({'order_id': order_id, 'menu_id': menu_id,
+                              'quantity': quantity, 'price': price})
+        order_rows.append({'id': order_id, 'customer_id': rng.randint(1, users),
+                           'restaurant_id': rid, 'total_price': round(total, 2),
+                           'status': 'delivered',
+                           'created_at': now - timedelta(hours=rng.randint(0, 24 * 90))})
+    _insert(Order, order_rows)
+    _insert(OrderItem, item_rows)
+
+    rebuild_ratings()
+    rebuild_sales_rollups()
+    db.session.commit()
+    return {
+        'users': users,
+        'restaurants': restaurants,
+        'menus': len(menu_rows),
+        'comments': comments,
+        'orders': orders,
+        'order_items': len(item_rows),
+    }
+
+
+def add_arguments(parser):
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--restaurants', type=int, default=500)
+    parser.add_argument('--menus-per-restaurant', type=int, default=12)
+    parser.add_argument('--comments', type=int, default=20000)
+    parser.add_argument('--orders', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+
+
+def seed_from_args(args):
+    return seed_dataset(
+        users=args.users,
+        restaurants=args.restaurants,
+        menus_per_restaurant=args.menus_per_restaurant,
+        comments=args.comments,
+        orders=args.orders,
+        seed=args.seed,
+    )
+
+
+def main():
+    from flask_migrate import upgrade
+    from app import create_app
+
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    args = parser.parse_args()
+    app = create_app()
+    with app.app_context():
+        upgrade()
+        print(json.dumps(seed_from_args(args), indent=2))
+
+
+if __name__ == '__main__':
+    main()
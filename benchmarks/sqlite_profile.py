@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import random
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from benchmarks import make_bench_app
+from models import db, User, Restaurant, Comment
+
+# --------------------
+# SQLite Profil Benchmark'ı
+# --------------------
+# Aynı veri ve yük ile iki kurulumu karşılaştırır:
+#   baseline: varsayılan journal ayarları, pragma yok, bileşik indeksler yok
+#   tuned:    database.py profili (WAL, synchronous=NORMAL, mmap, busy_timeout,
+#             bağlantı havuzu) ve models.py indeksleri
+# Okuyucular restoran sayfasındaki yorum sorgusunu, yazarlar yorum eklemeyi taklit eder.
+#
+#   python -m benchmarks.sqlite_profile --readers 8 --writers 2 --seconds 5
+
+
+def seed(n_restaurants, n_comments):
+    user = User(username='bench', email='bench@example.com', password='x')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add_all([Restaurant(owner_id=user.id, name=f'Restoran {i}') for i in range(n_restaurants)])
+    db.session.flush()
+    rows = [
+        {'user_id': user.id, 'restaurant_id': random.randint(1, n_restaurants),
+         'content': 'yorum', 'rating': random.randint(1, 5)}
+        for _ in range(n_comments)
+    ]
+    db.session.execute(Comment.__table__.insert(), rows)
+    db.session.commit()
+    return user.id
+
+
+def run_profile(name, config, args):
+    bench_app, db_path = make_bench_app(**config)
+    stats = {'reads': 0, 'writes': 0, 'lock_errors': 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    with bench_app.app_context():
+        if name == 'baseline':
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.drop(db.engine, checkfirst=True)
+        user_id = seed(args.restaurants, args.comments)
+
+    def reader():
+        with bench_app.app_context():
+            while not stop.is_set():
+                rid = random.randint(1, args.restaurants)
+                try:
+                    (Comment.query.filter_by(restaurant_id=rid)
+                     .order_by(Comment.id.desc()).limit(20).all())
+                    db.session.rollback()
+                    key = 'reads'
+                except OperationalError:
+                    db.session.rollback()
+                    key = 'lock_errors'
+                with lock:
+                    stats[key] += 1
+
+    def writer():
+        with bench_app.app_context():
+            while not stop.is_set():
+                try:
+                    db.session.add(Comment(user_id=user_id, restaurant_id=random.randint(1, args.restaurants),
+                                           content='yeni yorum', rating=4))
+                    db.session.commit()
+                    key = 'writes'
+                except OperationalError:
+                    db.session.rollback()
+                    key = 'lock_errors'
+                with lock:
+                    stats[key] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=writer) for _ in range(args.writers)]
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    with bench_app.app_context():
+        db.engine.dispose()
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    return {
+        'reads_per_sec': round(stats['reads'] / args.seconds, 1),
+        'writes_per_sec': round(stats['writes'] / args.seconds, 1),
+        'lock_errors': stats['lock_errors'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--restaurants', type=int, default=500)
+    parser.add_argument('--comments', type=int, default=200000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    report = {
+        'readers': args.readers,
+        'writers': args.writers,
+        'seconds': args.seconds,
+        'baseline': run_profile('baseline', {'SQLITE_PRAGMAS': {}}, args),
+        'tuned': run_profile('tuned', {}, args),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
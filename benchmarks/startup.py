@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import ROOT
+
+# --------------------
+# Açılış Süresi Benchmark'ı
+# --------------------
+# Her ölçüm yeni bir Python sürecinde yapılır (gunicorn işçisinin preload olmadan
+# açılışı gibi): `import app`, create_app() ve ilk isteğin süresi ile create_app()
+# sırasında açılan veritabanı bağlantısı ve çalışan SQL ifadesi sayısı raporlanır.
+# Import ve create_app() veritabanına dokunmamalıdır (0 bağlantı, 0 ifade); şema önceden
+# `flask db upgrade` ile hazırlanır.
+#
+#   python -m benchmarks.startup --runs 10
+
+CHILD = r'''
+import json, sys, time
+t0 = time.perf_counter()
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+import app as app_module
+t1 = time.perf_counter()
+counts = {'connections': 0, 'statements': 0}
+event.listen(Pool, 'connect', lambda *a: counts.__setitem__('connections', counts['connections'] + 1))
+event.listen(Engine, 'before_cursor_execute',
+             lambda *a: counts.__setitem__('statements', counts['statements'] + 1))
+application = app_module.create_app(json.loads(sys.argv[1]))
+t2 = time.perf_counter()
+boot = dict(counts)
+response = application.test_client().get('/')
+t3 = time.perf_counter()
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'create_app_ms': (t2 - t1) * 1000,
+    'first_request_ms': (t3 - t2) * 1000,
+    'boot_connections': boot['connections'],
+    'boot_statements': boot['statements'],
+    'status': response.status_code,
+}))
+'''
+
+
+def prepare_database(db_path):
+    from flask_migrate import upgrade
+    from app import create_app
+    from models import db
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+    with app.app_context():
+        upgrade()
+        db.engine.dispose()
+
+
+def measure(config):
+    out = subprocess.run(
+        [sys.executable, '-c', CHILD, json.dumps(config)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples, key):
+    values = sorted(s[key] for s in samples)
+    return {'median': round(statistics.median(values), 1), 'max': round(values[-1], 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', help='raporun yazılacağı dosya')
+    args = parser.parse_args()
+
+    fd, db_path = tempfile.mkstemp(suffix='.db', prefix='startup-')
+    os.close(fd)
+    try:
+        prepare_database(db_path)
+        config = {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}', 'SECRET_KEY': 'bench'}
+        samples = [measure(config) for _ in range(args.runs)]
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+    report = {
+        'runs': args.runs,
+        'import_ms': summarize(samples, 'import_ms'),
+        'create_app_ms': summarize(samples, 'create_app_ms'),
+        'first_request_ms': summarize(samples, 'first_request_ms'),
+        'boot_connections': max(s['boot_connections'] for s in samples),
+        'boot_statements': max(s['boot_statements'] for s in samples),
+        'statuses': sorted({s['status'] for s in samples}),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request, session
+
+# --------------------
+# Parça ve Sayfa Önbelleği
+# --------------------
+# Katalog okumaları (anasayfa kartları, menü listesi, yorum listesi) yazmalara göre
+# çok daha sık olduğundan render edilmiş HTML süreç içinde LRU + TTL ile saklanır.
+#
+# Geçersiz kılma isim alanlarıyla yapılır: her kayıt, bağlı olduğu isim alanlarının
+# (ör. "restaurants", "restaurant:7") o anki nesil numarasını anahtarında taşır.
+# Yazan route invalidate("restaurant:7") çağırınca nesil artar ve eski kayıtlar bir
+# daha okunmaz, LRU tarafından zamanla atılır. Önbellek süreç içidir; çok süreçli
+# kurulumlarda diğer süreçlerdeki bayatlık en fazla TTL kadardır.
+
+
+class LRUTTLCache:
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class FragmentCache:
+    def __init__(self, maxsize=1024, ttl=300):
+        self.backend = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations = {}
+        self._lock = threading.Lock()
+        self.invalidations = 0
+        self._deferred = None  # okuma replikası varken: son eşitlemeden beri geçersizler
+
+    def _full_key(self, key, namespaces):
+        return (key, tuple((ns, self._generations.get(ns, 0)) for ns in namespaces))
+
+    def get(self, key, namespaces):
+        return self.backend.get(self._full_key(key, namespaces))
+
+    def set(self, key, namespaces, value):
+        self.backend.set(self._full_key(key, namespaces), value)
+
+    # Kayıt yoksa `render()` çağrılır ve sonucu saklanır
+    def get_or_set(self, key, namespaces, render):
+        full_key = self._full_key(key, namespaces)
+        value = self.backend.get(full_key)
+        if value is None:
+            value = render()
+            self.backend.set(full_key, value)
+        return value
+
+    def invalidate(self, *namespaces, deferred=True):
+        with self._lock:
+            for ns in namespaces:
+                self._generations[ns] = self._generations.get(ns, 0) + 1
+            self.invalidations += 1
+            if deferred and self._deferred is not None:
+                self._deferred.update(namespaces)
+
+    # Okuma replikası yazmaların gerisinde kalır: yazmadan hemen sonra replikadan
+    # doldurulan kayıt bayattır. Geçersiz kılınan isim alanları toplanır ve replika
+    # eşitlendikten sonra bir kez daha geçersiz kılınır (replica.sync_replica).
+    def defer_invalidations(self):
+        with self._lock:
+            if self._deferred is None:
+                self._deferred = set()
+
+    def take_deferred(self):
+        with self._lock:
+            if not self._deferred:
+                return set()
+            namespaces, self._deferred = self._deferred, set()
+            return namespaces
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        lookups = self.backend.hits + self.backend.misses
+        return {
+            'hits': self.backend.hits,
+            'misses': self.backend.misses,
+            'hit_ratio': round(self.backend.hits / lookups, 4) if lookups else 0.0,
+            'entries': len(self.backend),
+            'invalidations': self.invalidations,
+        }
+
+
+def init_cache(app):
+    app.extensions['fragment_cache'] = FragmentCache(
+        maxsize=app.config.get('FRAGMENT_CACHE_SIZE', 1024),
+        ttl=app.config.get('FRAGMENT_CACHE_TTL', 300),
+    )
+
+
+def get_cache():
+    return current_app.extensions['fragment_cache']
+
+
+def invalidate(*namespaces):
+    get_cache().invalidate(*namespaces)
+
+
+# Misafirler için tüm sayfayı önbellekten verir. Giriş yapmış kullanıcıların ve
+# bekleyen flash mesajı olan isteklerin sayfası kişiye özel olduğundan atlanır.
+# İsim alanları view argümanlarıyla biçimlenir: cached_page('restaurant:{id}')
+def cached_page(*namespaces):
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            if (not current_app.config.get('PAGE_CACHE_ENABLED', True)
+                    or request.method != 'GET'
+                    or 'user_id' in session
+                    or session.get('_flashes')):
+                return view_func(*args, **kwargs)
+            page_cache = get_cache()
+            ns = [n.format(**kwargs) for n in namespaces]
+            key = ('page', request.full_path)
+            html = page_cache.get(key, ns)
+            if html is None:
+                html = view_func(*args, **kwargs)
+                if not isinstance(html, str):
+                    return html
+                page_cache.set(key, ns, html)
+            return html
+        return wrapper
+    return decorator
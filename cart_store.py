@@ -0,0 +1,304 @@
+import copy
+import threading
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from sqlalchemy import bindparam, literal, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import db, CartItem, Menu
+from jobs import task
+
+# --------------------
+# Sunucu Taraflı Sepet
+# --------------------
+# Sepet içeriği cookie'de taşınmaz; her istekte yalnızca sepet anahtarı bilinir.
+# Kalemler menu_id ile indekslenir, ekleme/güncelleme/silme tek satırlık işlemlerdir.
+# Arka uç CART_BACKEND ile seçilir: 'sql' (varsayılan, CartItem tablosu) veya
+# 'memory' (süreç içi, testler için).
+#
+# Misafir sepetleri ("anon:" anahtarlı) girişte kullanıcının sepetine aktarılır; terk
+# edilenler CART_ANON_MAX_AGE_DAYS gün dokunulmadıktan sonra saatlik 'carts.expire_anonymous'
+# işiyle (ya da `flask cleanup-carts` ile) silinir.
+ANON_PREFIX = 'anon:'
+
+
+class Cart:
+    # Sepetin okunmuş hali: {menu_id: kalem}. Kalemler eski session sepetiyle aynı
+    # alanlara sahiptir (id, name, price, quantity, restaurant_id, restaurant_name).
+    def __init__(self, items=None):
+        self.items = items or {}
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def restaurants(self):
+        # {"<restoran_id>": [kalem, ...]}: şablon ve place_orders() bu biçimi kullanır
+        grouped = {}
+        for item in self.items.values():
+            grouped.setdefault(str(item['restaurant_id']), []).append(item)
+        return grouped
+
+    @property
+    def total(self):
+        return sum(i['price'] * i['quantity'] for i in self.items.values())
+
+
+def _item_from_menu(menu_item, quantity=1):
+    return {
+        'id': menu_item.id,
+        'name': menu_item.name,
+        'price': float(menu_item.price),
+        'quantity': quantity,
+        'restaurant_id': menu_item.restaurant_id,
+        'restaurant_name': menu_item.restaurant.name,
+    }
+
+
+class MemoryCartStore:
+    def __init__(self):
+        self._carts = {}
+        self._updated = {}  # anahtar -> son değişiklik zamanı
+        self._lock = threading.Lock()
+
+    def load(self, key):
+        with self._lock:
+            return Cart(copy.deepcopy(self._carts.get(key, {})))
+
+    def add(self, key, menu_item, quantity=1):
+        with self._lock:
+            items = self._carts.setdefault(key, {})
+            if menu_item.id in items:
+                items[menu_item.id]['quantity'] += quantity
+            else:
+                items[menu_item.id] = _item_from_menu(menu_item, quantity)
+            self._updated[key] = datetime.utcnow()
+
+    def set_quantity(self, key, menu_id, quantity):
+        with self._lock:
+            item = self._carts.get(key, {}).get(menu_id)
+            if item:
+                item['quantity'] = quantity
+                self._updated[key] = datetime.utcnow()
+
+    def remove(self, key, menu_id):
+        with self._lock:
+            if self._carts.get(key, {}).pop(menu_id, None) is not None:
+                self._updated[key] = datetime.utcnow()
+
+    def clear(self, key):
+        with self._lock:
+            self._carts.pop(key, None)
+            self._updated.pop(key, None)
+
+    def reconcile(self, key, removed_ids, prices):
+        with self._lock:
+            items = self._carts.get(key, {})
+            for menu_id in removed_ids:
+                items.pop(menu_id, None)
+            for menu_id, price in prices.items():
+                if menu_id in items:
+                    items[menu_id]['price'] = price
+            if key in self._carts:
+                self._updated[key] = datetime.utcnow()
+
+    def merge(self, src_key, dst_key):
+        with self._lock:
+            src = self._carts.pop(src_key, {})
+            self._updated.pop(src_key, None)
+            dst = self._carts.setdefault(dst_key, {})
+            for menu_id, item in src.items():
+                if menu_id in dst:
+                    dst[menu_id]['quantity'] += item['quantity']
+                else:
+                    dst[menu_id] = item
+            self._updated[dst_key] = datetime.utcnow()
+
+    def expire(self, prefix, before):
+        with self._lock:
+            stale = [key for key in self._carts
+                     if key.startswith(prefix) and self._updated.get(key, before) < before]
+            for key in stale:
+                self._carts.pop(key)
+                self._updated.pop(key, None)
+            return len(stale)
+
+
+class SQLCartStore:
+    # Her işlem (cart_key, menu_id) üzerindeki tekil indeksle tek satıra dokunur
+    # ve kendi transaction'ını commit eder.
+    def load(self, key):
+        rows = CartItem.query.filter_by(cart_key=key).order_by(CartItem.id).all()
+        return Cart({
+            row.menu_id: {
+                'id': row.menu_id,
+                'name': row.name,
+                'price': row.price,
+                'quantity': row.quantity,
+                'restaurant_id': row.restaurant_id,
+                'restaurant_name': row.restaurant_name,
+            }
+            for row in rows
+        })
+
+    def add(self, key, menu_item, quantity=1):
+        item = _item_from_menu(menu_item, quantity)
+        stmt = sqlite_insert(CartItem).values(
+            cart_key=key,
+            menu_id=item['id'],
+            restaurant_id=item['restaurant_id'],
+            name=item['name'],
+            restaurant_name=item['restaurant_name'],
+            price=item['price'],
+            quantity=quantity,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CartItem.cart_key, CartItem.menu_id],
+            set_={'quantity': CartItem.quantity + stmt.excluded.quantity,
+                  'updated_at': stmt.excluded.updated_at},
+        )
+        db.session.execute(stmt)
+        db.session.commit()
+
+    def set_quantity(self, key, menu_id, quantity):
+        CartItem.query.filter_by(cart_key=key, menu_id=menu_id).update(
+            {'quantity': quantity, 'updated_at': datetime.utcnow()}, synchronize_session=False
+        )
+        db.session.commit()
+
+    def remove(self, key, menu_id):
+        CartItem.query.filter_by(cart_key=key, menu_id=menu_id).delete(synchronize_session=False)
+        self._touch(key)
+        db.session.commit()
+
+    def clear(self, key):
+        CartItem.query.filter_by(cart_key=key).delete(synchronize_session=False)
+        db.session.commit()
+
+    def reconcile(self, key, removed_ids, prices):
+        # Kaldırılan ürünler tek DELETE ... IN, fiyat değişiklikleri tek executemany UPDATE
+        now = datetime.utcnow()
+        if removed_ids:
+            CartItem.query.filter(
+                CartItem.cart_key == key, CartItem.menu_id.in_(removed_ids)
+            ).delete(synchronize_session=False)
+        if prices:
+            table = CartItem.__table__
+            db.session.execute(
+                table.update()
+                .where(table.c.cart_key == key, table.c.menu_id == bindparam('m_id'))
+                .values(price=bindparam('m_price'), updated_at=now),
+                [{'m_id': menu_id, 'm_price': price} for menu_id, price in prices.items()]
+            )
+        elif removed_ids:
+            self._touch(key, now)
+        db.session.commit()
+
+    def merge(self, src_key, dst_key):
+        # Misafir sepeti girişte kullanıcının sepetine aktarılır; ortak ürünlerde
+        # miktarlar toplanır. Tek INSERT ... SELECT ... ON CONFLICT ve tek DELETE.
+        columns = ['menu_id', 'restaurant_id', 'name', 'restaurant_name', 'price', 'quantity']
+        source = (
+            select(literal(dst_key), *[CartItem.__table__.c[c] for c in columns],
+                   literal(datetime.utcnow()))
+            .where(CartItem.cart_key == src_key)
+        )
+        stmt = sqlite_insert(CartItem).from_select(['cart_key', *columns, 'updated_at'], source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CartItem.cart_key, CartItem.menu_id],
+            set_={'quantity': CartItem.quantity + stmt.excluded.quantity,
+                  'updated_at': stmt.excluded.updated_at},
+        )
+        db.session.execute(stmt)
+        CartItem.query.filter_by(cart_key=src_key).delete(synchronize_session=False)
+        db.session.commit()
+
+    # Kalem silen işlemler de sepeti "dokunulmuş" sayar: kalan satırların zamanı güncellenir
+    def _touch(self, key, now=None):
+        CartItem.query.filter_by(cart_key=key).update(
+            {'updated_at': now or datetime.utcnow()}, synchronize_session=False
+        )
+
+    def expire(self, prefix, before):
+        # Son kalemi `before`dan eski olan sepetler bütün olarak silinir
+        recent = (
+            select(CartItem.cart_key)
+            .where(CartItem.cart_key.startswith(prefix), CartItem.updated_at >= before)
+        )
+        deleted = CartItem.query.filter(
+            CartItem.cart_key.startswith(prefix), CartItem.cart_key.not_in(recent)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+
+# Sepetteki fiyat anlık görüntülerini menünün güncel satırlarıyla karşılaştırır. Tüm
+# kalemler tek bir IN (...) sorgusuyla çözülür; satıştan kalkan ürünler sepetten
+# çıkarılır, fiyatı değişenler güncel fiyata çekilir (hem depoda hem `cart` üzerinde).
+# Dönen değişiklik listesi boşsa sepet olduğu gibi siparişe çevrilebilir:
+#   [{'name', 'removed': True} | {'name', 'old_price', 'new_price'}, ...]
+def revalidate_cart(store, key, cart):
+    if not cart:
+        return []
+    current = dict(
+        db.session.query(Menu.id, Menu.price)
+        .filter(Menu.id.in_(list(cart.items)), Menu.deleted_at.is_(None))
+    )
+    changes, removed_ids, prices = [], [], {}
+    for menu_id, item in list(cart.items.items()):
+        if menu_id not in current:
+            removed_ids.append(menu_id)
+            changes.append({'name': item['name'], 'removed': True})
+            del cart.items[menu_id]
+        elif round(current[menu_id], 2) != round(item['price'], 2):
+            prices[menu_id] = float(current[menu_id])
+            changes.append({'name': item['name'], 'old_price': item['price'],
+                            'new_price': prices[menu_id]})
+            item['price'] = prices[menu_id]
+    if changes:
+        store.reconcile(key, removed_ids, prices)
+    return changes
+
+
+CART_BACKENDS = {
+    'sql': SQLCartStore,
+    'memory': MemoryCartStore,
+}
+
+
+def init_cart_store(app):
+    app.config.setdefault('CART_BACKEND', 'sql')
+    app.config.setdefault('CART_ANON_MAX_AGE_DAYS', 30)  # 0: kapalı
+    app.extensions['cart_store'] = None
+    if app.config['CART_ANON_MAX_AGE_DAYS']:
+        app.extensions['jobs'].every('carts.expire_anonymous', 3600)
+
+    @app.cli.command('cleanup-carts')
+    @click.option('--days', type=int, default=None,
+                  help='Bu kadar gündür dokunulmamış misafir sepetleri silinir.')
+    def cleanup_carts_command(days):
+        """Terk edilmiş misafir sepetlerini siler."""
+        removed = expire_anonymous_carts(days)
+        print(f'{removed} sepet kalemi silindi.')
+
+
+# Arka uç ilk kullanımda oluşturulur; testler CART_BACKEND'i import sonrası değiştirebilir
+def get_cart_store():
+    store = current_app.extensions.get('cart_store')
+    if store is None:
+        store = CART_BACKENDS[current_app.config['CART_BACKEND']]()
+        current_app.extensions['cart_store'] = store
+    return store
+
+
+# Uzun süredir dokunulmamış misafir sepetlerini siler; silinen kalem (bellek arka ucunda
+# sepet) sayısını döndürür
+@task('carts.expire_anonymous')
+def expire_anonymous_carts(days=None) -> int:
+    days = current_app.config['CART_ANON_MAX_AGE_DAYS'] if days is None else days
+    if not days:
+        return 0
+    return get_cart_store().expire(ANON_PREFIX, datetime.utcnow() - timedelta(days=days))
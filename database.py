@@ -0,0 +1,78 @@
+import os
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from models import db
+
+# --------------------
+# Veritabanı Profili
+# --------------------
+# Bağlantı adresi DATABASE_URL ortam değişkeninden okunur. SQLite dosyaları için her
+# yeni bağlantıda SQLITE_PRAGMAS uygulanır: WAL modunda okuyucular yazarı beklemez,
+# synchronous=NORMAL ile her commit'te değil yalnızca checkpoint'te fsync yapılır,
+# mmap okumaları hızlandırır, busy_timeout kilit çakışmasında hemen hata yerine bekletir.
+DEFAULT_DATABASE_URL = 'sqlite:///revstoran.db'
+
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # ms
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -16000,  # KiB (negatif değer)
+    'temp_store': 'MEMORY',
+}
+
+
+def _is_sqlite_file(url):
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+
+# db.init_app()'ten önce çağrılır: bağlantı adresi ve havuz ayarları
+def configure_database(app):
+    app.config.setdefault(
+        'SQLALCHEMY_DATABASE_URI', os.environ.get('DATABASE_URL', DEFAULT_DATABASE_URL)
+    )
+    # Okuma replikası (replica.py): GET isteklerinin SELECT'leri bu bind'a gider
+    replica_url = os.environ.get('DATABASE_REPLICA_URL')
+    if replica_url:
+        app.config.setdefault('SQLALCHEMY_BINDS', {}).setdefault('replica', replica_url)
+    app.config.setdefault('SQLITE_PRAGMAS', DEFAULT_SQLITE_PRAGMAS)
+    options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if _is_sqlite_file(uri) or not uri.startswith('sqlite'):
+        # Bağlantılar istekler arasında yeniden kullanılır (QueuePool)
+        options.setdefault('pool_size', int(os.environ.get('DB_POOL_SIZE', 10)))
+        options.setdefault('max_overflow', int(os.environ.get('DB_MAX_OVERFLOW', 20)))
+        options.setdefault('pool_timeout', 30)
+    if uri.startswith('sqlite'):
+        connect_args = options.setdefault('connect_args', {})
+        # Havuzdaki bağlantılar farklı thread'lerde kullanılabilir
+        connect_args.setdefault('check_same_thread', False)
+
+
+# db.init_app()'ten sonra çağrılır: her yeni SQLite bağlantısına pragmaları uygular
+def init_database(app):
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name != 'sqlite':
+                continue
+            file_backed = _is_sqlite_file(engine.url)
+            statements = [
+                f'PRAGMA {name}={value}' for name, value in pragmas.items()
+                if file_backed or name != 'journal_mode'
+            ]
+            if statements:
+                event.listen(engine, 'connect', _pragma_setter(statements))
+
+
+def _pragma_setter(statements):
+    def set_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+    return set_pragmas
+
@@ -0,0 +1,100 @@
+from datetime import datetime
+from sqlalchemy import delete, exists, select, update
+from models import db, Restaurant, Menu, Comment, CartItem, Order, OrderItem
+from orders import OPEN_STATUSES, cancel_orders
+from storage import release
+
+# --------------------
+# Silme
+# --------------------
+# Restoranlar ve menü ürünleri ORM cascade'iyle değil, birkaç küme tabanlı DELETE/UPDATE
+# ifadesiyle silinir; alt satırlar session'a yüklenmez, maliyet satır sayısından çok
+# ifade sayısına bağlıdır. Bir siparişte geçen ürün silinmez, deleted_at ile işaretlenir
+# ve resmi bırakılır: sipariş kalemleri ve satış özetleri ürüne bağlı kalır. Aynı şekilde
+# siparişi olan restoran da deleted_at ile işaretlenir; siparişler, olayları ve özetleri
+# saklanır, henüz teslim edilmemiş siparişler aynı ifade grubunda iptal edilir.
+#
+# Fonksiyonlar commit etmez; serbest kalan resim yollarını döndürür, bunlar commit'ten
+# sonra storage.release() ile bırakılır.
+
+
+def _ordered():
+    return exists().where(OrderItem.menu_id == Menu.id)
+
+
+def _bulk(stmt):
+    return db.session.execute(stmt.execution_options(synchronize_session=False)).rowcount
+
+
+# `where` ile seçilen menü ürünlerini siler. Dönen değer: (silinen, işaretlenen, resimler)
+def delete_menus(where):
+    images = db.session.scalars(
+        select(Menu.image_path).where(where, Menu.image_path.isnot(None))
+    ).all()
+    _bulk(delete(CartItem).where(CartItem.menu_id.in_(select(Menu.id).where(where))))
+    hidden = _bulk(
+        update(Menu)
+        .where(where, Menu.deleted_at.is_(None), _ordered())
+        .values(deleted_at=datetime.utcnow(), image_path=None)
+    )
+    deleted = _bulk(delete(Menu).where(where, ~_ordered()))
+    return deleted, hidden, images
+
+
+def _has_orders():
+    return exists().where(Order.restaurant_id == Restaurant.id)
+
+
+def delete_restaurants(restaurant_ids):
+    restaurant_ids = list(restaurant_ids)
+    if not restaurant_ids:
+        return []
+    cancel_orders(Order.restaurant_id.in_(restaurant_ids), Order.status.in_(OPEN_STATUSES))
+    _deleted, _hidden, images = delete_menus(Menu.restaurant_id.in_(restaurant_ids))
+    images += db.session.scalars(
+        select(Restaurant.image_path)
+        .where(Restaurant.id.in_(restaurant_ids), Restaurant.image_path.isnot(None))
+    ).all()
+    _bulk(delete(Comment).where(Comment.restaurant_id.in_(restaurant_ids)))
+    _bulk(delete(CartItem).where(CartItem.restaurant_id.in_(restaurant_ids)))
+    _bulk(
+        update(Restaurant)
+        .where(Restaurant.id.in_(restaurant_ids), Restaurant.deleted_at.is_(None), _has_orders())
+        .values(deleted_at=datetime.utcnow(), image_path=None)
+    )
+    _bulk(delete(Restaurant).where(Restaurant.id.in_(restaurant_ids), ~_has_orders()))
+    return images
+
+
+# Eskiden ORM silmesiyle geride kalmış kayıtları temizler: restoranı olmayan yorumlar,
+# menü ürünleri ve sepet kalemleri, silinmiş/işaretli ürünleri gösteren sepet kalemleri.
+def cleanup_orphans():
+    restaurant_exists = exists().where(Restaurant.id == Menu.restaurant_id)
+    menus_deleted, menus_hidden, images = delete_menus(~restaurant_exists)
+    comments = _bulk(
+        delete(Comment).where(~exists().where(Restaurant.id == Comment.restaurant_id))
+    )
+    cart_items = _bulk(
+        delete(CartItem).where(
+            ~exists().where(Menu.id == CartItem.menu_id, Menu.deleted_at.is_(None))
+        )
+    )
+    report = {
+        'menus_deleted': menus_deleted,
+        'menus_hidden': menus_hidden,
+        'comments': comments,
+        'cart_items': cart_items,
+    }
+    return report, images
+
+
+def init_deletion(app):
+    @app.cli.command('cleanup-orphans')
+    def cleanup_orphans_command():
+        """Restoranı silinmiş yorum, menü ve sepet kayıtlarını temizler."""
+        report, images = cleanup_orphans()
+        db.session.commit()
+        release(*images)
+        print(f"{report['menus_deleted']} menü ürünü silindi, {report['menus_hidden']} ürün "
+              f"sipariş geçmişi için işaretlendi, {report['comments']} yorum ve "
+              f"{report['cart_items']} sepet kalemi silindi.")
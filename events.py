@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import defaultdict
+from flask import Response, current_app, stream_with_context
+from models import db
+
+# --------------------
+# Canlı Olay Akışı (SSE)
+# --------------------
+# Olayların kaynağı veritabanıdır (ör. OrderEvent); broker yalnızca "bu kanalda yeni bir
+# şey var" sinyalini bekleyen akışlara iletir. Akış uyanınca son gönderdiği id'den sonraki
+# olayları okur, yoksa heartbeat süresi kadar bekler ve bir yorum satırı (ping) gönderir.
+# Her uyanışta veritabanına bakıldığından başka bir süreçte yazılan olaylar da en geç bir
+# heartbeat sonra gelir; tarayıcı kopup tekrar bağlandığında Last-Event-ID ile kaldığı
+# yerden devam eder.
+#
+# Bekleyen bir akış veritabanı bağlantısı tutmaz (her okumadan sonra session kapatılır).
+# Thread tabanlı sunucuda her açık akış bir thread'dir; çok sayıda boşta bağlantı için
+# uygulama gevent işçileriyle çalıştırılır (gunicorn -k gevent), bu durumda her akış bir
+# greenlet olur ve threading.Condition beklemesi işbirlikçi hale gelir (gunicorn.conf.py
+# varsayılanı). Akışlar STREAM_MAX_AGE sonunda kapanır, tarayıcı otomatik olarak yeniden
+# bağlanır.
+#
+# Bir işçide aynı anda en fazla STREAM_MAX_CONNECTIONS akış açık olabilir; böylece thread
+# tabanlı işçide açık sekmeler tüm thread'leri tutup normal istekleri bekletemez. Sınır
+# doluysa istek 503, Retry-After ve STREAM_BUSY_RETRY saniyelik bir `retry:` ile döner.
+STREAM_RETRY_MS = 3000
+
+
+class EventBroker:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._versions = defaultdict(int)
+        self._streams = 0
+
+    def version(self, channel):
+        with self._cond:
+            return self._versions[channel]
+
+    def publish(self, channel):
+        with self._cond:
+            self._versions[channel] += 1
+            self._cond.notify_all()
+
+    # Açık akış sayısı sınırın altındaysa yer ayırır (limit 0/None: sınırsız)
+    def open_stream(self, limit):
+        with self._cond:
+            if limit and self._streams >= limit:
+                return False
+            self._streams += 1
+            return True
+
+    def close_stream(self):
+        with self._cond:
+            self._streams -= 1
+
+    # Kanal sürümü değişene ya da süre dolana kadar bekler; güncel sürümü döner
+    def wait(self, channel, version, timeout):
+        with self._cond:
+            self._cond.wait_for(lambda: self._versions[channel] != version, timeout)
+            return self._versions[channel]
+
+
+def init_events(app):
+    app.config.setdefault('STREAM_HEARTBEAT', 15)  # saniye
+    app.config.setdefault('STREAM_MAX_AGE', 300)  # saniye
+    app.config.setdefault('STREAM_MAX_CONNECTIONS', 100)  # işçi başına, 0: sınırsız
+    app.config.setdefault('STREAM_BUSY_RETRY', 10)  # saniye
+    app.extensions['event_broker'] = EventBroker()
+
+
+# Broker kurulmamış uygulamalarda (ör. benchmark'lar) sessizce atlanır
+def publish(channel):
+    broker = current_app.extensions.get('event_broker')
+    if broker is not None:
+        broker.publish(channel)
+
+
+def format_sse(data, event=None, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event:
+        lines.append(f'event: {event}')
+    lines += [f'data: {line}' for line in data.splitlines() or ['']]
+    return '\n'.join(lines) + '\n\n'
+
+
+# Akış yanıtı: işçideki akış sınırı doluysa 503 döner, aksi halde ayrılan yer yanıt
+# kapanınca (istemci koptuğunda ya da akış bittiğinde) geri verilir.
+def event_stream_response(channel, last_id, fetch):
+    config = current_app.config
+    broker = current_app.extensions['event_broker']
+    if not broker.open_stream(config['STREAM_MAX_CONNECTIONS']):
+        retry = config['STREAM_BUSY_RETRY']
+        return Response(f'retry: {retry * 1000}\n\n', status=503, mimetype='text/event-stream',
+                        headers={'Retry-After': str(retry), 'Cache-Control': 'no-cache'})
+    try:
+        response = Response(stream_with_context(stream_events(channel, last_id, fetch)),
+                            mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    except BaseException:
+        broker.close_stream()
+        raise
+    response.call_on_close(broker.close_stream)
+    return response
+
+
+# stream_with_context ile sarılarak döndürülür. `fetch(last_id)` son id'den sonraki
+# olayları [(id, olay_adı, veri), ...] olarak id sırasıyla döndürür.
+def stream_events(channel, last_id, fetch):
+    config = current_app.config
+    broker = current_app.extensions['event_broker']
+    deadline = time.monotonic() + config['STREAM_MAX_AGE']
+    yield f'retry: {STREAM_RETRY_MS}\n\n'
+    while time.monotonic() < deadline:
+        # Sürüm okumadan önce alınır ki okuma sırasında gelen yayın kaçmasın
+        version = broker.version(channel)
+        try:
+            events = fetch(last_id)
+        finally:
+            db.session.close()
+        for event_id, event, data in events:
+            last_id = event_id
+            yield format_sse(data, event=event, event_id=event_id)
+        if events:
+            continue
+        if broker.wait(channel, version, config['STREAM_HEARTBEAT']) == version:
+            yield ': ping\n\n'
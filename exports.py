@@ -0,0 +1,165 @@
+import csv
+import json
+from datetime import datetime, timedelta
+from itertools import groupby
+from flask import Response, stream_with_context, url_for
+from sqlalchemy import select
+from models import db, Order, OrderItem, Menu
+
+# --------------------
+# Dışa Aktarma (NDJSON / CSV)
+# --------------------
+# Satırlar sunucu tarafı cursor'dan (yield_per) parça parça okunur ve üretici bir
+# yanıtla akıtılır; bellek kullanımı dışa aktarılan satır sayısından bağımsızdır.
+# Tek istek en fazla EXPORT_MAX_ROWS kayıt döndürür. Devamı varsa yanıt başlığında
+# X-Next-After-Id ve Link: rel="next" bulunur; istemci after_id ile kaldığı yerden
+# devam eder. Sayfa sınırı, akış başlamadan indeks üzerinde tek bir sorguyla bulunur.
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+EXPORT_MAX_ROWS = 10000
+FETCH_BATCH = 1000  # yield_per
+CHUNK_LINES = 500  # tek yield'de gönderilen satır
+
+ORDER_CSV_FIELDS = ['order_id', 'created_at', 'status', 'customer_id', 'total_price',
+                    'item_id', 'menu_id', 'menu_name', 'quantity', 'price']
+MENU_CSV_FIELDS = ['id', 'name', 'description', 'price', 'image_path']
+
+
+class _Echo:
+    # csv.writer'ın yazdığı satırı geri döndürür
+    def write(self, value):
+        return value
+
+
+def _chunked(lines):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= CHUNK_LINES:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def encode_ndjson(records):
+    return _chunked(json.dumps(r, ensure_ascii=False) + '\n' for r in records)
+
+
+def encode_csv(fieldnames, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fieldnames)
+    yield from _chunked(writer.writerow([row[f] for f in fieldnames]) for row in rows)
+
+
+def _order_filters(restaurant_id, after_id, start, end):
+    filters = [Order.restaurant_id == restaurant_id, Order.id > after_id]
+    # Tarih aralığı gün bazında ve iki uç dahildir
+    if start:
+        filters.append(Order.created_at >= datetime.combine(start, datetime.min.time()))
+    if end:
+        filters.append(Order.created_at < datetime.combine(end + timedelta(days=1), datetime.min.time()))
+    return filters
+
+
+# Sayfa doluysa son kaydın id'si devam noktasıdır (devam sayfası boş olabilir),
+# değilse None
+def _next_after_id(column, filters, limit):
+    return db.session.execute(
+        select(column).where(*filters).order_by(column).offset(limit - 1).limit(1)
+    ).scalar()
+
+
+def _stream(stmt):
+    return db.session.execute(stmt.execution_options(yield_per=FETCH_BATCH))
+
+
+# Sipariş başına bir kayıt (kalemler içinde); sıralı satırlar siparişe göre gruplanır
+def _order_records(rows):
+    for order_id, group in groupby(rows, key=lambda row: row.order_id):
+        group = list(group)
+        first = group[0]
+        yield {
+            'order_id': order_id,
+            'created_at': first.created_at.isoformat() if first.created_at else None,
+            'status': first.status,
+            'customer_id': first.customer_id,
+            'total_price': first.total_price,
+            'items': [
+                {'item_id': r.item_id, 'menu_id': r.menu_id, 'menu_name': r.menu_name,
+                 'quantity': r.quantity, 'price': r.price}
+                for r in group
+            ],
+        }
+
+
+def _order_csv_rows(rows):
+    for row in rows:
+        row = row._asdict()
+        row['created_at'] = row['created_at'].isoformat() if row['created_at'] else None
+        yield row
+
+
+def stream_order_export(restaurant_id, fmt, after_id=0, start=None, end=None):
+    filters = _order_filters(restaurant_id, after_id, start, end)
+    next_after_id = _next_after_id(Order.id, filters, EXPORT_MAX_ROWS)
+    if next_after_id is not None:
+        filters.append(Order.id <= next_after_id)
+    stmt = (
+        select(
+            Order.id.label('order_id'), Order.created_at, Order.status, Order.customer_id,
+            Order.total_price, OrderItem.id.label('item_id'), OrderItem.menu_id,
+            Menu.name.label('menu_name'), OrderItem.quantity, OrderItem.price,
+        )
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .outerjoin(Menu, Menu.id == OrderItem.menu_id)
+        .where(*filters)
+        .order_by(Order.id, OrderItem.id)
+    )
+
+    def generate():
+        rows = _stream(stmt)
+        if fmt == 'csv':
+            yield from encode_csv(ORDER_CSV_FIELDS, _order_csv_rows(rows))
+        else:
+            yield from encode_ndjson(_order_records(rows))
+
+    return _export_response(generate(), fmt, f'restaurant-{restaurant_id}-orders',
+                            next_after_id, 'main.export_orders', restaurant_id, start, end)
+
+
+def stream_menu_export(restaurant_id, fmt, after_id=0):
+    filters = [Menu.restaurant_id == restaurant_id, Menu.deleted_at.is_(None), Menu.id > after_id]
+    next_after_id = _next_after_id(Menu.id, filters, EXPORT_MAX_ROWS)
+    if next_after_id is not None:
+        filters.append(Menu.id <= next_after_id)
+    stmt = (
+        select(Menu.id, Menu.name, Menu.description, Menu.price, Menu.image_path)
+        .where(*filters)
+        .order_by(Menu.id)
+    )
+
+    def generate():
+        rows = (row._asdict() for row in _stream(stmt))
+        if fmt == 'csv':
+            yield from encode_csv(MENU_CSV_FIELDS, rows)
+        else:
+            yield from encode_ndjson(rows)
+
+    return _export_response(generate(), fmt, f'restaurant-{restaurant_id}-menus',
+                            next_after_id, 'main.export_menus', restaurant_id)
+
+
+def _export_response(chunks, fmt, basename, next_after_id, endpoint, restaurant_id,
+                     start=None, end=None):
+    response = Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={basename}.{fmt}'
+    if next_after_id is not None:
+        next_url = url_for(endpoint, id=restaurant_id, format=fmt, after_id=next_after_id,
+                           start=start.isoformat() if start else None,
+                           end=end.isoformat() if end else None)
+        response.headers['X-Next-After-Id'] = str(next_after_id)
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return response
@@ -0,0 +1,169 @@
+import math
+from sqlalchemy import and_, event, func, or_, select, update
+from models import db, Restaurant
+
+# --------------------
+# Yakındaki Restoranlar
+# --------------------
+# Restoran koordinatları geohash olarak da saklanır (indeksli kolon). Yakın arama,
+# yarıçapı kapsayan en küçük geohash hücresini ve 8 komşusunu bulur; aday satırlar
+# bu hücrelerin önekleriyle indeks üzerinde aralık sorgusuyla (geohash >= p AND
+# geohash < p + '~') ve enlem/boylam kutusuyla daraltılır. Mesafe SQLite'a kaydedilen
+# geo_distance_km() fonksiyonuyla yalnızca bu adaylar için SQL içinde hesaplanır,
+# sıralama ve sayfalama (mesafe, id) imleciyle yine SQL'de yapılır.
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9  # ~5m
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+MAX_RADIUS_KM = 50
+NEARBY_LIMIT = 24
+
+
+def geohash_encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def _cell_size_deg(precision: int):
+    # (enlem, boylam) derece cinsinden hücre boyutu; boylam bitleri önce gelir
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def covering_cells(lat: float, lng: float, radius_km: float):
+    # Hücre kenarı yarıçaptan küçük olmayan en hassas seviye seçilir; merkez hücre ve
+    # 8 komşusu yarıçap çemberini tamamen kapsar.
+    cos_lat = max(math.cos(math.radians(lat)), 0.01)
+    precision = 1
+    for p in range(GEOHASH_PRECISION, 0, -1):
+        dlat, dlng = _cell_size_deg(p)
+        if dlat * KM_PER_DEGREE >= radius_km and dlng * KM_PER_DEGREE * cos_lat >= radius_km:
+            precision = p
+            break
+    dlat, dlng = _cell_size_deg(precision)
+    cells = set()
+    for i in (-1, 0, 1):
+        for j in (-1, 0, 1):
+            cell_lat = min(max(lat + i * dlat, -89.999999), 89.999999)
+            cell_lng = (lng + j * dlng + 180.0) % 360.0 - 180.0
+            cells.add(geohash_encode(cell_lat, cell_lng, precision))
+    return sorted(cells)
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    if None in (lat1, lng1, lat2, lng2):
+        return None
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def parse_coordinates(lat, lng):
+    # Formdan/sorgudan gelen koordinatlar; ikisi de boşsa (None, None)
+    if (lat in (None, '')) and (lng in (None, '')):
+        return None, None
+    lat, lng = float(str(lat).replace(',', '.')), float(str(lng).replace(',', '.'))
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError('Koordinat aralık dışında.')
+    return lat, lng
+
+
+# Restoranlar `(mesafe, id)` sırasıyla; imleç bir önceki sayfanın son elemanıdır.
+# [(restoran, mesafe_km), ...] ve sonraki sayfa imleci (yoksa None) döner.
+def nearby_restaurants(lat, lng, radius_km, limit=NEARBY_LIMIT, after=None):
+    radius_km = min(radius_km, MAX_RADIUS_KM)
+    distance = func.geo_distance_km(lat, lng, Restaurant.latitude, Restaurant.longitude)
+    dlat = radius_km / KM_PER_DEGREE
+    dlng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    cell_filter = or_(*(
+        and_(Restaurant.geohash >= cell, Restaurant.geohash < cell + '~')
+        for cell in covering_cells(lat, lng, radius_km)
+    ))
+    stmt = (
+        select(Restaurant, distance.label('distance'))
+        .where(
+            cell_filter,
+            Restaurant.deleted_at.is_(None),
+            Restaurant.latitude.between(lat - dlat, lat + dlat),
+            distance <= radius_km,
+        )
+        .order_by(distance, Restaurant.id)
+        .limit(limit + 1)
+    )
+    low, high = lng - dlng, lng + dlng
+    # Tarih değiştirme çizgisini aşan kutuda boylam filtresi atlanır; hücreler yine daraltır
+    if low >= -180 and high <= 180:
+        stmt = stmt.where(Restaurant.longitude.between(low, high))
+    if after is not None:
+        after_distance, after_id = after
+        stmt = stmt.where(or_(
+            distance > after_distance,
+            and_(distance == after_distance, Restaurant.id > after_id),
+        ))
+    rows = db.session.execute(stmt).all()
+    next_after = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_restaurant, last_distance = rows[-1]
+        next_after = (last_distance, last_restaurant.id)
+    return [(r, d) for r, d in rows], next_after
+
+
+def _set_geohash(_mapper, _connection, restaurant):
+    if restaurant.latitude is None or restaurant.longitude is None:
+        restaurant.geohash = None
+    else:
+        restaurant.geohash = geohash_encode(restaurant.latitude, restaurant.longitude)
+
+
+def _register_sql_functions(dbapi_connection, _connection_record):
+    dbapi_connection.create_function('geo_distance_km', 4, distance_km, deterministic=True)
+
+
+def rebuild_geohashes():
+    rows = db.session.execute(
+        select(Restaurant.id, Restaurant.latitude, Restaurant.longitude)
+    ).all()
+    if not rows:
+        return 0
+    db.session.execute(update(Restaurant), [
+        {'id': rid, 'geohash': geohash_encode(lat, lng) if lat is not None and lng is not None else None}
+        for rid, lat, lng in rows
+    ])
+    return len(rows)
+
+
+def init_geo(app):
+    if not event.contains(Restaurant, 'before_insert', _set_geohash):
+        event.listen(Restaurant, 'before_insert', _set_geohash)
+        event.listen(Restaurant, 'before_update', _set_geohash)
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', _register_sql_functions)
+
+    @app.cli.command('rebuild-geohash')
+    def rebuild_geohash_command():
+        """Restoran geohash kolonunu koordinatlardan yeniden hesaplar."""
+        count = rebuild_geohashes()
+        db.session.commit()
+        print(f'{count} restoranın geohash değeri güncellendi.')
@@ -0,0 +1,45 @@
+import multiprocessing
+import os
+
+# --------------------
+# Gunicorn Ayarları
+# --------------------
+# Uygulama ana süreçte bir kez yüklenir (preload_app) ve işçiler fork ile kopyalanır;
+# böylece işçi açılışı import + create_app() değil yalnızca fork süresidir ve kod
+# sayfaları işçiler arasında paylaşılır. create_app() veritabanına bağlanmadığından
+# fork öncesinde açılmış, işçiler arasında paylaşılan bir bağlantı olmaz. Arka plan
+# thread'leri (iş kuyruğu, resim ve şifre havuzları) her işçide ilk kullanımda başlar.
+#
+# Varsayılan işçi sınıfı gevent'tir: canlı sipariş akışları (SSE) uzun süre açık kalır ve
+# her biri bir greenlet olarak tutulur, işçi başına WEB_CONNECTIONS (varsayılan 1000)
+# eşzamanlı bağlantı. Yama, uygulama preload ile yüklenmeden önce burada yapılır ki
+# kilitler ve Condition'lar gevent uyumlu olsun; şifre hash'leme ve resim varyantları
+# gerçek thread'lerde çalışmaya devam eder (pools.py). SQLite sorguları kısa olduğundan
+# greenlet'ler arasında kısa süre bloklar.
+#
+# WEB_WORKER_CLASS=gthread ile işçi başına WEB_THREADS (varsayılan 4) thread kullanılır;
+# bu durumda her açık akış bir thread tuttuğundan işçi başına akış sayısı thread'lerin
+# yarısıyla sınırlanır (STREAM_MAX_CONNECTIONS, events.py), kalanlar normal isteklere
+# açık kalır.
+#
+# İşçi sayısı WEB_CONCURRENCY (varsayılan: CPU sayısı, en az 2). SQLite tek yazıcılıdır;
+# işçi sayısını CPU'nun çok üstüne çıkarmak yazma kilidi beklemesini artırır.
+worker_class = os.environ.get('WEB_WORKER_CLASS', 'gevent')
+if worker_class == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+bind = os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', '8080')}")
+workers = int(os.environ.get('WEB_CONCURRENCY', max(2, multiprocessing.cpu_count())))
+threads = int(os.environ.get('WEB_THREADS', 4))
+worker_connections = int(os.environ.get('WEB_CONNECTIONS', 1000))
+if worker_class == 'gthread':
+    os.environ.setdefault('FLASK_STREAM_MAX_CONNECTIONS', str(max(1, threads // 2)))
+preload_app = True
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+# Uzun süre çalışan işçilerde bellek birikmesine karşı periyodik yenileme
+max_requests = 2000
+max_requests_jitter = 200
+accesslog = '-'
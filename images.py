@@ -0,0 +1,98 @@
+import os
+from flask import current_app, url_for
+from PIL import Image, ImageOps
+from pools import thread_pool
+
+# --------------------
+# Resim Varyantları
+# --------------------
+# Yüklenen her resim için küçültülmüş WebP varyantları üretilir:
+#   uploads/menu.jpg -> uploads/menu.thumb.webp, uploads/menu.card.webp, uploads/menu.full.webp
+# Üretim arka plandaki bir thread havuzunda yapılır, istek beklemez. Varyant henüz
+# hazır değilse şablonlar orijinal dosyaya düşer.
+VARIANTS = {
+    'thumb': 160,
+    'card': 480,
+    'full': 1280,
+}
+WEBP_QUALITY = 80
+
+_executor = None
+
+
+def init_images(app):
+    global _executor
+    _executor = thread_pool(app.config.get('IMAGE_WORKERS', 2), thread_name_prefix='image-variants')
+    app.jinja_env.globals.update(image_url=image_url, image_srcset=image_srcset)
+
+    @app.cli.command('generate-image-variants')
+    def generate_variants_command():
+        """Mevcut tüm restoran ve menü resimleri için eksik varyantları üretir."""
+        from models import Restaurant, Menu
+        paths = {p for (p,) in Restaurant.query.with_entities(Restaurant.image_path) if p}
+        paths |= {p for (p,) in Menu.query.with_entities(Menu.image_path) if p}
+        for image_path in sorted(paths):
+            generate_variants(_static_path(image_path))
+        print(f'{len(paths)} resim işlendi.')
+
+
+def _static_path(image_path: str) -> str:
+    return os.path.join(current_app.static_folder, image_path)
+
+
+def variant_path(image_path: str, variant: str) -> str:
+    stem, _ext = os.path.splitext(image_path)
+    return f'{stem}.{variant}.webp'
+
+
+def schedule_variants(image_path: str):
+    source = _static_path(image_path)
+    if current_app.config.get('IMAGE_VARIANTS_SYNC') or _executor is None:
+        generate_variants(source)
+    else:
+        _executor.submit(_generate_logged, current_app._get_current_object(), source)
+
+
+def _generate_logged(app, source):
+    try:
+        generate_variants(source)
+    except Exception:
+        app.logger.exception('Resim varyantları üretilemedi: %s', source)
+
+
+def generate_variants(source: str):
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        has_alpha = 'A' in img.getbands() or 'transparency' in img.info
+        img = img.convert('RGBA' if has_alpha else 'RGB')
+        for variant, width in VARIANTS.items():
+            target = variant_path(source, variant)
+            resized = img.copy()
+            if resized.width > width:
+                resized.thumbnail((width, width * 4), Image.LANCZOS)
+            tmp = target + '.tmp'
+            resized.save(tmp, 'WEBP', quality=WEBP_QUALITY, method=4)
+            # Yarım yazılmış dosya servis edilmesin diye atomik olarak yerine konur
+            os.replace(tmp, target)
+
+
+def _existing_variants(image_path: str):
+    return [
+        (variant, width) for variant, width in VARIANTS.items()
+        if os.path.isfile(_static_path(variant_path(image_path, variant)))
+    ]
+
+
+# Şablonlar için: istenen boyuttaki varyant hazırsa onun, değilse orijinalin URL'i
+def image_url(image_path: str, variant: str = 'card') -> str:
+    if os.path.isfile(_static_path(variant_path(image_path, variant))):
+        return url_for('static', filename=variant_path(image_path, variant))
+    return url_for('static', filename=image_path)
+
+
+# Tarayıcının ekrana yetecek en küçük varyantı seçebilmesi için srcset değeri
+def image_srcset(image_path: str) -> str:
+    return ', '.join(
+        f"{url_for('static', filename=variant_path(image_path, variant))} {width}w"
+        for variant, width in _existing_variants(image_path)
+    )
@@ -0,0 +1,112 @@
+import heapq
+import itertools
+import threading
+import time
+from flask import current_app
+
+# --------------------
+# Arka Plan İşleri
+# --------------------
+# Süreç içi, zamanlanabilir bir iş kuyruğu. İşler @task ile isimlendirilerek kaydedilir,
+# enqueue('isim', *args, delay=saniye) ile sıraya konur ve JOB_WORKERS kadar arka plan
+# thread'inde uygulama bağlamı içinde çalıştırılır. every() ile kaydedilen işler
+# kendiliğinden tekrarlanır.
+# İşçiler ilk istekte başlar; import ve CLI komutları thread başlatmaz. Kuyruk bellekte
+# tutulur, süreç yeniden başlarsa bekleyen işler kaybolur; bu yüzden işler veritabanındaki
+# duruma bakarak tekrar çalıştırılabilir (idempotent) yazılır.
+# JOBS_SYNC açıksa (testler) gecikmesiz işler enqueue anında çalışır, zamanlanmışlar atlanır.
+TASKS = {}
+
+
+def task(name):
+    def register(fn):
+        TASKS[name] = fn
+        return fn
+    return register
+
+
+class JobQueue:
+    def __init__(self, app, workers=1):
+        self.app = app
+        self.workers = workers
+        self._heap = []  # (çalışma zamanı, sıra, isim, argümanlar)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._periodic = []  # (isim, aralık)
+        self._threads = []
+
+    def enqueue(self, name, *args, delay=0):
+        if name not in TASKS:
+            raise KeyError(f'Bilinmeyen iş: {name}')
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), name, args))
+            self._cond.notify()
+
+    def every(self, name, interval):
+        self._periodic.append((name, interval))
+
+    def pending(self):
+        with self._cond:
+            return len(self._heap)
+
+    def start(self):
+        with self._cond:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'jobs-{i}', daemon=True)
+                self._threads.append(thread)
+        for name, interval in self._periodic:
+            self.enqueue(name, delay=interval)
+        for thread in self._threads:
+            thread.start()
+
+    def _next_job(self):
+        with self._cond:
+            while True:
+                if self._heap:
+                    wait = self._heap[0][0] - time.monotonic()
+                    if wait <= 0:
+                        return heapq.heappop(self._heap)
+                    self._cond.wait(wait)
+                else:
+                    self._cond.wait()
+
+    def _work(self):
+        while True:
+            _due, _seq, name, args = self._next_job()
+            self.run(name, *args)
+            for periodic_name, interval in self._periodic:
+                if periodic_name == name:
+                    self.enqueue(name, delay=interval)
+
+    def run(self, name, *args):
+        with self.app.app_context():
+            try:
+                TASKS[name](*args)
+            except Exception:
+                self.app.logger.exception('Arka plan işi başarısız: %s%r', name, args)
+
+
+def init_jobs(app):
+    app.config.setdefault('JOB_WORKERS', 1)
+    app.config.setdefault('JOBS_SYNC', False)
+    queue = JobQueue(app, workers=app.config['JOB_WORKERS'])
+    app.extensions['jobs'] = queue
+
+    @app.before_request
+    def _start_job_workers():
+        if not app.config['JOBS_SYNC']:
+            queue.start()
+
+
+def get_job_queue():
+    return current_app.extensions['jobs']
+
+
+def enqueue(name, *args, delay=0):
+    if current_app.config.get('JOBS_SYNC'):
+        if not delay:
+            get_job_queue().run(name, *args)
+        return
+    get_job_queue().enqueue(name, *args, delay=delay)
@@ -0,0 +1,234 @@
+import csv
+import io
+import json
+import math
+import os
+import zipfile
+import click
+from sqlalchemy import insert, update
+from flask import current_app
+from werkzeug.datastructures import FileStorage
+from models import db, Menu, Restaurant
+from storage import allowed_file, save_upload, release
+from cache import invalidate
+
+# --------------------
+# Toplu Menü Aktarımı
+# --------------------
+# CSV (başlık satırı: name,description,price[,image][,id]) ya da JSON (nesne listesi veya
+# {"items": [...]}) biçimindeki bir menü, isteğe bağlı bir resim zip'iyle birlikte içe
+# aktarılır. Satırlar formdaki kurallarla doğrulanır; mevcut ürünler id'ye, yoksa aynı
+# restorandaki ada göre bulunup güncellenir, diğerleri eklenir. Yazma IMPORT_BATCH_SIZE
+# satırlık partilerde toplu INSERT/UPDATE ile yapılır ve her parti ayrı commit edilir;
+# hatalı satırlar atlanır ve satır numarasıyla raporlanır.
+# Resim zip'i açılmadan önce üye sayısı (MENU_IMPORT_MAX_ZIP_MEMBERS) ve toplam açılmış
+# boyutu (MENU_IMPORT_MAX_ZIP_SIZE) kontrol edilir; tek bir resim max_image_size'ı aşamaz.
+# Web formu zip'i istek gövdesinde taşır; bu route'un gövde sınırı genel MAX_CONTENT_LENGTH
+# yerine MAX_CONTENT_LENGTH_BY_ENDPOINT'ten gelir (app.py). Daha büyük arşivler için
+# `flask import-menu` komutu kullanılır.
+IMPORT_BATCH_SIZE = 500
+MAX_NAME_LENGTH = 120
+
+
+class MenuImportError(ValueError):
+    pass
+
+
+# Formdaki fiyat alanıyla aynı kural: ondalık ayırıcı virgül ya da nokta olabilir
+def parse_price(value) -> float:
+    price = float(str(value).strip().replace(',', '.'))
+    if not math.isfinite(price) or price < 0:
+        raise ValueError(value)
+    return price
+
+
+def read_menu_file(data: bytes, filename: str):
+    # (satır numarası, kayıt) çiftleri döndürür
+    ext = os.path.splitext(filename.lower())[1]
+    try:
+        text = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise MenuImportError('Dosya UTF-8 kodlamalı olmalı.')
+    if ext == '.json':
+        try:
+            payload = json.loads(text)
+        except ValueError as e:
+            raise MenuImportError(f'Geçersiz JSON: {e}')
+        records = payload.get('items') if isinstance(payload, dict) else payload
+        if not isinstance(records, list):
+            raise MenuImportError('JSON bir ürün listesi olmalı.')
+        return list(enumerate(records, start=1))
+    if ext == '.csv':
+        reader = csv.DictReader(io.StringIO(text))
+        if not reader.fieldnames or not {'name', 'price'} <= set(reader.fieldnames):
+            raise MenuImportError('CSV başlığında en az name ve price kolonları olmalı.')
+        # Başlık 1. satırdır
+        return list(enumerate(reader, start=2))
+    raise MenuImportError('Desteklenen biçimler: .csv, .json')
+
+
+def _validate(record):
+    if not isinstance(record, dict):
+        raise ValueError('Kayıt bir nesne olmalı.')
+    name = str(record.get('name') or '').strip()
+    if not name:
+        raise ValueError('Ürün adı zorunlu.')
+    if len(name) > MAX_NAME_LENGTH:
+        raise ValueError(f'Ürün adı en fazla {MAX_NAME_LENGTH} karakter olabilir.')
+    try:
+        price = parse_price(record.get('price', ''))
+    except ValueError:
+        raise ValueError('Geçersiz fiyat.')
+    menu_id = record.get('id') or None
+    if menu_id is not None:
+        try:
+            menu_id = int(menu_id)
+        except (TypeError, ValueError):
+            raise ValueError('Geçersiz id.')
+    return {
+        'id': menu_id,
+        'name': name,
+        'description': str(record.get('description') or '').strip(),
+        'price': price,
+        'image': str(record.get('image') or '').strip() or None,
+    }
+
+
+class _ZipImages:
+    # Zip içindeki resimleri isimle bulur, içerik adresli depoya bir kez yazar
+    def __init__(self, archive, max_size, max_members=None, max_total_size=None):
+        self.archive = archive
+        self.max_size = max_size
+        infos = archive.infolist()
+        if max_members and len(infos) > max_members:
+            raise MenuImportError(f'Resim zip\'i en fazla {max_members} dosya içerebilir.')
+        # Başlıktaki boyutlar okuma sırasında zipfile tarafından da uygulanır
+        if max_total_size and sum(info.file_size for info in infos) > max_total_size:
+            raise MenuImportError('Resim zip\'inin açılmış boyutu çok büyük.')
+        self.members = {}
+        for info in infos:
+            if not info.is_dir():
+                self.members.setdefault(info.filename, info)
+                self.members.setdefault(os.path.basename(info.filename), info)
+        self.saved = {}
+
+    def save(self, name):
+        if name in self.saved:
+            return self.saved[name]
+        info = self.members.get(name)
+        if info is None:
+            raise ValueError(f'Resim zip içinde yok: {name}')
+        if not allowed_file(info.filename):
+            raise ValueError(f'Desteklenmeyen resim uzantısı: {name}')
+        if self.max_size and info.file_size > self.max_size:
+            raise ValueError(f'Resim çok büyük: {name}')
+        with self.archive.open(info) as stream:
+            path = save_upload(FileStorage(stream=stream, filename=os.path.basename(info.filename)))
+        self.saved[name] = path
+        return path
+
+
+# Menüyü restorana aktarır. Rapor: {'created', 'updated', 'errors': [(satır, mesaj)]}
+def import_menu(restaurant_id, data, filename, images_zip=None, max_image_size=None):
+    records = read_menu_file(data, filename)
+    archive = zipfile.ZipFile(images_zip) if images_zip is not None else None
+    images = None
+    if archive:
+        try:
+            images = _ZipImages(
+                archive, max_image_size,
+                max_members=current_app.config['MENU_IMPORT_MAX_ZIP_MEMBERS'],
+                max_total_size=current_app.config['MENU_IMPORT_MAX_ZIP_SIZE'],
+            )
+        except MenuImportError:
+            archive.close()
+            raise
+    report = {'created': 0, 'updated': 0, 'errors': []}
+
+    # Restoranın mevcut ürünleri tek sorguda: ada ve id'ye göre eşleştirme için
+    existing = (
+        db.session.query(Menu.id, Menu.name, Menu.image_path)
+        .filter_by(restaurant_id=restaurant_id, deleted_at=None)
+        .all()
+    )
+    id_by_name = {name: menu_id for menu_id, name, _image in existing}
+    image_by_id = {menu_id: image for menu_id, _name, image in existing}
+
+    try:
+        for start in range(0, len(records), IMPORT_BATCH_SIZE):
+            inserts, updates, released = {}, {}, []
+            for line, record in records[start:start + IMPORT_BATCH_SIZE]:
+                try:
+                    row = _validate(record)
+                    menu_id = row.pop('id') or id_by_name.get(row['name'])
+                    if menu_id is not None and menu_id not in image_by_id:
+                        raise ValueError(f'Bu restorana ait olmayan ürün id: {menu_id}')
+                    image = row.pop('image')
+                    if image:
+                        if images is None:
+                            raise ValueError('Resim belirtilmiş ama resim zip\'i yüklenmemiş.')
+                        row['image_path'] = images.save(image)
+                except ValueError as e:
+                    report['errors'].append((line, str(e)))
+                    continue
+
+                if menu_id is not None:
+                    if 'image_path' in row and row['image_path'] != image_by_id[menu_id]:
+                        released.append(image_by_id[menu_id])
+                        image_by_id[menu_id] = row['image_path']
+                    # Aynı ürün dosyada tekrar ederse son satır geçerlidir
+                    updates.setdefault(menu_id, {'id': menu_id}).update(row)
+                else:
+                    new_row = inserts.setdefault(row['name'], {'restaurant_id': restaurant_id, 'image_path': None})
+                    new_row.update(row)
+
+            if inserts:
+                new_ids = db.session.execute(
+                    insert(Menu).returning(Menu.id, Menu.name, Menu.image_path),
+                    list(inserts.values())
+                ).all()
+                for menu_id, name, image in new_ids:
+                    id_by_name[name] = menu_id
+                    image_by_id[menu_id] = image
+            if updates:
+                db.session.execute(update(Menu), list(updates.values()))
+            db.session.commit()
+            report['created'] += len(inserts)
+            report['updated'] += len(updates)
+            release(*released)
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        if archive:
+            archive.close()
+        # Sonraki bir parti hata verse bile commit edilmiş partiler sayfada görünmeli
+        if report['created'] or report['updated']:
+            invalidate(f'restaurant:{restaurant_id}')
+    return report
+
+
+def init_menus(app):
+    app.config.setdefault('MENU_IMPORT_MAX_ZIP_MEMBERS', 1000)
+    app.config.setdefault('MENU_IMPORT_MAX_ZIP_SIZE', 200 * 1024 * 1024)  # açılmış toplam
+
+    @app.cli.command('import-menu')
+    @click.argument('restaurant_id', type=int)
+    @click.argument('menu_file', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--images', type=click.Path(exists=True, dir_okay=False),
+                  help='Menüdeki image kolonunun işaret ettiği resimleri içeren zip.')
+    def import_menu_command(restaurant_id, menu_file, images):
+        """Bir restoranın menüsünü CSV/JSON dosyasından toplu olarak aktarır."""
+        if db.session.get(Restaurant, restaurant_id) is None:
+            raise click.ClickException(f'Restoran bulunamadı: {restaurant_id}')
+        with open(menu_file, 'rb') as f:
+            data = f.read()
+        try:
+            report = import_menu(restaurant_id, data, menu_file, images_zip=images,
+                                 max_image_size=current_app.config['MAX_CONTENT_LENGTH'])
+        except (MenuImportError, zipfile.BadZipFile) as e:
+            raise click.ClickException(str(e))
+        for line, message in report['errors']:
+            print(f'satır {line}: {message}')
+        print(f"{report['created']} ürün eklendi, {report['updated']} ürün güncellendi, "
+              f"{len(report['errors'])} satır atlandı.")
@@ -0,0 +1,182 @@
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from flask import Response, g, has_request_context, request, template_rendered, before_render_template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# --------------------
+# İstek Ölçümleri
+# --------------------
+# METRICS_ENABLED açıkken her istekte SQL, şablon render'ı, view toplam süresi ve
+# timed() ile işaretlenen bloklar (şifre doğrulama, dosya kaydı) ölçülür. Sonuç:
+#   - yanıtta Server-Timing başlığı (tarayıcı geliştirici araçlarında görünür)
+#   - "thechef.requests" logger'ına istek başına tek satır JSON
+#   - /metrics altında Prometheus metin formatında route bazlı histogram ve sayaçlar
+# Kapalıyken hiçbir hook kaydedilmez; timed() yalnızca bir sözlük kontrolü yapar.
+# Sayaçlar süreç içidir; çok süreçli kurulumda her işçi kendi değerlerini raporlar.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+request_logger = logging.getLogger('thechef.requests')
+
+
+class MetricsRegistry:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.requests = defaultdict(int)            # (endpoint, status) -> adet
+        self.bucket_counts = defaultdict(lambda: [0] * (len(buckets) + 1))
+        self.duration_sum = defaultdict(float)      # endpoint -> saniye
+        self.db_queries = defaultdict(int)          # endpoint -> adet
+        self.db_seconds = defaultdict(float)        # endpoint -> saniye
+        self.template_seconds = defaultdict(float)  # endpoint -> saniye
+
+    def observe(self, endpoint, status, duration, db_queries, db_seconds, template_seconds):
+        with self._lock:
+            self.requests[(endpoint, status)] += 1
+            self.bucket_counts[endpoint][bisect_left(self.buckets, duration)] += 1
+            self.duration_sum[endpoint] += duration
+            self.db_queries[endpoint] += db_queries
+            self.db_seconds[endpoint] += db_seconds
+            self.template_seconds[endpoint] += template_seconds
+
+    def render(self, extra_gauges=None):
+        lines = []
+        with self._lock:
+            lines.append('# TYPE thechef_http_requests_total counter')
+            for (endpoint, status), count in sorted(self.requests.items()):
+                lines.append(f'thechef_http_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+            lines.append('# TYPE thechef_http_request_duration_seconds histogram')
+            for endpoint, counts in sorted(self.bucket_counts.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(
+                        f'thechef_http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}'
+                    )
+                cumulative += counts[-1]
+                lines.append(f'thechef_http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} {cumulative}')
+                lines.append(f'thechef_http_request_duration_seconds_sum{{endpoint="{endpoint}"}} {self.duration_sum[endpoint]:.6f}')
+                lines.append(f'thechef_http_request_duration_seconds_count{{endpoint="{endpoint}"}} {cumulative}')
+
+            for name, values, fmt in (
+                ('thechef_db_queries_total', self.db_queries, '{}'),
+                ('thechef_db_query_seconds_total', self.db_seconds, '{:.6f}'),
+                ('thechef_template_render_seconds_total', self.template_seconds, '{:.6f}'),
+            ):
+                lines.append(f'# TYPE {name} counter')
+                for endpoint, value in sorted(values.items()):
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {fmt.format(value)}')
+
+        for name, kind, value in extra_gauges or ():
+            lines.append(f'# TYPE {name} {kind}')
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+# İstek içindeki bir bloğun süresini Server-Timing'e ekler:
+#   with timed('hash'): check_password_hash(...)
+@contextmanager
+def timed(name):
+    if not has_request_context() or 'timings' not in g:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        g.timings[name] += time.perf_counter() - start
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'timings' in g:
+        conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('metrics_query_start')
+    if starts and has_request_context() and 'timings' in g:
+        g.timings['db'] += time.perf_counter() - starts.pop()
+        g.db_queries += 1
+
+
+def _before_render(sender, template, context, **extra):
+    if 'timings' in g:
+        # İç içe render'lar (include edilen parçalar) yalnızca en dışta ölçülür
+        if g.template_depth == 0:
+            g.template_start = time.perf_counter()
+        g.template_depth += 1
+
+
+def _after_render(sender, template, context, **extra):
+    if 'timings' in g and g.template_depth:
+        g.template_depth -= 1
+        if g.template_depth == 0:
+            g.timings['tpl'] += time.perf_counter() - g.template_start
+
+
+def init_metrics(app):
+    if not app.config.get('METRICS_ENABLED'):
+        return
+    registry = MetricsRegistry()
+    app.extensions['metrics'] = registry
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+
+    @app.before_request
+    def _start_timing():
+        g.timings = defaultdict(float)
+        g.db_queries = 0
+        g.template_depth = 0
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def _finish_timing(response):
+        if 'timings' not in g:
+            return response
+        total = time.perf_counter() - g.request_start
+        timings = g.timings
+        endpoint = request.endpoint or 'unmatched'
+        if endpoint == 'metrics_endpoint':
+            return response
+
+        parts = [f'db;dur={timings["db"] * 1000:.2f};desc="{g.db_queries} queries"']
+        parts += [f'{name};dur={value * 1000:.2f}' for name, value in timings.items() if name != 'db']
+        parts.append(f'total;dur={total * 1000:.2f}')
+        response.headers['Server-Timing'] = ', '.join(parts)
+
+        registry.observe(endpoint, response.status_code, total, g.db_queries,
+                         timings.get('db', 0.0), timings.get('tpl', 0.0))
+        request_logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'endpoint': endpoint,
+            'status': response.status_code,
+            'duration_ms': round(total * 1000, 2),
+            'db_queries': g.db_queries,
+            **{f'{name}_ms': round(value * 1000, 2) for name, value in timings.items()},
+        }))
+        return response
+
+    @app.route('/metrics')
+    def metrics_endpoint():
+        gauges = []
+        fragment_cache = app.extensions.get('fragment_cache')
+        if fragment_cache is not None:
+            stats = fragment_cache.stats()
+            gauges = [
+                ('thechef_cache_hits_total', 'counter', stats['hits']),
+                ('thechef_cache_misses_total', 'counter', stats['misses']),
+                ('thechef_cache_invalidations_total', 'counter', stats['invalidations']),
+                ('thechef_cache_entries', 'gauge', stats['entries']),
+            ]
+        return Response(registry.render(gauges), mimetype='text/plain; version=0.0.4')
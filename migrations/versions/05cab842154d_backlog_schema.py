@@ -0,0 +1,214 @@
+"""backlog schema
+
+Revision ID: 05cab842154d
+Revises: 617ce06f4961
+Create Date: 2026-10-17 01:04:41.829184
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Restoran araması: restaurant tablosu üzerinde "external content" FTS5 indeksi ve onu
+# güncel tutan tetikleyiciler (search.py)
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE restaurant_fts USING fts5(
+        name, description, address,
+        content='restaurant', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER restaurant_fts_ai AFTER INSERT ON restaurant BEGIN
+        INSERT INTO restaurant_fts(rowid, name, description, address)
+        VALUES (new.id, new.name, new.description, new.address);
+    END""",
+    """CREATE TRIGGER restaurant_fts_ad AFTER DELETE ON restaurant BEGIN
+        INSERT INTO restaurant_fts(restaurant_fts, rowid, name, description, address)
+        VALUES ('delete', old.id, old.name, old.description, old.address);
+    END""",
+    """CREATE TRIGGER restaurant_fts_au AFTER UPDATE OF name, description, address ON restaurant BEGIN
+        INSERT INTO restaurant_fts(restaurant_fts, rowid, name, description, address)
+        VALUES ('delete', old.id, old.name, old.description, old.address);
+        INSERT INTO restaurant_fts(rowid, name, description, address)
+        VALUES (new.id, new.name, new.description, new.address);
+    END""",
+]
+
+# Mevcut satırlardan türetilen veriler: puan özetleri yorumlardan, günlük satışlar
+# iptal edilmemiş siparişlerden (ratings.rebuild_ratings / sales.rebuild_sales_rollups)
+RATING_BACKFILL = """UPDATE restaurant SET
+    rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM comment
+                  WHERE comment.restaurant_id = restaurant.id AND rating IS NOT NULL),
+    rating_count = (SELECT COUNT(rating) FROM comment
+                    WHERE comment.restaurant_id = restaurant.id),
+    {stars}"""
+RATING_STAR = ("rating_{star} = (SELECT COUNT(*) FROM comment "
+               "WHERE comment.restaurant_id = restaurant.id AND rating = {star})")
+SALES_BACKFILL = [
+    """INSERT INTO daily_sales (restaurant_id, day, order_count, revenue)
+    SELECT restaurant_id, date(created_at), COUNT(id), SUM(total_price)
+    FROM "order" WHERE status != 'cancelled'
+    GROUP BY restaurant_id, date(created_at)""",
+    """INSERT INTO daily_menu_sales (restaurant_id, menu_id, day, quantity, revenue)
+    SELECT o.restaurant_id, i.menu_id, date(o.created_at), SUM(i.quantity), SUM(i.quantity * i.price)
+    FROM order_item i JOIN "order" o ON o.id = i.order_id
+    WHERE o.status != 'cancelled'
+    GROUP BY o.restaurant_id, i.menu_id, date(o.created_at)""",
+]
+
+
+# revision identifiers, used by Alembic.
+revision = '05cab842154d'
+down_revision = '617ce06f4961'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('daily_sales',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurant.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('restaurant_id', 'day', name='uq_daily_sales_restaurant_day')
+    )
+    op.create_table('cart_item',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cart_key', sa.String(length=64), nullable=False),
+    sa.Column('menu_id', sa.Integer(), nullable=False),
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=120), nullable=False),
+    sa.Column('restaurant_name', sa.String(length=120), nullable=True),
+    sa.Column('price', sa.Float(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['menu_id'], ['menu.id'], ),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurant.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cart_key', 'menu_id', name='uq_cart_item_key_menu')
+    )
+    op.create_table('daily_menu_sales',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('menu_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['menu_id'], ['menu.id'], ),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurant.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('menu_id', 'day', name='uq_daily_menu_sales_menu_day')
+    )
+    with op.batch_alter_table('daily_menu_sales', schema=None) as batch_op:
+        batch_op.create_index('ix_daily_menu_sales_restaurant_id_day', ['restaurant_id', 'day'], unique=False)
+
+    op.create_table('order_event',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['order_id'], ['order.id'], ),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurant.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('order_event', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_order_event_order_id'), ['order_id'], unique=False)
+        batch_op.create_index('ix_order_event_restaurant_id_id', ['restaurant_id', 'id'], unique=False)
+
+    with op.batch_alter_table('comment', schema=None) as batch_op:
+        batch_op.create_index('ix_comment_restaurant_id_id', ['restaurant_id', sa.literal_column('id DESC')], unique=False)
+
+    with op.batch_alter_table('menu', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_menu_image_path'), ['image_path'], unique=False)
+        batch_op.create_index(batch_op.f('ix_menu_restaurant_id'), ['restaurant_id'], unique=False)
+
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_order_customer_id'), ['customer_id'], unique=False)
+        batch_op.create_index('ix_order_restaurant_id_id', ['restaurant_id', sa.literal_column('id DESC')], unique=False)
+        batch_op.create_index('ix_order_status_created_at', ['status', 'created_at'], unique=False)
+
+    with op.batch_alter_table('order_item', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_order_item_menu_id'), ['menu_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_order_item_order_id'), ['order_id'], unique=False)
+
+    with op.batch_alter_table('restaurant', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('geohash', sa.String(length=12), nullable=True))
+        batch_op.add_column(sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_1', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_2', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_3', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_4', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_5', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index(batch_op.f('ix_restaurant_geohash'), ['geohash'], unique=False)
+        batch_op.create_index(batch_op.f('ix_restaurant_image_path'), ['image_path'], unique=False)
+        batch_op.create_index(batch_op.f('ix_restaurant_owner_id'), ['owner_id'], unique=False)
+
+    # ### end Alembic commands ###
+    op.execute(RATING_BACKFILL.format(
+        stars=',\n    '.join(RATING_STAR.format(star=star) for star in range(1, 6))
+    ))
+    for statement in SALES_BACKFILL:
+        op.execute(statement)
+    for statement in FTS_DDL:
+        op.execute(statement)
+    # Mevcut restoranlar indekse alınır
+    op.execute("INSERT INTO restaurant_fts(restaurant_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    # restaurant tablosu aşağıda yeniden oluşturulur; önce ona bağlı tetikleyiciler kalkar
+    for trigger in ('restaurant_fts_au', 'restaurant_fts_ad', 'restaurant_fts_ai'):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS restaurant_fts')
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('restaurant', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_restaurant_owner_id'))
+        batch_op.drop_index(batch_op.f('ix_restaurant_image_path'))
+        batch_op.drop_index(batch_op.f('ix_restaurant_geohash'))
+        batch_op.drop_column('rating_5')
+        batch_op.drop_column('rating_4')
+        batch_op.drop_column('rating_3')
+        batch_op.drop_column('rating_2')
+        batch_op.drop_column('rating_1')
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')
+        batch_op.drop_column('geohash')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
+
+    with op.batch_alter_table('order_item', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_order_item_order_id'))
+        batch_op.drop_index(batch_op.f('ix_order_item_menu_id'))
+
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.drop_index('ix_order_status_created_at')
+        batch_op.drop_index('ix_order_restaurant_id_id')
+        batch_op.drop_index(batch_op.f('ix_order_customer_id'))
+
+    with op.batch_alter_table('menu', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_menu_restaurant_id'))
+        batch_op.drop_index(batch_op.f('ix_menu_image_path'))
+        batch_op.drop_column('deleted_at')
+
+    with op.batch_alter_table('comment', schema=None) as batch_op:
+        batch_op.drop_index('ix_comment_restaurant_id_id')
+
+    with op.batch_alter_table('order_event', schema=None) as batch_op:
+        batch_op.drop_index('ix_order_event_restaurant_id_id')
+        batch_op.drop_index(batch_op.f('ix_order_event_order_id'))
+
+    op.drop_table('order_event')
+    with op.batch_alter_table('daily_menu_sales', schema=None) as batch_op:
+        batch_op.drop_index('ix_daily_menu_sales_restaurant_id_day')
+
+    op.drop_table('daily_menu_sales')
+    op.drop_table('cart_item')
+    op.drop_table('daily_sales')
+    # ### end Alembic commands ###
@@ -1,7 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import case
+from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import datetime
+from replica import RoutingSession
 
-db = SQLAlchemy()
+# Okumalar istek türüne göre replikaya yönlendirilebilir (replica.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # --------------------
 # Kullanıcı Tablosu
@@ -24,29 +28,63 @@ class User(db.Model):
 # --------------------
 class Restaurant(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    owner_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    owner_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     name = db.Column(db.String(120), nullable=False)
     description = db.Column(db.Text, nullable=True)
     address = db.Column(db.String(200), nullable=True)
-    image_path = db.Column(db.String(200), nullable=True)
+    image_path = db.Column(db.String(200), nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Sipariş geçmişi olan restoranlar silinmez, işaretlenir (deletion.py); hiçbir
+    # listede ve sayfada görünmez
+    deleted_at = db.Column(db.DateTime, nullable=True)
+
+    # Konum: geohash kaydedilirken koordinatlardan hesaplanır (geo.py), yakın arama
+    # bu kolondaki indeksle aday hücreleri tarar
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    geohash = db.Column(db.String(12), nullable=True, index=True)
+
+    # Puan özeti: yorumlar eklendikçe aynı transaction içinde güncellenir,
+    # `flask rebuild-ratings` ile yorumlardan baştan hesaplanabilir
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_1 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_2 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_3 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_4 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_5 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # İlişkiler
     menus = db.relationship('Menu', backref='restaurant', lazy=True)
     comments = db.relationship('Comment', backref='restaurant', lazy=True)
     orders = db.relationship('Order', backref='restaurant', lazy=True)
 
+    @hybrid_property
+    def rating_avg(self):
+        return self.rating_sum / self.rating_count if self.rating_count else None
+
+    @rating_avg.expression
+    def rating_avg(cls):
+        return case((cls.rating_count > 0, cls.rating_sum * 1.0 / cls.rating_count), else_=None)
+
+    @property
+    def rating_histogram(self):
+        # {5: adet, 4: adet, ..., 1: adet}
+        return {star: getattr(self, f'rating_{star}') for star in range(5, 0, -1)}
+
 
 # --------------------
 # Menü Tablosu
 # --------------------
 class Menu(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurant.id'), nullable=False)
+    restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurant.id'), nullable=False, index=True)
     name = db.Column(db.String(120), nullable=False)
     description = db.Column(db.Text, nullable=True)
     price = db.Column(db.Float, nullable=False)
-    image_path = db.Column(db.String(200), nullable=True)
+    image_path = db.Column(db.String(200), nullable=True, index=True)
+    # Siparişlerde geçen ürünler silinmez, işaretlenir (deletion.py); menüde görünmez
+    deleted_at = db.Column(db.DateTime, nullable=True)
 
     # İlişkiler
     order_items = db.relationship('OrderItem', backref='menu_item', lazy=True)
@@ -57,7 +95,7 @@ class Menu(db.Model):
 # --------------------
 class Order(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    customer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    customer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurant.id'), nullable=False)
     total_price = db.Column(db.Float, nullable=False)
     status = db.Column(db.String(20), default='pending')
@@ -72,12 +110,25 @@ class Order(db.Model):
 # --------------------
 class OrderItem(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False)
-    menu_id = db.Column(db.Integer, db.ForeignKey('menu.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False, index=True)
+    menu_id = db.Column(db.Integer, db.ForeignKey('menu.id'), nullable=False, index=True)
     quantity = db.Column(db.Integer, nullable=False, default=1)
     price = db.Column(db.Float, nullable=False)  # o anki fiyat
 
 
+# --------------------
+# Sipariş Olayları
+# --------------------
+# Siparişin oluşması ve her durum değişikliği aynı transaction içinde buraya yazılır.
+# Restoran sahibinin canlı sipariş akışı bu tablodan okunur; id, SSE'deki Last-Event-ID'dir.
+class OrderEvent(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurant.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
 # --------------------
 # Yorum Tablosu
 # --------------------
@@ -90,3 +141,69 @@ class Comment(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # NOT: Burada author backref tanımlama, User.comments ile zaten ilişki var
+
+
+# --------------------
+# Bileşik İndeksler
+# --------------------
+# Restoran sayfaları yorumları/siparişleri restoran bazında en yeniden eskiye listeler
+db.Index('ix_comment_restaurant_id_id', Comment.restaurant_id, Comment.id.desc())
+db.Index('ix_order_restaurant_id_id', Order.restaurant_id, Order.id.desc())
+# Canlı akış restoranın olaylarını id sırasıyla okur; süresi dolan siparişler durum+tarihle bulunur
+db.Index('ix_order_event_restaurant_id_id', OrderEvent.restaurant_id, OrderEvent.id)
+db.Index('ix_order_status_created_at', Order.status, Order.created_at)
+
+
+# --------------------
+# Sepet Tablosu
+# --------------------
+# Sepet cookie yerine sunucuda tutulur. cart_key giriş yapmış kullanıcı için
+# "user:<id>", misafir için "anon:<rastgele>" biçimindedir.
+class CartItem(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    cart_key = db.Column(db.String(64), nullable=False)
+    menu_id = db.Column(db.Integer, db.ForeignKey('menu.id'), nullable=False)
+    restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurant.id'), nullable=False)
+    name = db.Column(db.String(120), nullable=False)
+    restaurant_name = db.Column(db.String(120), nullable=True)
+    price = db.Column(db.Float, nullable=False)  # sepete eklendiği andaki fiyat
+    quantity = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('cart_key', 'menu_id', name='uq_cart_item_key_menu'),
+        # Terk edilmiş misafir sepetlerinin temizliği son değişiklik zamanıyla arar
+        db.Index('ix_cart_item_updated_at', 'updated_at'),
+    )
+
+
+# --------------------
+# Günlük Satış Özetleri
+# --------------------
+# Siparişler oluştuğunda (ve iptal edildiğinde eksi olarak) aynı transaction içinde
+# güncellenir; `flask rebuild-sales` ile siparişlerden baştan hesaplanabilir.
+# Satış paneli yalnızca bu tablolardan okur. Günler UTC'dir.
+class DailySales(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurant.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('restaurant_id', 'day', name='uq_daily_sales_restaurant_day'),
+    )
+
+
+class DailyMenuSales(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurant.id'), nullable=False)
+    menu_id = db.Column(db.Integer, db.ForeignKey('menu.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    quantity = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('menu_id', 'day', name='uq_daily_menu_sales_menu_day'),
+        db.Index('ix_daily_menu_sales_restaurant_id_day', 'restaurant_id', 'day'),
+    )
@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import exists, insert, update
+from models import db, Order, OrderItem, OrderEvent
+from events import publish
+from jobs import task
+from sales import apply_order_rollups
+
+# --------------------
+# Sipariş Durumları
+# --------------------
+# pending -> accepted -> preparing -> delivered; teslimden önce her aşamada iptal edilebilir.
+# Geçişler koşullu UPDATE ile yapılır (WHERE status IN <izinli kaynaklar>), böylece aynı
+# siparişe eşzamanlı iki işlem gelse bile yalnızca biri uygulanır.
+ORDER_TRANSITIONS = {
+    'pending': ('accepted', 'cancelled'),
+    'accepted': ('preparing', 'cancelled'),
+    'preparing': ('delivered', 'cancelled'),
+    'delivered': (),
+    'cancelled': (),
+}
+ORDER_STATUS_LABELS = {
+    'pending': 'Bekliyor',
+    'accepted': 'Onaylandı',
+    'preparing': 'Hazırlanıyor',
+    'delivered': 'Teslim edildi',
+    'cancelled': 'İptal edildi',
+}
+ORDER_ACTION_LABELS = {
+    'accepted': 'Onayla',
+    'preparing': 'Hazırlamaya başla',
+    'delivered': 'Teslim edildi',
+    'cancelled': 'İptal et',
+}
+
+
+# İptal edilebilen (henüz teslim edilmemiş) durumlar
+OPEN_STATUSES = tuple(s for s, targets in ORDER_TRANSITIONS.items() if 'cancelled' in targets)
+
+
+def init_orders(app):
+    # Bu süre içinde onaylanmayan siparişler iptal edilir (0 = kapalı, varsayılan)
+    app.config.setdefault('ORDER_ACCEPT_TIMEOUT', 0)  # saniye
+    app.jinja_env.globals.update(
+        order_status_label=ORDER_STATUS_LABELS.get,
+        order_actions=lambda status: [(s, ORDER_ACTION_LABELS[s]) for s in ORDER_TRANSITIONS.get(status, ())],
+    )
+    if app.config['ORDER_ACCEPT_TIMEOUT']:
+        app.extensions['jobs'].every('orders.expire_pending', 60)
+
+
+def order_channel(restaurant_id):
+    return f'orders:{restaurant_id}'
+
+
+def can_transition(current, status):
+    return status in ORDER_TRANSITIONS.get(current, ())
+
+
+# Siparişi `status` durumuna geçirir; geçiş geçersizse ya da sipariş bu arada başka bir
+# duruma geçtiyse False döner.
+@task('orders.transition')
+def transition_order(order_id: int, status: str) -> bool:
+    sources = [s for s, targets in ORDER_TRANSITIONS.items() if status in targets]
+    try:
+        restaurant_id = db.session.execute(
+            update(Order)
+            .where(Order.id == order_id, Order.status.in_(sources))
+            .values(status=status)
+            .returning(Order.restaurant_id)
+        ).scalar()
+        if restaurant_id is None:
+            db.session.rollback()
+            return False
+        db.session.execute(insert(OrderEvent).values(
+            restaurant_id=restaurant_id, order_id=order_id, status=status
+        ))
+        if status == 'cancelled':
+            apply_order_rollups([order_id], sign=-1)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    publish(order_channel(restaurant_id))
+    return True
+
+
+# `where` ile seçilen siparişleri tek UPDATE ile iptal eder; olaylar ve satış özetleri
+# aynı transaction'da yazılır. Commit etmez, iptal edilen (sipariş, restoran) id'lerini döner.
+def cancel_orders(*where) -> list:
+    cancelled = db.session.execute(
+        update(Order)
+        .where(*where)
+        .values(status='cancelled')
+        .returning(Order.id, Order.restaurant_id)
+    ).all()
+    if cancelled:
+        db.session.execute(insert(OrderEvent), [
+            {'restaurant_id': rid, 'order_id': oid, 'status': 'cancelled'}
+            for oid, rid in cancelled
+        ])
+        apply_order_rollups([oid for oid, _rid in cancelled], sign=-1)
+    return cancelled
+
+
+# Süresi içinde onaylanmayan bekleyen siparişleri iptal eder. Yalnızca durum makinesiyle
+# açılmış (OrderEvent kaydı olan) siparişler sayılır; bu özellikten önceki eski siparişlerin
+# olayı yoktur ve satışlardan düşülmeden olduğu gibi bırakılır.
+@task('orders.expire_pending')
+def expire_pending_orders() -> int:
+    timeout = current_app.config.get('ORDER_ACCEPT_TIMEOUT')
+    if not timeout:
+        return 0
+    cutoff = datetime.utcnow() - timedelta(seconds=timeout)
+    try:
+        expired = cancel_orders(
+            Order.status == 'pending',
+            Order.created_at < cutoff,
+            exists().where(OrderEvent.order_id == Order.id),
+        )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    for rid in {rid for _oid, rid in expired}:
+        publish(order_channel(rid))
+    return len(expired)
+
+
+# --------------------
+# Sipariş Oluşturma
+# --------------------
+# Sepetteki her restoran için bir Order ve kalemleri için OrderItem satırları oluşturur.
+# Her şey (sipariş olayları ve satış özetleri dahil) tek transaction'da yazılır:
+# siparişler tek bir çoklu INSERT ... RETURNING ile eklenir, dönen id'ler parametre
+# sırasıyla eşleştirilir ve kalemler toplu INSERT ile yazılır. Hata olursa hiçbir sipariş
+# kalmaz. Oluşan sipariş id'lerini döndürür.
+#
+# `restaurants`: {"<restoran_id>": [{"id", "price", "quantity", ...}, ...]}, sunucu taraflı
+# sepetin Cart.restaurants biçimi (cart_store.py)
+def place_orders(customer_id: int, restaurants: dict) -> list:
+    carts = [(int(rid), items) for rid, items in restaurants.items() if items]
+    if not carts:
+        return []
+
+    order_rows = [
+        {
+            'customer_id': customer_id,
+            'restaurant_id': rid,
+            'total_price': sum(it['price'] * it['quantity'] for it in items),
+            'status': 'pending',
+        }
+        for rid, items in carts
+    ]
+    try:
+        result = db.session.execute(
+            insert(Order).returning(Order.id, sort_by_parameter_order=True),
+            order_rows
+        )
+        order_ids = list(result.scalars())
+
+        item_rows = [
+            {
+                'order_id': order_id,
+                'menu_id': it['id'],
+                'quantity': it['quantity'],
+                'price': it['price'],
+            }
+            for order_id, (_rid, items) in zip(order_ids, carts)
+            for it in items
+        ]
+        db.session.execute(insert(OrderItem), item_rows)
+        db.session.execute(insert(OrderEvent), [
+            {'restaurant_id': rid, 'order_id': order_id, 'status': 'pending'}
+            for order_id, (rid, _items) in zip(order_ids, carts)
+        ])
+        apply_order_rollups(order_ids)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    for rid, _items in carts:
+        publish(order_channel(rid))
+    return order_ids
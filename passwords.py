@@ -0,0 +1,98 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+from pools import thread_pool
+
+# --------------------
+# Şifre Hash Havuzu
+# --------------------
+# pbkdf2 hesaplaması istek thread'inde değil, boyutu ayrı ayarlanan bir havuzda yapılır.
+# Böylece bir giriş dalgası (meşru ya da credential stuffing) tüm web işçilerini
+# meşgul edemez: havuzda en fazla PASSWORD_HASH_WORKERS iş çalışır, PASSWORD_HASH_QUEUE
+# kadarı sırada bekler, fazlası PasswordPoolBusy ile hemen reddedilir (503). Sırada
+# PASSWORD_HASH_TIMEOUT saniyeden uzun bekleyen işler de aynı hatayla sonuçlanır.
+# PASSWORD_HASH_EXECUTOR='thread' (varsayılan; hashlib pbkdf2 sırasında GIL'i bırakır)
+# veya 'process' olabilir; gevent işçisinde thread havuzu gerçek thread'lerde çalışır (pools.py).
+# Hash parametreleri PASSWORD_HASH_METHOD ile belirlenir; farklı parametrelerle
+# saklanmış şifreler başarılı girişte yeniden hash'lenir (needs_rehash).
+DEFAULT_HASH_METHOD = 'pbkdf2:sha256:600000'
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, method=DEFAULT_HASH_METHOD, workers=2, queue_size=16,
+                 timeout=10, executor='thread'):
+        self.method = method
+        self.timeout = timeout
+        if executor == 'process':
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self._executor = thread_pool(workers, thread_name_prefix='password-hash')
+        # Çalışan + sıradaki iş sayısı sınırı
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _f: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # Henüz başlamadıysa sıradan çıkarılır; istemci yoğunluk yanıtı alır
+            future.cancel()
+            raise PasswordPoolBusy() from None
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        # Saklanan biçim: "<method>$<salt>$<hash>"
+        return pwhash.split('$', 1)[0] != self.method
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def init_passwords(app):
+    app.config.setdefault('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD)
+    app.config.setdefault('PASSWORD_HASH_WORKERS', 2)
+    app.config.setdefault('PASSWORD_HASH_QUEUE', 16)
+    app.config.setdefault('PASSWORD_HASH_TIMEOUT', 10)  # saniye
+    app.config.setdefault('PASSWORD_HASH_EXECUTOR', 'thread')
+    app.extensions['password_hasher'] = None
+
+
+# Havuz ilk kullanımda oluşturulur; ayarlar import sonrası değiştirilebilir
+def get_hasher():
+    hasher = current_app.extensions.get('password_hasher')
+    if hasher is None:
+        config = current_app.config
+        hasher = PasswordHasher(
+            method=config['PASSWORD_HASH_METHOD'],
+            workers=config['PASSWORD_HASH_WORKERS'],
+            queue_size=config['PASSWORD_HASH_QUEUE'],
+            timeout=config['PASSWORD_HASH_TIMEOUT'],
+            executor=config['PASSWORD_HASH_EXECUTOR'],
+        )
+        current_app.extensions['password_hasher'] = hasher
+    return hasher
+
+
+def hash_password(password):
+    return get_hasher().hash(password)
+
+
+def verify_password(pwhash, password):
+    return get_hasher().verify(pwhash, password)
@@ -0,0 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# --------------------
+# Thread Havuzları
+# --------------------
+# gevent işçisinde (gunicorn -k gevent) threading modülü yamalanır ve thread'ler
+# greenlet'e dönüşür; bir greenlet'te çalışan CPU işi (pbkdf2, resim küçültme) o işçideki
+# tüm istekleri durdurur. Bu durumda havuz gevent'in gerçek thread kullanan
+# ThreadPoolExecutor'ıyla kurulur; future'ları greenlet'i bloklamadan beklenir.
+# gevent kurulu değilse ya da yama yapılmamışsa standart havuz kullanılır.
+
+
+def _threading_patched():
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+
+def thread_pool(max_workers, thread_name_prefix=''):
+    if _threading_patched():
+        from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+        return NativeThreadPoolExecutor(max_workers)
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
@@ -0,0 +1,45 @@
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# --------------------
+# İstek Başına SQL Sayacı
+# --------------------
+# Debug/test modunda her istekte çalışan SQL ifadeleri sayılır. Bir route kendi
+# bütçesini aşarsa testlerde QueryBudgetExceeded fırlatılır, debug modunda uyarı
+# loglanır; böylece N+1 sorgu gerilemeleri fark edilmeden geçmez.
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'sql_queries' in g:
+        g.sql_queries += 1
+
+
+def init_query_counter(app):
+    if not event.contains(Engine, 'before_cursor_execute', _count_statement):
+        event.listen(Engine, 'before_cursor_execute', _count_statement)
+
+    # TESTING genelde import sonrası açıldığından kontrol her istekte yapılır
+    @app.before_request
+    def _start_query_count():
+        if app.debug or app.testing or app.config.get('SQL_QUERY_COUNTING', False):
+            g.sql_queries = 0
+
+    @app.after_request
+    def _check_query_budget(response):
+        count = g.pop('sql_queries', None)
+        if count is None:
+            return response
+        response.headers['X-SQL-Queries'] = str(count)
+        budgets = app.config.get('SQL_QUERY_BUDGETS', {})
+        budget = budgets.get(request.endpoint, app.config.get('SQL_QUERY_BUDGET'))
+        if budget is not None and count > budget:
+            message = f'{request.endpoint} {count} SQL ifadesi çalıştırdı (bütçe: {budget})'
+            if app.testing:
+                raise QueryBudgetExceeded(message)
+            app.logger.warning(message)
+        return response
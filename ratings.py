@@ -0,0 +1,61 @@
+from sqlalchemy import case, func, select, update
+from models import db, Restaurant, Comment
+
+# --------------------
+# Restoran Puan Özetleri
+# --------------------
+RATING_STARS = range(1, 6)
+
+
+# Yeni puanı restoran özetine SQL tarafında ekler (UPDATE ... SET x = x + 1), böylece
+# eşzamanlı yorumlar birbirinin artışını ezmez. Commit çağırana aittir; yorumla aynı
+# transaction'da kalır. Restoran yoksa ya da silinmişse False döner.
+def record_rating(restaurant_id: int, rating: int) -> bool:
+    values = {
+        Restaurant.rating_sum: Restaurant.rating_sum + rating,
+        Restaurant.rating_count: Restaurant.rating_count + 1,
+        getattr(Restaurant, f'rating_{rating}'): getattr(Restaurant, f'rating_{rating}') + 1,
+    }
+    updated = (Restaurant.query.filter_by(id=restaurant_id, deleted_at=None)
+               .update(values, synchronize_session=False))
+    return updated > 0
+
+
+# Tüm özetleri yorumlardan tek bir GROUP BY ile yeniden hesaplar.
+def rebuild_ratings():
+    per_star = {
+        f'r{star}': func.sum(case((Comment.rating == star, 1), else_=0)).label(f'r{star}')
+        for star in RATING_STARS
+    }
+    agg = (
+        select(
+            Comment.restaurant_id,
+            func.sum(Comment.rating).label('total'),
+            func.count(Comment.rating).label('cnt'),
+            *per_star.values(),
+        )
+        .where(Comment.rating.isnot(None))
+        .group_by(Comment.restaurant_id)
+        .subquery()
+    )
+    zero = {'rating_sum': 0, 'rating_count': 0}
+    zero.update({f'rating_{star}': 0 for star in RATING_STARS})
+    db.session.execute(update(Restaurant).values(**zero))
+
+    values = {'rating_sum': agg.c.total, 'rating_count': agg.c.cnt}
+    values.update({f'rating_{star}': agg.c[f'r{star}'] for star in RATING_STARS})
+    db.session.execute(
+        update(Restaurant)
+        .where(Restaurant.id == agg.c.restaurant_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def init_ratings(app):
+    @app.cli.command('rebuild-ratings')
+    def rebuild_ratings_command():
+        """Restoran puan özetlerini yorumlardan yeniden hesaplar."""
+        rebuild_ratings()
+        db.session.commit()
+        print('Puan özetleri yeniden hesaplandı.')
@@ -0,0 +1,131 @@
+import time
+import click
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from jobs import task
+
+# --------------------
+# Okuma Replikası
+# --------------------
+# DATABASE_REPLICA_URL verilirse 'replica' adlı ikinci bir engine bind'ı kurulur. Yalnızca
+# okuma yapan istekler (GET/HEAD) SELECT ifadelerini replikaya gönderir; flush, DML ve
+# diğer her şey birincil veritabanına gider. Bir istek yazdıktan sonra aynı istekteki
+# okumalar da birincilde kalır.
+#
+# Yazan her istekten (POST vb. ya da veritabanına yazan bir GET) sonra kullanıcının
+# session'ına REPLICA_STICKY_SECONDS süreli bir işaret konur; bu süre içinde okumaları da
+# birincilden yapılır, böylece kullanıcı kendi yazdığını (ör. yeni yorumunu) hemen görür.
+# Taze veri gerektiren sayfalar @use_primary ile işaretlenir.
+#
+# Yerel geliştirmede replika ikinci bir SQLite dosyasıdır; gerçek replikasyon yerine
+# birincil dosya SQLite backup API'siyle replikaya kopyalanır. Debug modunda bu, her
+# REPLICA_SYNC_INTERVAL saniyede bir arka plan işi 'db.sync_replica' olarak çalışır; arada
+# replikadan doldurulan önbellek kayıtları eşitlemeden sonra yeniden geçersiz kılınır.
+# Üretimde aralık varsayılan olarak 0'dır: iş her gunicorn işçisinde ayrı çalışıp tüm
+# veritabanını işçi sayısı kadar kopyalardı. Kopya tek bir süreçte yapılır:
+#   flask sync-replica --interval 5
+# Replikasyon gecikmesi bu aralık kadardır; yapışkanlık süresi bundan uzun tutulmalıdır.
+# Bu durumda işçilerdeki önbellek kayıtlarının bayatlığı FRAGMENT_CACHE_TTL ile sınırlıdır.
+REPLICA_BIND = 'replica'
+STICKY_SESSION_KEY = 'db_primary_until'
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            reading = not self._flushing and getattr(clause, 'is_select', False)
+            if not reading:
+                self.info['wrote'] = True
+            elif self._replica_allowed():
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_allowed(self):
+        return (
+            REPLICA_BIND in self._db.engines
+            and has_request_context()
+            and g.get('db_read_replica', False)
+            and not self.info.get('wrote')
+        )
+
+
+# İstek GET olsa da okumaları birincilden yapar (ör. canlı sipariş akışı)
+def use_primary(view_func):
+    view_func.use_primary = True
+    return view_func
+
+
+def _db():
+    return current_app.extensions['sqlalchemy']
+
+
+def replica_enabled():
+    return REPLICA_BIND in _db().engines
+
+
+# Replikasyon yerine geçen kopya: yalnızca iki taraf da SQLite ise çalışır
+@task('db.sync_replica')
+def sync_replica():
+    engines = _db().engines
+    replica = engines.get(REPLICA_BIND)
+    primary = engines[None]
+    if replica is None or primary.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+        return False
+    # Kopyadan önce alınır: sonrasında geçersiz kılınanlar bir sonraki eşitlemeye kalır
+    cache = current_app.extensions.get('fragment_cache')
+    stale = cache.take_deferred() if cache else set()
+    source = primary.raw_connection()
+    try:
+        target = replica.raw_connection()
+        try:
+            source.driver_connection.backup(target.driver_connection)
+        finally:
+            target.close()
+    finally:
+        source.close()
+    if stale:
+        cache.invalidate(*stale, deferred=False)
+    return True
+
+
+def init_replica(app):
+    app.config.setdefault('REPLICA_STICKY_SECONDS', 15)
+    # saniye, 0: işçilerde kapalı (üretimde `flask sync-replica --interval` kullanılır)
+    app.config.setdefault('REPLICA_SYNC_INTERVAL', 5 if app.debug else 0)
+
+    with app.app_context():
+        if not replica_enabled():
+            return
+        if app.config['REPLICA_SYNC_INTERVAL']:
+            cache = app.extensions.get('fragment_cache')
+            if cache is not None:
+                cache.defer_invalidations()
+            app.extensions['jobs'].every('db.sync_replica', app.config['REPLICA_SYNC_INTERVAL'])
+
+    @app.before_request
+    def _route_reads():
+        view = app.view_functions.get(request.endpoint)
+        g.db_read_replica = (
+            request.method in ('GET', 'HEAD')
+            and not getattr(view, 'use_primary', False)
+            and session.get(STICKY_SESSION_KEY, 0) < time.time()
+        )
+
+    @app.after_request
+    def _stick_to_primary(response):
+        wrote = request.method not in ('GET', 'HEAD', 'OPTIONS')
+        if wrote or _db().session.info.get('wrote'):
+            session[STICKY_SESSION_KEY] = time.time() + app.config['REPLICA_STICKY_SECONDS']
+        return response
+
+    @app.cli.command('sync-replica')
+    @click.option('--interval', type=float, default=0,
+                  help='Verilirse bu kadar saniyede bir kopyalamaya devam eder.')
+    def sync_replica_command(interval):
+        """Birincil SQLite veritabanını replika dosyasına kopyalar."""
+        if not sync_replica():
+            raise click.ClickException('Replika yapılandırılmamış ya da SQLite değil.')
+        print('Replika güncellendi.')
+        while interval:
+            time.sleep(interval)
+            sync_replica()
@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import db, Order, OrderItem, Menu, DailySales, DailyMenuSales
+
+# --------------------
+# Satış Özetleri
+# --------------------
+# Günlük satış tabloları sipariş satırları Python'a taşınmadan, INSERT ... SELECT ...
+# GROUP BY ... ON CONFLICT DO UPDATE ile SQL tarafında güncellenir. Yalnızca verilen
+# siparişler okunur (order.id / order_item.order_id indeksleri), yani maliyet sipariş
+# geçmişinin boyutundan bağımsızdır. İptal edilen siparişler sign=-1 ile geri alınır.
+DASHBOARD_RANGES = (7, 30, 90)
+TOP_MENU_ITEMS = 10
+
+
+def _order_day():
+    return func.date(Order.created_at)
+
+
+def _daily_select(where, sign=1):
+    return (
+        select(
+            Order.restaurant_id,
+            _order_day(),
+            func.count(Order.id) * sign,
+            func.sum(Order.total_price) * sign,
+        )
+        .where(where)
+        .group_by(Order.restaurant_id, _order_day())
+    )
+
+
+def _menu_select(where, sign=1):
+    return (
+        select(
+            Order.restaurant_id,
+            OrderItem.menu_id,
+            _order_day(),
+            func.sum(OrderItem.quantity) * sign,
+            func.sum(OrderItem.quantity * OrderItem.price) * sign,
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(where)
+        .group_by(Order.restaurant_id, OrderItem.menu_id, _order_day())
+    )
+
+
+# Verilen siparişleri özetlere ekler (sign=1) ya da özetlerden düşer (sign=-1).
+# Commit çağırana aittir; sipariş yazımıyla aynı transaction'da kalır.
+def apply_order_rollups(order_ids, sign=1):
+    if not order_ids:
+        return
+    where = Order.id.in_(order_ids)
+
+    stmt = sqlite_insert(DailySales).from_select(
+        ['restaurant_id', 'day', 'order_count', 'revenue'], _daily_select(where, sign)
+    )
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=['restaurant_id', 'day'],
+        set_={
+            'order_count': DailySales.order_count + stmt.excluded.order_count,
+            'revenue': DailySales.revenue + stmt.excluded.revenue,
+        },
+    ))
+
+    stmt = sqlite_insert(DailyMenuSales).from_select(
+        ['restaurant_id', 'menu_id', 'day', 'quantity', 'revenue'], _menu_select(where, sign)
+    )
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=['menu_id', 'day'],
+        set_={
+            'quantity': DailyMenuSales.quantity + stmt.excluded.quantity,
+            'revenue': DailyMenuSales.revenue + stmt.excluded.revenue,
+        },
+    ))
+
+
+# Tüm özetleri iptal edilmemiş siparişlerden tek geçişte yeniden hesaplar.
+def rebuild_sales_rollups():
+    db.session.execute(delete(DailySales))
+    db.session.execute(delete(DailyMenuSales))
+    where = Order.status != 'cancelled'
+    db.session.execute(
+        DailySales.__table__.insert().from_select(
+            ['restaurant_id', 'day', 'order_count', 'revenue'], _daily_select(where)
+        )
+    )
+    db.session.execute(
+        DailyMenuSales.__table__.insert().from_select(
+            ['restaurant_id', 'menu_id', 'day', 'quantity', 'revenue'], _menu_select(where)
+        )
+    )
+
+
+# Satış paneli verisi: günlük seri, dönem toplamı ve en çok satan ürünler
+def sales_summary(restaurant_id, days):
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    daily = (
+        DailySales.query
+        .filter(DailySales.restaurant_id == restaurant_id, DailySales.day >= since)
+        .order_by(DailySales.day)
+        .all()
+    )
+    top_items = (
+        db.session.query(
+            Menu.name,
+            func.sum(DailyMenuSales.quantity).label('quantity'),
+            func.sum(DailyMenuSales.revenue).label('revenue'),
+        )
+        .join(Menu, Menu.id == DailyMenuSales.menu_id)
+        .filter(DailyMenuSales.restaurant_id == restaurant_id, DailyMenuSales.day >= since)
+        .group_by(DailyMenuSales.menu_id, Menu.name)
+        .having(func.sum(DailyMenuSales.quantity) > 0)
+        .order_by(func.sum(DailyMenuSales.quantity).desc())
+        .limit(TOP_MENU_ITEMS)
+        .all()
+    )
+    return {
+        'since': since,
+        'daily': daily,
+        'order_count': sum(d.order_count for d in daily),
+        'revenue': sum(d.revenue for d in daily),
+        'peak_revenue': max((d.revenue for d in daily), default=0),
+        'top_items': top_items,
+    }
+
+
+# Restoran listesi için son `days` gündeki ciro: {restoran_id: ciro}
+def recent_revenue(restaurant_ids, days=30):
+    if not restaurant_ids:
+        return {}
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    rows = (
+        db.session.query(DailySales.restaurant_id, func.sum(DailySales.revenue))
+        .filter(DailySales.restaurant_id.in_(restaurant_ids), DailySales.day >= since)
+        .group_by(DailySales.restaurant_id)
+    )
+    return dict(rows)
+
+
+def init_sales(app):
+    @app.cli.command('rebuild-sales')
+    def rebuild_sales_command():
+        """Günlük satış özetlerini siparişlerden yeniden hesaplar."""
+        rebuild_sales_rollups()
+        db.session.commit()
+        print('Satış özetleri yeniden hesaplandı.')
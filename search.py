@@ -0,0 +1,70 @@
+import re
+from sqlalchemy import column, text
+from models import db, Restaurant
+
+# --------------------
+# Restoran Arama (SQLite FTS5)
+# --------------------
+# restaurant tablosunun name/description/address kolonları için "external content"
+# FTS5 indeksi. İndeks tetikleyicilerle güncel tutulur, metin iki kez saklanmaz.
+# Tablo ve tetikleyiciler şema göçüyle oluşturulur (migrations/).
+FTS_TABLE = 'restaurant_fts'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def init_search(app):
+    @app.cli.command('rebuild-search')
+    def rebuild_search_command():
+        """Restoran arama indeksini baştan oluşturur."""
+        rebuild_index()
+        db.session.commit()
+        print('Arama indeksi yeniden oluşturuldu.')
+
+
+def rebuild_index():
+    db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def build_match_query(q: str):
+    # Kullanıcı girdisi FTS sözdizimi olarak yorumlanmasın: her kelime tırnaklanır,
+    # yazarken arama yapılabilsin diye önek (*) araması yapılır.
+    tokens = _TOKEN_RE.findall(q or '')
+    if not tokens:
+        return None
+    return ' '.join(f'"{t}"*' for t in tokens)
+
+
+# id'ye göre azalan sırada en fazla `limit` restoran döndürür: (restoranlar, sonraki_after_id).
+# Sayfalama keyset ile yapılır (after_id'den küçük id'ler), böylece her sayfanın
+# maliyeti katalog büyüklüğünden bağımsızdır.
+def search_restaurants(q=None, after_id=None, limit=24):
+    match = build_match_query(q)
+    if match:
+        # FTS5 rowid sırasıyla ve rowid kısıtıyla doğrudan gezinebilir; sıralama maliyeti yok.
+        # Silinmiş restoranlar rowid ile tek tek elenir (birincil anahtar araması)
+        sql = (f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+               " AND NOT EXISTS (SELECT 1 FROM restaurant"
+               f" WHERE restaurant.id = {FTS_TABLE}.rowid AND restaurant.deleted_at IS NOT NULL)")
+        params = {'match': match, 'limit': limit + 1}
+        if after_id:
+            sql += " AND rowid < :after_id"
+            params['after_id'] = after_id
+        sql += " ORDER BY rowid DESC LIMIT :limit"
+        # columns(): metin sorgusu SELECT olarak işaretlenir, okuma replikasına gidebilir
+        ids = [row[0] for row in db.session.execute(text(sql).columns(column('rowid')), params)]
+        if not ids:
+            return [], None
+        by_id = {r.id: r for r in Restaurant.query.filter(Restaurant.id.in_(ids[:limit]))}
+        restaurants = [by_id[i] for i in ids[:limit] if i in by_id]
+        has_more = len(ids) > limit
+    else:
+        query = Restaurant.query.filter(Restaurant.deleted_at.is_(None))
+        if after_id:
+            query = query.filter(Restaurant.id < after_id)
+        rows = query.order_by(Restaurant.id.desc()).limit(limit + 1).all()
+        restaurants = rows[:limit]
+        has_more = len(rows) > limit
+
+    next_after_id = restaurants[-1].id if has_more and restaurants else None
+    return restaurants, next_after_id
@@ -0,0 +1,40 @@
+document.addEventListener("DOMContentLoaded", () => {
+    const orderList = document.getElementById("orderList");
+    if (!orderList || !window.EventSource) {
+        return;
+    }
+
+    // Yeni siparişler ve durum değişiklikleri sunucudan itilir (SSE); kopan bağlantıda
+    // tarayıcı Last-Event-ID ile kaldığı yerden devam eder
+    let lastEventId = orderList.dataset.lastEventId || 0;
+
+    function connect() {
+        const params = new URLSearchParams({ last_event_id: lastEventId });
+        const source = new EventSource(`${orderList.dataset.streamUrl}?${params}`);
+
+        source.addEventListener("order", event => {
+            lastEventId = event.lastEventId || lastEventId;
+            const data = JSON.parse(event.data);
+            const template = document.createElement("template");
+            template.innerHTML = data.html.trim();
+            const row = template.content.firstElementChild;
+            const existing = document.getElementById(`order-${data.order_id}`);
+            if (existing) {
+                existing.replaceWith(row);
+            } else {
+                orderList.prepend(row);
+            }
+            document.getElementById("noOrders")?.classList.add("d-none");
+        });
+
+        // Sunucu akış sınırı dolunca 503 döner; tarayıcı 200 dışı yanıttan sonra kendisi
+        // yeniden bağlanmadığından biraz bekleyip (rastgele kaydırmayla) tekrar denenir
+        source.addEventListener("error", () => {
+            if (source.readyState === EventSource.CLOSED) {
+                setTimeout(connect, 10000 + Math.random() * 5000);
+            }
+        });
+    }
+
+    connect();
+});
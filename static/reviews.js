@@ -0,0 +1,24 @@
+document.addEventListener("DOMContentLoaded", () => {
+    const reviewList = document.getElementById("reviewList");
+    const loadMore = document.getElementById("loadMoreReviews");
+    if (!reviewList || !loadMore) {
+        return;
+    }
+
+    // Sonraki yorum sayfası before_id imleciyle getirilir ve listenin sonuna eklenir
+    loadMore.addEventListener("click", event => {
+        event.preventDefault();
+        const url = new URL(loadMore.dataset.url, window.location.origin);
+        url.searchParams.set("before_id", loadMore.dataset.beforeId);
+        fetch(url)
+            .then(res => res.json())
+            .then(data => {
+                reviewList.insertAdjacentHTML("beforeend", data.html);
+                if (data.next_before_id) {
+                    loadMore.dataset.beforeId = data.next_before_id;
+                } else {
+                    loadMore.remove();
+                }
+            });
+    });
+});
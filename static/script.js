@@ -1,12 +1,86 @@
 document.addEventListener("DOMContentLoaded", () => {
     const searchInput = document.getElementById("restaurantSearch");
-    const restaurantCards = document.querySelectorAll(".restaurant-card");
+    const restaurantList = document.getElementById("restaurantList");
+    const loadMore = document.getElementById("loadMoreRestaurants");
+    const nearbyButton = document.getElementById("nearbyButton");
+    if (!searchInput || !restaurantList) {
+        return;
+    }
+
+    // Arama sunucu tarafında (FTS) yapılır; kartlar sayfa sayfa getirilir
+    const searchUrl = searchInput.form.dataset.searchUrl;
+    let debounceTimer = null;
+    let requestSeq = 0;
+    // Yakın arama modunda konum ve sonraki sayfa imleci burada tutulur
+    let nearby = null;
+
+    const fetchPage = (query, afterId) => {
+        const params = new URLSearchParams();
+        if (query) params.set("q", query);
+        if (afterId) params.set("after_id", afterId);
+        const seq = ++requestSeq;
+        return fetch(`${searchUrl}?${params}`)
+            .then(res => res.json())
+            .then(data => (seq === requestSeq ? data : null));
+    };
+
+    const fetchNearby = after => {
+        const params = new URLSearchParams({ lat: nearby.lat, lng: nearby.lng, radius_km: 10 });
+        if (after) params.set("after", after);
+        const seq = ++requestSeq;
+        return fetch(`${nearbyButton.dataset.nearbyUrl}?${params}`)
+            .then(res => res.json())
+            .then(data => (seq === requestSeq ? { ...data, next_after_id: data.next_after } : null));
+    };
+
+    const updateLoadMore = nextAfterId => {
+        if (!loadMore) return;
+        loadMore.dataset.afterId = nextAfterId || "";
+        loadMore.classList.toggle("d-none", !nextAfterId);
+    };
 
     searchInput.addEventListener("input", () => {
-        const query = searchInput.value.toLowerCase();
-        restaurantCards.forEach(card => {
-            const name = card.querySelector(".restaurant-name").textContent.toLowerCase();
-            card.style.display = name.includes(query) ? "block" : "none";
-        });
+        nearby = null;
+        clearTimeout(debounceTimer);
+        debounceTimer = setTimeout(() => {
+            const query = searchInput.value.trim();
+            fetchPage(query).then(data => {
+                if (!data) return;
+                restaurantList.innerHTML = data.count
+                    ? data.html
+                    : '<div class="col-12"><div class="alert alert-info">Aramanızla eşleşen restoran bulunamadı.</div></div>';
+                updateLoadMore(data.next_after_id);
+            });
+        }, 250);
     });
+
+    if (loadMore) {
+        loadMore.addEventListener("click", event => {
+            event.preventDefault();
+            const query = searchInput.value.trim();
+            const next = nearby ? fetchNearby(loadMore.dataset.afterId) : fetchPage(query, loadMore.dataset.afterId);
+            next.then(data => {
+                if (!data) return;
+                restaurantList.insertAdjacentHTML("beforeend", data.html);
+                updateLoadMore(data.next_after_id);
+            });
+        });
+    }
+
+    if (nearbyButton && navigator.geolocation) {
+        nearbyButton.classList.remove("d-none");
+        nearbyButton.addEventListener("click", () => {
+            navigator.geolocation.getCurrentPosition(position => {
+                nearby = { lat: position.coords.latitude, lng: position.coords.longitude };
+                searchInput.value = "";
+                fetchNearby().then(data => {
+                    if (!data) return;
+                    restaurantList.innerHTML = data.count
+                        ? data.html
+                        : '<div class="col-12"><div class="alert alert-info">Yakınınızda restoran bulunamadı.</div></div>';
+                    updateLoadMore(data.next_after_id);
+                });
+            });
+        });
+    }
 });
@@ -0,0 +1,162 @@
+import hashlib
+import os
+import tempfile
+import time
+import click
+from flask import current_app
+from models import db, Restaurant, Menu
+from images import VARIANTS, variant_path, schedule_variants
+from metrics import timed
+
+# --------------------
+# İçerik Adresli Yükleme Deposu
+# --------------------
+# Yüklenen dosyalar içeriklerinin SHA-256 özetiyle saklanır:
+#   uploads/3f/3fa9...e1.jpg
+# Aynı resim kaç kez yüklenirse yüklensin diskte tek kopya vardır ve iki sahibin
+# aynı isimli dosyaları birbirini ezmez. Bir dosyanın referansları
+# Restaurant.image_path ve Menu.image_path kolonlarıdır; hiçbir satır göstermeyen
+# dosyalar release() ile hemen, `flask gc-uploads` ile toplu olarak silinir.
+CHUNK_SIZE = 64 * 1024
+ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
+# Henüz commit edilmemiş bir kayda ait olabilecek yeni dosyalara GC dokunmaz
+GC_GRACE_SECONDS = 3600
+
+
+def allowed_file(filename: str) -> bool:
+    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+def _upload_root():
+    return current_app.config['UPLOAD_FOLDER']
+
+
+def _abs_path(image_path: str) -> str:
+    return os.path.join(current_app.static_folder, image_path)
+
+
+def _extension(filename: str) -> str:
+    ext = filename.rsplit('.', 1)[1].lower()
+    return 'jpg' if ext == 'jpeg' else ext
+
+
+# Yüklemeyi parça parça diske yazarken özetini hesaplar; dosyayı içerik adresine
+# taşır ve static'e göre göreli yolunu döndürür ("uploads/ab/<özet>.<uzantı>").
+def store_upload(image) -> str:
+    root = _upload_root()
+    digest = hashlib.sha256()
+    fd, tmp = tempfile.mkstemp(dir=root, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = image.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+        hexdigest = digest.hexdigest()
+        rel_path = f'uploads/{hexdigest[:2]}/{hexdigest}.{_extension(image.filename)}'
+        target = _abs_path(rel_path)
+        if os.path.exists(target):
+            # Aynı içerik zaten var: yeni kopyaya gerek yok. Zaman damgası yenilenir ki
+            # henüz commit edilmemiş bu yükleme referanssız görünen dosyayı release()
+            # ya da GC silmesin.
+            os.remove(tmp)
+            os.utime(target)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # mkstemp dosyayı 0600 açar; sunucu (nginx vb.) okuyabilmeli
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return rel_path
+
+
+# Yüklemeyi saklar ve eksikse resim varyantlarının üretimini kuyruğa atar.
+def save_upload(image) -> str:
+    with timed('upload'):
+        image_path = store_upload(image)
+    if not all(os.path.exists(_abs_path(variant_path(image_path, v))) for v in VARIANTS):
+        schedule_variants(image_path)
+    return image_path
+
+
+def reference_count(image_path: str) -> int:
+    return (
+        Restaurant.query.filter_by(image_path=image_path).count()
+        + Menu.query.filter_by(image_path=image_path).count()
+    )
+
+
+def _remove_blob(image_path: str):
+    for path in [image_path] + [variant_path(image_path, v) for v in VARIANTS]:
+        try:
+            os.remove(_abs_path(path))
+        except FileNotFoundError:
+            pass
+
+
+def _recently_touched(image_path: str, grace_seconds: int = GC_GRACE_SECONDS) -> bool:
+    try:
+        return os.path.getmtime(_abs_path(image_path)) > time.time() - grace_seconds
+    except FileNotFoundError:
+        return False
+
+
+# Değiştirilen/silinen kayıtların eski resimleri için çağrılır (commit'ten sonra).
+# Başka bir satır hâlâ gösteriyorsa ya da dosya az önce (başka bir istekte, henüz
+# commit edilmemiş bir kayıt için) yüklendiyse dosya yerinde kalır; GC sonra toplar.
+def release(*image_paths):
+    for image_path in {p for p in image_paths if p}:
+        if reference_count(image_path) == 0 and not _recently_touched(image_path):
+            _remove_blob(image_path)
+
+
+def _referenced_paths() -> set:
+    paths = {p for (p,) in db.session.query(Restaurant.image_path).filter(Restaurant.image_path.isnot(None))}
+    paths |= {p for (p,) in db.session.query(Menu.image_path).filter(Menu.image_path.isnot(None))}
+    return paths
+
+
+def _source_of(rel_path: str) -> str:
+    # Varyant dosyası için ait olduğu orijinalin kökünü, diğerleri için kendisini döndürür
+    stem, ext = os.path.splitext(rel_path)
+    if ext == '.webp':
+        base, variant = os.path.splitext(stem)
+        if variant[1:] in VARIANTS:
+            return base
+    return stem
+
+
+# Hiçbir kaydın göstermediği dosyaları (ve varyantlarını) siler; silinenleri döndürür.
+def collect_garbage(dry_run=False, grace_seconds=GC_GRACE_SECONDS):
+    referenced_stems = {os.path.splitext(p)[0] for p in _referenced_paths()}
+    static_root = current_app.static_folder
+    cutoff = time.time() - grace_seconds
+    removed = []
+    for dirpath, _dirnames, filenames in os.walk(_upload_root()):
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            rel_path = os.path.relpath(full, static_root).replace(os.sep, '/')
+            if _source_of(rel_path) in referenced_stems:
+                continue
+            if os.path.getmtime(full) > cutoff:
+                continue
+            removed.append(rel_path)
+            if not dry_run:
+                os.remove(full)
+    return removed
+
+
+def init_storage(app):
+    @app.cli.command('gc-uploads')
+    @click.option('--dry-run', is_flag=True, help='Silmeden yalnızca listele.')
+    def gc_uploads_command(dry_run):
+        """Hiçbir restoran veya menü ürününün kullanmadığı yüklemeleri siler."""
+        removed = collect_garbage(dry_run=dry_run)
+        for path in removed:
+            print(path)
+        print(f"{len(removed)} dosya {'silinecek' if dry_run else 'silindi'}.")
@@ -0,0 +1,86 @@
+import os
+import sys
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+# tests/ proje kökünden `python -m pytest` ile çalıştırılır
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from flask_migrate import upgrade  # noqa: E402
+from app import create_app  # noqa: E402
+from models import db, User, Restaurant, Menu  # noqa: E402
+
+# Testlerde şifre hash'i ucuz tutulur; üretim parametreleri passwords.py'dedir
+TEST_HASH_METHOD = 'pbkdf2:sha256:1000'
+PASSWORD = 'secret'
+
+
+# --------------------
+# Uygulama
+# --------------------
+# Her test geçici bir SQLite dosyası üzerinde, göçlerle kurulmuş boş bir şemayla başlar.
+# TESTING açıkken route'lar SQL_QUERY_BUDGETS'ı aşarsa QueryBudgetExceeded fırlatılır.
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'CART_BACKEND': 'memory',
+        'JOBS_SYNC': True,
+        'SECRET_KEY': 'test',
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'PASSWORD_HASH_METHOD': TEST_HASH_METHOD,
+        'IMAGE_VARIANTS_SYNC': True,
+    })
+    with app.app_context():
+        upgrade()
+    yield app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+# --------------------
+# Veri Yardımcıları
+# --------------------
+# Kullanıcı ve restoranlar modeller üzerinden doğrudan yazılır; giriş gerçek /login ile yapılır.
+@pytest.fixture
+def make_user(app):
+    def make(username):
+        with app.app_context():
+            user = User(username=username, email=f'{username}@example.com',
+                        password=generate_password_hash(PASSWORD, method=TEST_HASH_METHOD))
+            db.session.add(user)
+            db.session.commit()
+            return user.id
+    return make
+
+
+@pytest.fixture
+def make_restaurant(app):
+    def make(owner_id, name='Kebap', menu=(('Adana', 100.0), ('Urfa', 90.0))):
+        with app.app_context():
+            restaurant = Restaurant(owner_id=owner_id, name=name, description='d', address='a')
+            restaurant.menus = [Menu(name=n, description='d', price=p) for n, p in menu]
+            db.session.add(restaurant)
+            db.session.commit()
+            return restaurant.id
+    return make
+
+
+@pytest.fixture
+def login(app):
+    def login(username):
+        client = app.test_client()
+        response = client.post('/login', data={'email': f'{username}@example.com',
+                                               'password': PASSWORD})
+        assert response.status_code == 302
+        return client
+    return login
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from cart_store import MemoryCartStore, SQLCartStore, ANON_PREFIX
+from models import db, CartItem, Menu
+
+KEY = f'{ANON_PREFIX}abc'
+
+
+def _age(store, key, days):
+    # Sepetin son değişikliğini `days` gün geriye çeker
+    past = datetime.utcnow() - timedelta(days=days)
+    if isinstance(store, MemoryCartStore):
+        store._updated[key] = past
+    else:
+        CartItem.query.filter_by(cart_key=key).update({'updated_at': past})
+        db.session.commit()
+
+
+# --------------------
+# Terk Edilmiş Sepetler
+# --------------------
+# Sepeti değiştiren her işlem son değişiklik zamanını yeniler; eskimiş sepet bir
+# dokunuştan sonra temizlikte silinmemeli.
+@pytest.mark.parametrize('backend', [MemoryCartStore, SQLCartStore])
+@pytest.mark.parametrize('mutate', [
+    lambda store: store.add(KEY, db.session.get(Menu, 1)),
+    lambda store: store.set_quantity(KEY, 1, 3),
+    lambda store: store.remove(KEY, 2),
+    lambda store: store.reconcile(KEY, [2], {}),
+    lambda store: store.reconcile(KEY, [], {1: 95.0}),
+], ids=['add', 'set_quantity', 'remove', 'reconcile_removed', 'reconcile_price'])
+def test_mutations_refresh_cart_age(app, make_user, make_restaurant, backend, mutate):
+    make_restaurant(make_user('owner'))
+    with app.app_context():
+        store = backend()
+        for menu_id in (1, 2):
+            store.add(KEY, db.session.get(Menu, menu_id))
+        before = datetime.utcnow() - timedelta(days=1)
+
+        _age(store, KEY, days=2)
+        mutate(store)
+        assert store.expire(ANON_PREFIX, before) == 0
+        assert store.load(KEY)
+
+        _age(store, KEY, days=2)
+        assert store.expire(ANON_PREFIX, before) > 0
+        assert not store.load(KEY)
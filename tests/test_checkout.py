@@ -0,0 +1,38 @@
+from models import db, Order, Menu
+
+
+# --------------------
+# Ödeme Öncesi Fiyat Kontrolü
+# --------------------
+def test_checkout_revalidates_prices(app, make_user, make_restaurant, login):
+    make_user('customer')
+    owner_id = make_user('owner')
+    make_restaurant(owner_id)  # Adana (1) 100, Urfa (2) 90
+    customer = login('customer')
+    assert customer.post('/add_to_cart/1').status_code == 302
+    assert customer.post('/add_to_cart/2').status_code == 302
+
+    with app.app_context():
+        db.session.get(Menu, 1).price = 110.0
+        db.session.commit()
+    assert login('owner').post('/delete_menu_item/2').status_code == 302
+
+    # Sepet eski fiyatla siparişe dönüşmez; kullanıcı güncel sepeti görür
+    response = customer.post('/checkout')
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/cart')
+    page = customer.get('/cart').get_data(as_text=True)
+    assert 'Adana fiyatı 100.00 TL → 110.00 TL olarak güncellendi.' in page
+    assert 'Urfa artık satışta olmadığı için sepetinizden çıkarıldı.' in page
+    assert page.count('Urfa') == 1
+    with app.app_context():
+        assert Order.query.count() == 0
+
+    # Onaylanan sepet güncel fiyatla ve yalnızca satıştaki ürünle sipariş olur
+    response = customer.post('/checkout')
+    assert response.status_code == 302
+    assert not response.headers['Location'].endswith('/cart')
+    with app.app_context():
+        order = Order.query.one()
+        assert order.total_price == 110.0
+        assert [(i.menu_id, i.price) for i in order.items] == [(1, 110.0)]
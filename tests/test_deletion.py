@@ -0,0 +1,99 @@
+from sqlalchemy import event, text
+
+from deletion import delete_restaurants
+from models import db, Restaurant, Menu, Comment, CartItem, Order, OrderEvent
+
+
+def _add_history(restaurant_id, menu_ids, user_id, comments):
+    db.session.add_all(
+        [Comment(user_id=user_id, restaurant_id=restaurant_id, content='iyi', rating=4)
+         for _ in range(comments)]
+        + [CartItem(cart_key=f'user:{user_id}:{menu_id}', menu_id=menu_id,
+                    restaurant_id=restaurant_id, name='x', price=1.0)
+           for menu_id in menu_ids]
+    )
+    db.session.commit()
+
+
+def _count_statements(fn, *args):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        result = fn(*args)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+    return result, len(statements)
+
+
+# --------------------
+# Küme Tabanlı Silme
+# --------------------
+def test_delete_restaurants_statement_count_is_independent_of_rows(app, make_user, make_restaurant):
+    owner_id = make_user('owner')
+    small = make_restaurant(owner_id, name='Küçük', menu=[('A', 1.0)])
+    large = make_restaurant(owner_id, name='Büyük', menu=[(f'M{i}', 1.0) for i in range(40)])
+    with app.app_context():
+        for rid, comments in ((small, 1), (large, 25)):
+            menu_ids = [m.id for m in Menu.query.filter_by(restaurant_id=rid)]
+            _add_history(rid, menu_ids, owner_id, comments)
+
+        _images, small_statements = _count_statements(delete_restaurants, [small])
+        _images, large_statements = _count_statements(delete_restaurants, [large])
+        db.session.commit()
+
+        assert small_statements == large_statements
+        assert Restaurant.query.count() == 0
+        assert Menu.query.count() == Comment.query.count() == CartItem.query.count() == 0
+
+
+# --------------------
+# Sipariş Geçmişi Olan Restoran
+# --------------------
+def test_restaurant_with_orders_is_soft_deleted(app, make_user, make_restaurant, login):
+    make_user('customer')
+    owner_id = make_user('owner')
+    rid = make_restaurant(owner_id)
+    customer = login('customer')
+    assert customer.post('/add_to_cart/1').status_code == 302
+    assert customer.post('/checkout').status_code == 302
+
+    owner = login('owner')
+    assert owner.post(f'/delete_restaurant/{rid}').status_code == 302
+
+    with app.app_context():
+        restaurant = db.session.get(Restaurant, rid)
+        assert restaurant.deleted_at is not None
+        # Bekleyen sipariş aynı işlemde iptal edilir, geçmiş korunur
+        order = Order.query.one()
+        assert order.status == 'cancelled'
+        assert [e.status for e in OrderEvent.query.order_by(OrderEvent.id)] == ['pending', 'cancelled']
+        assert Menu.query.filter_by(restaurant_id=rid, deleted_at=None).count() == 0
+        assert db.session.execute(text('PRAGMA foreign_key_check')).all() == []
+
+    assert owner.get(f'/restaurant/{rid}').status_code == 404
+    assert customer.get(f'/reviews/{rid}').status_code == 404
+    assert customer.get(f'/api/restaurants/{rid}/reviews').status_code == 404
+    assert customer.post(f'/add_review/{rid}', data={'content': 'iyi', 'rating': '5'}).status_code == 404
+    assert b'Kebap' not in customer.get('/').data
+    assert customer.get('/api/restaurants/search?q=Kebap').json['count'] == 0
+    assert b'Kebap' not in owner.get('/my_restaurants').data
+    assert owner.post(f'/orders/{order.id}/status', data={'status': 'accepted'}).status_code == 404
+
+
+def test_update_order_status_without_restaurant(app, make_user, make_restaurant, login):
+    make_user('customer')
+    owner_id = make_user('owner')
+    rid = make_restaurant(owner_id)
+    customer = login('customer')
+    customer.post('/add_to_cart/1')
+    customer.post('/checkout')
+    # Eski ORM silmelerinden kalmış, restoranı olmayan sipariş
+    with app.app_context():
+        db.session.execute(text('UPDATE "order" SET restaurant_id = :rid'), {'rid': rid + 100})
+        db.session.commit()
+    response = login('owner').post('/orders/1/status', data={'status': 'accepted'})
+    assert response.status_code == 404
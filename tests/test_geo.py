@@ -0,0 +1,75 @@
+import math
+import random
+
+import pytest
+
+from geo import covering_cells, distance_km, geohash_encode, nearby_restaurants, EARTH_RADIUS_KM
+from models import db, Restaurant
+
+# İstanbul, kutba yakın bir enlem ve tarih değiştirme çizgisi
+CENTERS = [(41.0082, 28.9784), (69.65, 18.95), (-17.7, 179.98), (0.0, -0.001)]
+
+
+def _destination(lat, lng, bearing, km):
+    # (lat, lng)'den `bearing` yönünde `km` uzaklıktaki nokta
+    phi, lmb, theta = math.radians(lat), math.radians(lng), math.radians(bearing)
+    delta = km / EARTH_RADIUS_KM
+    phi2 = math.asin(math.sin(phi) * math.cos(delta)
+                     + math.cos(phi) * math.sin(delta) * math.cos(theta))
+    lmb2 = lmb + math.atan2(math.sin(theta) * math.sin(delta) * math.cos(phi),
+                            math.cos(delta) - math.sin(phi) * math.sin(phi2))
+    return math.degrees(phi2), (math.degrees(lmb2) + 540.0) % 360.0 - 180.0
+
+
+# --------------------
+# Kapsayan Hücreler
+# --------------------
+@pytest.mark.parametrize('lat, lng', CENTERS)
+@pytest.mark.parametrize('radius_km', [0.05, 1, 7.5, 50])
+def test_covering_cells_contain_every_point_in_radius(lat, lng, radius_km):
+    cells = covering_cells(lat, lng, radius_km)
+    rng = random.Random(f'{lat},{lng},{radius_km}')
+    for _ in range(500):
+        # Kenara yakın noktalar ağırlıklı: çemberin tamamı kapsanmalı
+        km = radius_km * rng.choice([1.0, 0.999, rng.random()])
+        point = _destination(lat, lng, rng.uniform(0, 360), km)
+        geohash = geohash_encode(*point)
+        assert any(geohash.startswith(cell) for cell in cells), (point, cells)
+
+
+# --------------------
+# Yakındaki Restoranlar
+# --------------------
+@pytest.mark.parametrize('lat, lng', CENTERS)
+def test_nearby_restaurants_matches_brute_force(app, make_user, lat, lng):
+    owner_id = make_user('owner')
+    rng = random.Random(f'{lat},{lng}')
+    with app.app_context():
+        db.session.add_all([
+            Restaurant(owner_id=owner_id, name=f'R{i}', description='d', address='a',
+                       latitude=point[0], longitude=point[1])
+            for i, point in enumerate(
+                _destination(lat, lng, rng.uniform(0, 360), rng.uniform(0, 30))
+                for _ in range(150)
+            )
+        ])
+        # Aynı konumda iki restoran: imleç (mesafe, id) eşitliği ayırmalı
+        db.session.add_all([Restaurant(owner_id=owner_id, name=f'Eş{i}', description='d',
+                                       address='a', latitude=lat, longitude=lng)
+                            for i in range(2)])
+        db.session.commit()
+
+        for radius_km in (2, 10, 25):
+            expected = sorted(
+                (distance_km(lat, lng, r.latitude, r.longitude), r.id)
+                for r in Restaurant.query.all()
+                if distance_km(lat, lng, r.latitude, r.longitude) <= radius_km
+            )
+            found, after = [], None
+            while True:
+                page, after = nearby_restaurants(lat, lng, radius_km, limit=7, after=after)
+                found.extend((d, r.id) for r, d in page)
+                if after is None:
+                    break
+            assert [rid for _d, rid in found] == [rid for _d, rid in expected]
+            assert all(d == pytest.approx(e) for (d, _), (e, _) in zip(found, expected))
@@ -0,0 +1,81 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+from conftest import PASSWORD, TEST_HASH_METHOD
+from models import db, User
+from throttle import TokenBucketThrottle
+
+
+# --------------------
+# Token Bucket
+# --------------------
+def test_bucket_spends_capacity_then_waits_for_refill():
+    bucket = TokenBucketThrottle(3, 30)  # 10 saniyede bir token
+    assert [bucket.consume('k', now=0) for _ in range(3)] == [0, 0, 0]
+    assert bucket.consume('k', now=0) == pytest.approx(10)
+    assert bucket.consume('k', now=4) == pytest.approx(6)
+    assert bucket.consume('k', now=10) == 0
+    assert bucket.consume('k', now=10) == pytest.approx(10)
+    # Uzun bekleme kapasiteyi aşacak kadar token biriktirmez
+    assert [bucket.consume('k', now=1000) for _ in range(4)][-1] == pytest.approx(10)
+
+
+def test_bucket_peek_does_not_spend():
+    bucket = TokenBucketThrottle(1, 60)
+    assert bucket.consume('k', now=0, spend=False) == 0
+    assert bucket.consume('k', now=0, spend=False) == 0
+    assert bucket.consume('k', now=0) == 0
+    assert bucket.consume('k', now=0, spend=False) == pytest.approx(60)
+
+
+def test_bucket_keys_are_independent_and_evicted_lru():
+    bucket = TokenBucketThrottle(1, 60, max_keys=2)
+    for key in ('a', 'b'):
+        assert bucket.consume(key, now=0) == 0
+    assert bucket.consume('a', now=0) > 0   # 'a' en son kullanılan olur
+    assert bucket.consume('c', now=0) == 0  # en eski anahtar 'b' atılır
+    assert bucket.consume('b', now=0) == 0  # 'b' dolu kovayla yeniden başlar
+    assert bucket.consume('a', now=0) == 0  # 'b' yeniden eklenince 'a' atılmıştı
+
+
+# --------------------
+# Giriş
+# --------------------
+def _post_login(client, password):
+    return client.post('/login', data={'email': 'user@example.com', 'password': password})
+
+
+def test_failed_logins_are_throttled_per_email(app, client, make_user):
+    make_user('user')
+    attempts, _seconds = app.config['LOGIN_THROTTLE_EMAIL']
+    for _ in range(attempts):
+        assert _post_login(client, 'yanlış').status_code == 200
+    response = _post_login(client, PASSWORD)
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
+
+
+def test_successful_logins_do_not_use_email_budget(app, make_user):
+    make_user('user')
+    attempts, _seconds = app.config['LOGIN_THROTTLE_EMAIL']
+    for _ in range(attempts + 1):
+        assert _post_login(app.test_client(), PASSWORD).status_code == 302
+
+
+def test_login_rehashes_outdated_password(app, make_user, login):
+    user_id = make_user('user')
+    old_method = 'pbkdf2:sha256:500'
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        user.password = generate_password_hash(PASSWORD, method=old_method)
+        db.session.commit()
+
+    login('user')
+    with app.app_context():
+        stored = db.session.get(User, user_id).password
+        assert stored.startswith(TEST_HASH_METHOD + '$')
+
+    # Güncel hash'le yapılan girişte tekrar yazılmaz
+    login('user')
+    with app.app_context():
+        assert db.session.get(User, user_id).password == stored
@@ -0,0 +1,116 @@
+import io
+import zipfile
+
+import pytest
+
+import menus
+from menus import import_menu, MenuImportError
+from models import Menu
+
+CSV_HEADER = 'name,description,price,image,id\n'
+
+
+def _csv(*rows):
+    return (CSV_HEADER + ''.join(f'{row}\n' for row in rows)).encode()
+
+
+def _menu(restaurant_id):
+    return {m.name: m.price for m in Menu.query.filter_by(restaurant_id=restaurant_id)}
+
+
+# --------------------
+# Ekleme / Güncelleme
+# --------------------
+def test_import_upserts_by_id_and_name(app, make_user, make_restaurant):
+    owner_id = make_user('owner')
+    rid = make_restaurant(owner_id)            # menü 1 (Adana), 2 (Urfa)
+    other = make_restaurant(owner_id, name='B')  # menü 3, 4
+    with app.app_context():
+        report = import_menu(rid, _csv(
+            'Adana,acılı,"110,5",,',   # ada göre güncellenir
+            'Beyti,,120,,2',            # id'ye göre güncellenir (yeniden adlandırma)
+            'Lahmacun,,40,,',           # eklenir
+            'Lahmacun,,45,,',           # aynı dosyada tekrar: son satır geçerli
+        ), 'menu.csv')
+        assert (report['created'], report['updated'], report['errors']) == (1, 2, [])
+        assert _menu(rid) == {'Adana': 110.5, 'Beyti': 120.0, 'Lahmacun': 45.0}
+        assert _menu(other) == {'Adana': 100.0, 'Urfa': 90.0}
+
+
+def test_import_reports_row_errors(app, make_user, make_restaurant):
+    owner_id = make_user('owner')
+    rid = make_restaurant(owner_id)
+    make_restaurant(owner_id, name='B')      # menü 3 başka restorana ait
+    with app.app_context():
+        report = import_menu(rid, _csv(
+            ',,10,,',                  # satır 2: ad yok
+            'Pide,,bedava,,',          # satır 3: fiyat
+            'Pide,,-1,,',              # satır 4: negatif fiyat
+            'Pide,,10,,3',             # satır 5: başka restoranın ürünü
+            'Pide,,10,pide.jpg,',      # satır 6: zip yok
+            'Pide,,10,,',              # satır 7: geçerli
+        ), 'menu.csv')
+        assert [line for line, _message in report['errors']] == [2, 3, 4, 5, 6]
+        assert report['created'] == 1
+        assert _menu(rid)['Pide'] == 10.0
+
+
+def test_import_rejects_bad_files(app, make_user, make_restaurant):
+    rid = make_restaurant(make_user('owner'))
+    with app.app_context():
+        with pytest.raises(MenuImportError):
+            import_menu(rid, b'name,description\nA,b\n', 'menu.csv')
+        with pytest.raises(MenuImportError):
+            import_menu(rid, b'{"items": 1}', 'menu.json')
+        with pytest.raises(MenuImportError):
+            import_menu(rid, b'', 'menu.xlsx')
+
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            for i in range(3):
+                zf.writestr(f'{i}.jpg', b'x')
+        app.config['MENU_IMPORT_MAX_ZIP_MEMBERS'] = 2
+        with pytest.raises(MenuImportError):
+            import_menu(rid, _csv('Pide,,10,0.jpg,'), 'menu.csv', images_zip=archive)
+
+
+def test_import_invalidates_cache_when_a_later_batch_fails(app, make_user, make_restaurant,
+                                                          monkeypatch):
+    rid = make_restaurant(make_user('owner'))
+    monkeypatch.setattr(menus, 'IMPORT_BATCH_SIZE', 1)
+    invalidated = []
+    monkeypatch.setattr(menus, 'invalidate', invalidated.append)
+
+    def save_upload(_file):
+        raise OSError('disk dolu')
+
+    # İlk parti commit edilir, ikinci partide resim yazılamaz
+    monkeypatch.setattr(menus, 'save_upload', save_upload)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('pide.jpg', b'x')
+    with app.app_context():
+        with pytest.raises(OSError):
+            import_menu(rid, _csv('Pide,,10,,', 'Kaşarlı,,12,pide.jpg,'), 'menu.csv',
+                        images_zip=archive)
+        assert 'Pide' in _menu(rid)
+    assert invalidated == [f'restaurant:{rid}']
+
+
+# --------------------
+# Web Formu Gövde Sınırı
+# --------------------
+def test_import_route_accepts_larger_body(app, make_user, make_restaurant, login):
+    rid = make_restaurant(make_user('owner'))
+    owner = login('owner')
+    app.config['MAX_CONTENT_LENGTH'] = 1024
+    padding = b'#' * 4096
+    response = owner.post(f'/import_menu/{rid}', data={
+        'menu': (io.BytesIO(_csv('Pide,,10,,')), 'menu.csv'),
+        'images': (io.BytesIO(padding), ''),
+    }, content_type='multipart/form-data')
+    assert response.status_code == 200
+    response = owner.post(f'/add_menu_item/{rid}', data={
+        'name': 'Pide', 'price': '10', 'description': padding.decode(),
+    })
+    assert response.status_code == 413
@@ -0,0 +1,145 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+import orders
+from models import db, Order, OrderItem, OrderEvent, DailySales
+
+
+def _cart(*items):
+    # place_orders() girdisi: {"<restoran_id>": [kalem, ...]}
+    restaurants = {}
+    for menu_id, restaurant_id, price, quantity in items:
+        restaurants.setdefault(str(restaurant_id), []).append(
+            {'id': menu_id, 'price': price, 'quantity': quantity})
+    return restaurants
+
+
+def _counts():
+    return tuple(model.query.count() for model in (Order, OrderItem, OrderEvent, DailySales))
+
+
+# --------------------
+# Sipariş Oluşturma
+# --------------------
+def test_place_orders_one_order_per_restaurant(app, make_user, make_restaurant):
+    customer_id = make_user('customer')
+    owner_id = make_user('owner')
+    first = make_restaurant(owner_id, name='A')   # menü 1, 2
+    second = make_restaurant(owner_id, name='B')  # menü 3, 4
+    with app.app_context():
+        order_ids = orders.place_orders(customer_id, _cart(
+            (1, first, 100.0, 2), (2, first, 90.0, 1), (3, second, 100.0, 1)))
+        placed = {o.restaurant_id: o for o in Order.query.filter(Order.id.in_(order_ids))}
+        assert placed[first].total_price == 290.0
+        assert placed[second].total_price == 100.0
+        assert sorted(i.menu_id for i in placed[first].items) == [1, 2]
+        assert [e.status for e in OrderEvent.query.all()] == ['pending', 'pending']
+        assert sum(s.order_count for s in DailySales.query.all()) == 2
+
+
+def test_place_orders_rolls_back_on_failure(app, make_user, make_restaurant, monkeypatch):
+    customer_id = make_user('customer')
+    owner_id = make_user('owner')
+    first = make_restaurant(owner_id, name='A')
+    second = make_restaurant(owner_id, name='B')
+
+    def fail(order_ids, sign=1):
+        raise RuntimeError('rollup yazılamadı')
+
+    # Siparişler, kalemler ve olaylar yazıldıktan sonra hata: hiçbiri kalmamalı
+    monkeypatch.setattr(orders, 'apply_order_rollups', fail)
+    with app.app_context():
+        with pytest.raises(RuntimeError):
+            orders.place_orders(customer_id, _cart((1, first, 100.0, 1), (3, second, 100.0, 1)))
+        assert _counts() == (0, 0, 0, 0)
+
+
+# --------------------
+# Durum Geçişleri
+# --------------------
+def _place(app, make_user, make_restaurant):
+    customer_id = make_user('customer')
+    restaurant_id = make_restaurant(make_user('owner'))
+    with app.app_context():
+        order_id, = orders.place_orders(customer_id, _cart((1, restaurant_id, 100.0, 1)))
+    return order_id
+
+
+def _history(order_id):
+    return [e.status for e in OrderEvent.query.filter_by(order_id=order_id).order_by(OrderEvent.id)]
+
+
+def test_can_transition():
+    assert orders.can_transition('pending', 'accepted')
+    assert orders.can_transition('preparing', 'cancelled')
+    assert not orders.can_transition('pending', 'delivered')
+    assert not orders.can_transition('delivered', 'cancelled')
+    assert not orders.can_transition('unknown', 'accepted')
+
+
+def test_transition_order_follows_state_machine(app, make_user, make_restaurant):
+    order_id = _place(app, make_user, make_restaurant)
+    with app.app_context():
+        assert not orders.transition_order(order_id, 'delivered')
+        assert orders.transition_order(order_id, 'accepted')
+        assert orders.transition_order(order_id, 'preparing')
+        assert orders.transition_order(order_id, 'delivered')
+        assert not orders.transition_order(order_id, 'cancelled')
+        assert Order.query.one().status == 'delivered'
+        assert _history(order_id) == ['pending', 'accepted', 'preparing', 'delivered']
+        assert sum(s.order_count for s in DailySales.query.all()) == 1
+
+
+def test_cancel_reverts_sales(app, make_user, make_restaurant):
+    order_id = _place(app, make_user, make_restaurant)
+    with app.app_context():
+        assert orders.transition_order(order_id, 'cancelled')
+        assert not orders.transition_order(order_id, 'cancelled')
+        assert _history(order_id) == ['pending', 'cancelled']
+        assert sum(s.order_count for s in DailySales.query.all()) == 0
+
+
+def test_concurrent_transitions_apply_once(app, make_user, make_restaurant):
+    order_id = _place(app, make_user, make_restaurant)
+    barrier = threading.Barrier(2)
+    results = []
+
+    def worker(status):
+        with app.app_context():
+            barrier.wait()
+            results.append((status, orders.transition_order(order_id, status)))
+
+    # Aynı 'pending' siparişe eşzamanlı iki onay: koşullu UPDATE yalnızca birini uygular
+    threads = [threading.Thread(target=worker, args=('accepted',)) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(ok for _status, ok in results) == [False, True]
+    with app.app_context():
+        assert Order.query.one().status == 'accepted'
+        assert _history(order_id) == ['pending', 'accepted']
+
+
+# --------------------
+# Onaylanmayan Siparişlerin Süresi
+# --------------------
+def test_expire_pending_skips_legacy_orders(app, make_user, make_restaurant):
+    order_id = _place(app, make_user, make_restaurant)
+    app.config['ORDER_ACCEPT_TIMEOUT'] = 60
+    with app.app_context():
+        placed = db.session.get(Order, order_id)
+        # Durum makinesinden önceki sipariş: olay kaydı yoktur
+        legacy = Order(customer_id=placed.customer_id, restaurant_id=placed.restaurant_id,
+                       total_price=1.0, status='pending')
+        db.session.add(legacy)
+        db.session.flush()
+        Order.query.update({Order.created_at: datetime(2000, 1, 1)})
+        db.session.commit()
+
+        assert orders.expire_pending_orders() == 1
+        assert db.session.get(Order, order_id).status == 'cancelled'
+        assert db.session.get(Order, legacy.id).status == 'pending'
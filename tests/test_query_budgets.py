@@ -0,0 +1,70 @@
+import pytest
+
+from querycount import QueryBudgetExceeded
+
+# --------------------
+# Route Başına SQL Bütçeleri
+# --------------------
+# Sayfalar birden çok restoran, yorum ve sepet kalemiyle doldurulur; satır başına sorgu
+# atan (N+1) bir gerileme bütçeyi aşar ve istek QueryBudgetExceeded fırlatır.
+REVIEWERS = 5
+
+
+@pytest.fixture
+def populated(app, make_user, make_restaurant, login):
+    owner_id = make_user('owner')
+    restaurant_ids = [make_restaurant(owner_id, name=f'Restoran {i}') for i in range(3)]
+    for i in range(REVIEWERS):
+        make_user(f'reviewer{i}')
+        reviewer = login(f'reviewer{i}')
+        assert reviewer.post(f'/add_review/{restaurant_ids[0]}',
+                             data={'content': 'iyi', 'rating': '4'}).status_code == 302
+    return {'owner': login('owner'), 'restaurant_ids': restaurant_ids}
+
+
+def _get_within_budget(app, client, url, endpoint):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert int(response.headers['X-SQL-Queries']) <= app.config['SQL_QUERY_BUDGETS'][endpoint]
+    return response
+
+
+def test_index(app, client, populated):
+    response = _get_within_budget(app, client, '/', 'main.index')
+    assert b'Restoran 2' in response.data
+
+
+def test_restaurant_detail(app, populated):
+    rid = populated['restaurant_ids'][0]
+    response = _get_within_budget(app, populated['owner'], f'/restaurant/{rid}',
+                                  'main.restaurant_detail')
+    assert b'Adana' in response.data
+
+
+def test_reviews(app, client, populated):
+    rid = populated['restaurant_ids'][0]
+    response = _get_within_budget(app, client, f'/reviews/{rid}', 'main.reviews')
+    assert response.data.count(b'reviewer') >= REVIEWERS
+
+
+def test_cart(app, make_user, login, populated):
+    make_user('customer')
+    customer = login('customer')
+    # Her restorandan kalem: restoran adları tek sorguda okunmalı
+    for menu_id in range(1, 7):
+        assert customer.post(f'/add_to_cart/{menu_id}').status_code == 302
+    response = _get_within_budget(app, customer, '/cart', 'main.cart')
+    assert b'Restoran 2' in response.data
+
+
+def test_my_restaurants(app, populated):
+    response = _get_within_budget(app, populated['owner'], '/my_restaurants',
+                                  'main.my_restaurants')
+    assert response.data.count(b'Restoran ') >= 3
+
+
+def test_budget_exceeded_raises(app, client, populated, monkeypatch):
+    # Bütçe sözlüğü DEFAULT_CONFIG'ten paylaşılır; değişiklik testten sonra geri alınır
+    monkeypatch.setitem(app.config['SQL_QUERY_BUDGETS'], 'main.reviews', 0)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get(f"/reviews/{populated['restaurant_ids'][0]}")
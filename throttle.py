@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+# --------------------
+# Giriş Denemesi Sınırlama
+# --------------------
+# Anahtar başına (IP adresi, email) token bucket, token'lar sabit hızla dolar. IP kovası
+# her denemede, email kovası yalnızca başarısız şifre kontrolünde bir token harcar; böylece
+# doğru şifreyle yapılan girişler (ya da havuz yoğunken reddedilenler) hesabın hakkını
+# tüketmez. Kovalardan biri boşsa istek şifre kontrolüne hiç ulaşmadan 429 ile döner;
+# pahalı hash işi yalnızca sınır içindeki denemelere harcanır.
+# Kovalar süreç içinde tutulur (çok süreçli kurulumda sınır işçi başınadır) ve en eski
+# kullanılan anahtarlar max_keys aşıldığında atılır.
+
+
+class TokenBucketThrottle:
+    def __init__(self, capacity, per_seconds, max_keys=10000):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds  # saniyede dolan token
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # anahtar -> (token, son güncelleme)
+        self._lock = threading.Lock()
+
+    # Token harcanabildiyse 0, aksi halde yeni token için beklenecek saniye döner.
+    # spend=False yalnızca kontrol eder, token harcamaz.
+    def consume(self, key, now=None, spend=True):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1 if spend else 0
+                retry_after = 0
+            else:
+                retry_after = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+def init_throttle(app):
+    # (deneme, saniye): IP başına dakikada 20, email başına 5 dakikada 5 deneme
+    app.config.setdefault('LOGIN_THROTTLE_IP', (20, 60))
+    app.config.setdefault('LOGIN_THROTTLE_EMAIL', (5, 300))
+    app.extensions['login_throttle'] = {
+        'ip': TokenBucketThrottle(*app.config['LOGIN_THROTTLE_IP']),
+        'email': TokenBucketThrottle(*app.config['LOGIN_THROTTLE_EMAIL']),
+    }
+
+
+# IP kovasından bir token harcar, email kovasını yalnızca kontrol eder; en uzun bekleme
+# süresini döner (0 = serbest)
+def login_retry_after(ip, email):
+    throttles = current_app.extensions['login_throttle']
+    return max(throttles['ip'].consume(ip or '-'), throttles['email'].consume(email, spend=False))
+
+
+# Şifre kontrolü başarısız olduğunda email kovasından bir token harcar
+def charge_failed_login(email):
+    current_app.extensions['login_throttle']['email'].consume(email)
+
+
+def reset_login_throttle(email):
+    current_app.extensions['login_throttle']['email'].reset(email)
@@ -0,0 +1,23 @@
+import os
+from dotenv import load_dotenv
+from app import create_app
+
+# --------------------
+# Üretim Giriş Noktası
+# --------------------
+#   flask db upgrade          # şema göçleri (her sürümde bir kez, işçilerden önce)
+#   flask sync-replica        # yalnızca SQLite replika kullanılıyorsa: ilk kopya
+#   gunicorn -c gunicorn.conf.py wsgi:app
+#   flask sync-replica --interval 5   # SQLite replika: işçilerden ayrı, tek süreçte
+#
+# Göçlerden önce db.create_all() ile oluşturulmuş (ilk sürüm şemalı) bir veritabanı önce
+# temel revizyonla işaretlenir, ardından yükseltilir:
+#   flask db stamp 617ce06f4961 && flask db upgrade
+#
+# Tüm işçilerin oturum çerezlerini doğrulayabilmesi için SECRET_KEY ortamda ya da .env
+# dosyasında tanımlı olmalıdır; geçici anahtarla üretimde açılmaz.
+load_dotenv()
+if not (os.environ.get('SECRET_KEY') or os.environ.get('FLASK_SECRET_KEY')):
+    raise RuntimeError('SECRET_KEY tanımlı değil (ortam değişkeni ya da .env).')
+
+app = create_app()